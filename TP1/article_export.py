@@ -0,0 +1,355 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Export des articles en JSON, JSON Lines, CSV (compression gzip possible)
+ou Parquet.
+
+Les articles sont lus un par un depuis un curseur MongoDB (ou toute liste)
+et ecrits au fur et a mesure : la memoire utilisee ne depend pas de la
+taille de l'export. Le format Parquet (colonnes typees, lisible en memoire
+mappee par pyarrow/pandas) necessite pyarrow, optionnel.
+"""
+
+import csv
+import gzip
+import json
+from datetime import datetime
+
+from bson import ObjectId
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+EXPORT_FORMATS = ('json', 'jsonl', 'csv', 'parquet')
+
+# Nombre d'articles par row group Parquet
+PARQUET_BATCH_SIZE = 1000
+
+CSV_FIELDNAMES = [
+    'titre', 'url', 'auteur', 'date_publication',
+    'categorie', 'resume', 'nb_images', 'taille_contenu'
+]
+
+
+def json_default(obj):
+    """
+    Convertit les types BSON non serialisables en JSON.
+
+    Args:
+        obj: Objet refuse par l'encodeur JSON.
+
+    Returns:
+        str: Representation texte de l'objet.
+    """
+    if isinstance(obj, ObjectId):
+        return str(obj)
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    raise TypeError(f"Type non serialisable en JSON: {type(obj).__name__}")
+
+
+# Encodeur partage : les conversions se font pendant l'encodage, sans copie
+# prealable des documents
+_ENCODER = json.JSONEncoder(ensure_ascii=False, default=json_default)
+
+
+def encode_article(article):
+    """
+    Encode un article en JSON sur une ligne, sans son _id MongoDB.
+
+    Args:
+        article (dict): Article a encoder.
+
+    Returns:
+        str: Article encode.
+    """
+    if '_id' in article:
+        article = {key: value for key, value in article.items()
+                   if key != '_id'}
+    return _ENCODER.encode(article)
+
+
+def article_sizes(article):
+    """
+    Donne le nombre d'images et la taille du contenu d'un article.
+
+    Args:
+        article (dict): Article complet ou resume (iter_article_summaries).
+
+    Returns:
+        tuple: (nombre d'images, nombre de caracteres du contenu).
+    """
+    if 'content_length' in article:
+        return article.get('image_count', 0), article['content_length']
+    return (len(article.get('images') or {}),
+            len(article.get('content') or ''))
+
+
+def parse_timestamp(value):
+    """
+    Convertit un horodatage (datetime ou texte ISO) en datetime.
+
+    Args:
+        value: Valeur a convertir.
+
+    Returns:
+        datetime or None: Horodatage, None si absent ou invalide.
+    """
+    if isinstance(value, datetime) or value is None:
+        return value
+    try:
+        return datetime.fromisoformat(str(value))
+    except ValueError:
+        return None
+
+
+def parse_publish_date(value):
+    """
+    Convertit une date de publication AAAA-MM-JJ en date.
+
+    Args:
+        value: Valeur a convertir.
+
+    Returns:
+        date or None: Date, None si absente ou invalide.
+    """
+    timestamp = parse_timestamp(value)
+    return timestamp.date() if timestamp else None
+
+
+if PYARROW_AVAILABLE:
+    PARQUET_SCHEMA = pa.schema([
+        ('url', pa.string()),
+        ('title', pa.string()),
+        ('author', pa.string()),
+        ('subcategory', pa.string()),
+        ('summary', pa.string()),
+        ('thumbnail', pa.string()),
+        ('content', pa.string()),
+        ('publish_date', pa.date32()),
+        ('scraped_at', pa.timestamp('ms')),
+        ('saved_at', pa.timestamp('ms')),
+        ('image_count', pa.int32()),
+        ('content_length', pa.int32()),
+    ])
+
+
+def article_columns(articles):
+    """
+    Transpose des articles en colonnes typees pour Parquet.
+
+    Args:
+        articles (list): Articles complets ou resumes.
+
+    Returns:
+        dict: Listes de valeurs par colonne.
+    """
+    columns = {name: [] for name in PARQUET_SCHEMA.names}
+    for article in articles:
+        image_count, content_length = article_sizes(article)
+        columns['url'].append(article.get('url'))
+        columns['title'].append(article.get('title'))
+        columns['author'].append(article.get('author'))
+        columns['subcategory'].append(article.get('subcategory'))
+        columns['summary'].append(article.get('summary'))
+        columns['thumbnail'].append(article.get('thumbnail'))
+        columns['content'].append(article.get('content'))
+        columns['publish_date'].append(
+            parse_publish_date(article.get('publish_date')))
+        columns['scraped_at'].append(
+            parse_timestamp(article.get('scraped_at')))
+        columns['saved_at'].append(parse_timestamp(article.get('saved_at')))
+        columns['image_count'].append(image_count)
+        columns['content_length'].append(content_length)
+    return columns
+
+
+def write_parquet(articles, path, batch_size=PARQUET_BATCH_SIZE):
+    """
+    Ecrit les articles en Parquet, par row groups de batch_size articles.
+
+    Args:
+        articles (iterable): Articles complets ou resumes.
+        path (str): Fichier de sortie.
+        batch_size (int): Articles par row group.
+
+    Returns:
+        int: Nombre d'articles ecrits.
+    """
+    if not PYARROW_AVAILABLE:
+        raise RuntimeError("L'export Parquet necessite pyarrow "
+                           "(pip install pyarrow)")
+
+    count = 0
+    batch = []
+    with pq.ParquetWriter(path, PARQUET_SCHEMA,
+                          compression='zstd') as writer:
+        for article in articles:
+            batch.append(article)
+            if len(batch) >= batch_size:
+                writer.write_table(pa.Table.from_pydict(
+                    article_columns(batch), schema=PARQUET_SCHEMA))
+                count += len(batch)
+                batch = []
+        if batch or not count:
+            writer.write_table(pa.Table.from_pydict(
+                article_columns(batch), schema=PARQUET_SCHEMA))
+            count += len(batch)
+    return count
+
+
+def detect_format(path):
+    """
+    Deduit le format d'export de l'extension du fichier.
+
+    Args:
+        path (str): Fichier de sortie (.json, .jsonl, .csv, suivi ou non
+            de .gz, ou .parquet).
+
+    Returns:
+        str: Format d'export.
+    """
+    name = path[:-3] if path.endswith('.gz') else path
+    extension = name.rsplit('.', 1)[-1].lower()
+    if extension not in EXPORT_FORMATS:
+        raise ValueError(f"Format d'export inconnu pour {path} "
+                         f"(attendu: {', '.join(EXPORT_FORMATS)})")
+    return extension
+
+
+def open_export_file(path):
+    """
+    Ouvre un fichier d'export en ecriture texte, compresse si .gz.
+
+    Args:
+        path (str): Fichier de sortie.
+
+    Returns:
+        file: Fichier texte UTF-8 ouvert en ecriture.
+    """
+    if path.endswith('.gz'):
+        return gzip.open(path, 'wt', encoding='utf-8', newline='')
+    return open(path, 'w', encoding='utf-8', newline='')
+
+
+def write_jsonl(articles, f):
+    """
+    Ecrit un article JSON par ligne.
+
+    Args:
+        articles (iterable): Articles a ecrire.
+        f (file): Fichier de sortie.
+
+    Returns:
+        int: Nombre d'articles ecrits.
+    """
+    count = 0
+    for article in articles:
+        f.write(encode_article(article))
+        f.write('\n')
+        count += 1
+    return count
+
+
+def write_json(articles, f, metadata=None):
+    """
+    Ecrit un tableau JSON d'articles produit en flux.
+
+    Avec des metadonnees, le tableau est place sous la cle 'articles' d'un
+    objet ; 'total_articles' n'est connu qu'a la fin et suit le tableau.
+
+    Args:
+        articles (iterable): Articles a ecrire.
+        f (file): Fichier de sortie.
+        metadata (dict, optional): Champs ajoutes en tete de l'objet.
+
+    Returns:
+        int: Nombre d'articles ecrits.
+    """
+    indent = '    ' if metadata is not None else '  '
+    if metadata is not None:
+        f.write('{\n')
+        for key, value in metadata.items():
+            f.write(f'  {_ENCODER.encode(key)}: {_ENCODER.encode(value)},\n')
+        f.write('  "articles": ')
+    f.write('[')
+
+    count = 0
+    for article in articles:
+        f.write(',\n' if count else '\n')
+        f.write(indent)
+        f.write(encode_article(article))
+        count += 1
+
+    if count:
+        f.write('\n' + indent[:-2])
+    f.write(']')
+    if metadata is not None:
+        f.write(f',\n  "total_articles": {count}\n}}')
+    f.write('\n')
+    return count
+
+
+def write_csv(articles, f):
+    """
+    Ecrit les articles en CSV (une ligne resumee par article).
+
+    Args:
+        articles (iterable): Articles complets ou resumes.
+        f (file): Fichier de sortie.
+
+    Returns:
+        int: Nombre d'articles ecrits.
+    """
+    writer = csv.DictWriter(f, fieldnames=CSV_FIELDNAMES)
+    writer.writeheader()
+
+    count = 0
+    for article in articles:
+        image_count, content_length = article_sizes(article)
+        writer.writerow({
+            'titre': article.get('title', ''),
+            'url': article.get('url', ''),
+            'auteur': article.get('author', ''),
+            'date_publication': article.get('publish_date', ''),
+            'categorie': article.get('subcategory', ''),
+            'resume': article.get('summary', ''),
+            'nb_images': image_count,
+            'taille_contenu': content_length
+        })
+        count += 1
+    return count
+
+
+def export_articles(articles, path, export_format=None, metadata=None):
+    """
+    Exporte des articles vers un fichier, en flux.
+
+    Args:
+        articles (iterable): Curseur MongoDB ou liste d'articles.
+        path (str): Fichier de sortie ; un suffixe .gz active gzip (sauf
+            Parquet, compresse nativement).
+        export_format (str, optional): 'json', 'jsonl', 'csv' ou 'parquet'
+            (deduit de l'extension si absent).
+        metadata (dict, optional): En-tete de l'export JSON.
+
+    Returns:
+        int: Nombre d'articles exportes.
+    """
+    export_format = export_format or detect_format(path)
+    if export_format not in EXPORT_FORMATS:
+        raise ValueError(f"Format d'export inconnu: {export_format}")
+
+    if export_format == 'parquet':
+        return write_parquet(articles, path)
+
+    with open_export_file(path) as f:
+        if export_format == 'json':
+            return write_json(articles, f, metadata)
+        if export_format == 'jsonl':
+            return write_jsonl(articles, f)
+        return write_csv(articles, f)
@@ -1,24 +1,227 @@
 import json
 import re
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
-from urllib.parse import urljoin
+from urllib.parse import urljoin, urlparse
 
 import requests
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, FeatureNotFound
+from requests.adapters import HTTPAdapter
+
+from config import SCRAPER_CONFIG
+
+# Returned by scrape_article when a conditional GET answers 304
+NOT_MODIFIED = object()
+
+# Special pages never treated as articles; matched in one pass by
+# IGNORE_RE instead of one substring test per pattern
+IGNORE_PATTERNS = [
+    '/category/', '/tag/', '/author/', '/page/',
+    '/contact', '/about', '/mentions-legales',
+    '/politique-confidentialite', '/search',
+    '.jpg', '.png', '.gif', '.pdf',
+    'mailto:', 'tel:', '#'
+]
+IGNORE_RE = re.compile('|'.join(map(re.escape, IGNORE_PATTERNS)))
+
+# Year in URL or ends with keyword/ (r'/20\d{2}/' is covered by r'/\d{4}/')
+ARTICLE_LINK_RE = re.compile(r'/\d{4}/|[\w-]+/$')
+SUSPICIOUS_CHARS_RE = re.compile(r'[?#=]')
+CONTAINER_CLASS_RE = re.compile(r'(article|post|entry|card|item)', re.I)
+
+WHITESPACE_RE = re.compile(r'\s+')
+NEWLINES_RE = re.compile(r'\n+')
+AUTHOR_PREFIX_RE = re.compile(r'^(par|by|de)\s+', re.I)
+DATE_NOISE_RE = re.compile(r'[^\d\-/:. ]')
+
+# Patterns de date courants
+DATE_FORMATS = [
+    '%Y-%m-%d',
+    '%d/%m/%Y',
+    '%d-%m-%Y',
+    '%Y-%m-%dT%H:%M:%S',
+    '%Y-%m-%d %H:%M:%S',
+    '%d/%m/%Y %H:%M',
+]
+
+# Selector cascades, most specific first. They only use the simple forms
+# understood by _index_page: 'tag', '.class', '[class*="x"]', '[rel="x"]'
+TITLE_SELECTORS = [
+    'h1',
+    '.entry-title',
+    '.post-title',
+    '.article-title',
+    '[class*="title"]',
+    'title'
+]
+
+# '.breadcrumb a' is tried before these
+CATEGORY_SELECTORS = [
+    '.category',
+    '.post-category',
+    '[class*="category"]',
+    '.tag',
+    '[rel="category"]'
+]
+
+SUMMARY_SELECTORS = [
+    '.excerpt',
+    '.summary',
+    '.lead',
+    '.intro',
+    '[class*="excerpt"]',
+    '[class*="summary"]'
+]
+
+DATE_SELECTORS = [
+    '.date',
+    '.published',
+    '[class*="date"]',
+    '[class*="time"]'
+]
+
+AUTHOR_SELECTORS = [
+    '.author',
+    '.byline',
+    '[rel="author"]',
+    '[class*="author"]',
+    '.post-author'
+]
+
+CONTENT_SELECTORS = [
+    '.entry-content',
+    '.post-content',
+    '.article-content',
+    '.content',
+    '[class*="content"]',
+    'main'
+]
+
+# Combined selectors (not cascades): the first matching node in document
+# order, like select_one('.content, .entry-content, ...')
+SUMMARY_ROOT_SELECTORS = ['.content', '.entry-content', '[class*="content"]']
+IMAGES_ROOT_SELECTORS = CONTENT_SELECTORS[:-1]
+
+
+def _index_rules(cascades):
+    """
+    Group simple selectors by kind for the single-pass page index.
+
+    Args:
+        cascades (list): Lists of selectors.
+
+    Returns:
+        tuple: ``(by_tag, by_class, by_class_substring, by_rel)`` mapping a
+        tag name, class, class substring or rel value to its selectors.
+    """
+    rules = ({}, {}, {}, {})
+    for selector in (sel for cascade in cascades for sel in cascade):
+        if selector.startswith('.'):
+            kind, value = 1, selector[1:]
+        elif selector.startswith('[class*='):
+            kind, value = 2, selector[9:-2]
+        elif selector.startswith('[rel='):
+            kind, value = 3, selector[6:-2]
+        else:
+            kind, value = 0, selector
+        rules[kind].setdefault(value, []).append(selector)
+    return rules
+
+
+INDEX_RULES = _index_rules([TITLE_SELECTORS, CATEGORY_SELECTORS,
+                            SUMMARY_SELECTORS, DATE_SELECTORS,
+                            AUTHOR_SELECTORS, CONTENT_SELECTORS])
+
+
+def resolve_parser(preferred):
+    """
+    Return the BeautifulSoup tree builder to use.
+
+    Args:
+        preferred (str): Requested builder name ('lxml', 'html.parser'...).
+
+    Returns:
+        str: The requested builder if installed, 'html.parser' otherwise.
+    """
+    try:
+        BeautifulSoup('', preferred)
+        return preferred
+    except FeatureNotFound:
+        print(f"Parseur HTML '{preferred}' indisponible, "
+              f"utilisation de html.parser")
+        return 'html.parser'
+
+
+class HostRateLimiter:
+    """Thread-safe per-host politeness budget."""
+
+    def __init__(self, min_interval):
+        """
+        Initialize the rate limiter.
+
+        Args:
+            min_interval (float): Minimum delay in seconds between two
+                request starts on the same host.
+        """
+        self.min_interval = min_interval
+        self._next_slot = {}
+        self._lock = threading.Lock()
+
+    def wait(self, url):
+        """
+        Block until a request to the host of ``url`` is allowed.
+
+        Args:
+            url (str): The URL about to be requested.
+        """
+        host = urlparse(url).netloc
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.min_interval
+
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
 
 
 class BDMScraper:
     """Scraper for Blog du Moderateur articles."""
 
-    def __init__(self):
-        """Initialize the scraper with base configuration."""
-        self.base_url = "https://www.blogdumoderateur.com"
+    def __init__(self, max_workers=None, delay_between_requests=None,
+                 html_parser=None):
+        """
+        Initialize the scraper with base configuration.
+
+        Args:
+            max_workers (int, optional): Number of concurrent downloads.
+            delay_between_requests (float, optional): Minimum delay in
+                seconds between two requests to the same host.
+            html_parser (str, optional): BeautifulSoup tree builder.
+        """
+        self.base_url = SCRAPER_CONFIG['base_url']
+        self.timeout = SCRAPER_CONFIG['timeout']
+        self.html_parser = resolve_parser(
+            html_parser or SCRAPER_CONFIG['html_parser'])
+        # Format de date qui a fonctionné en dernier, propre à chaque
+        # thread de téléchargement (voir _parse_date)
+        self._date_memo = threading.local()
+        self.max_workers = max_workers or SCRAPER_CONFIG['max_workers']
+        if delay_between_requests is None:
+            delay_between_requests = SCRAPER_CONFIG['delay_between_requests']
+        self.rate_limiter = HostRateLimiter(delay_between_requests)
+
         self.session = requests.Session()
+        # Pool sized to the worker count so connections are kept alive
+        adapter = HTTPAdapter(pool_connections=self.max_workers,
+                              pool_maxsize=self.max_workers,
+                              max_retries=SCRAPER_CONFIG['max_retries'])
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
         self.session.headers.update({
-            'User-Agent': ('Mozilla/5.0 (Windows NT 10.0; Win64; x64) '
-                          'AppleWebKit/537.36 (KHTML, like Gecko) '
-                          'Chrome/91.0.4472.124 Safari/537.36'),
+            'User-Agent': SCRAPER_CONFIG['user_agent'],
             'Accept': ('text/html,application/xhtml+xml,application/xml;'
                       'q=0.9,image/webp,*/*;q=0.8'),
             'Accept-Language': 'fr-FR,fr;q=0.9,en;q=0.8',
@@ -36,9 +239,10 @@ class BDMScraper:
         """
         try:
             print(f"Recuperation de la page d'accueil: {self.base_url}")
-            response = self.session.get(self.base_url)
+            self.rate_limiter.wait(self.base_url)
+            response = self.session.get(self.base_url, timeout=self.timeout)
             response.raise_for_status()
-            soup = BeautifulSoup(response.content, 'html.parser')
+            soup = BeautifulSoup(response.content, self.html_parser)
 
             article_links = set()
 
@@ -65,9 +269,8 @@ class BDMScraper:
                     article_links.add(full_url)
 
             # Strategy 3: Find specific patterns (common classes)
-            pattern = re.compile(r'(article|post|entry|card|item)', re.I)
             potential_containers = soup.find_all(['div', 'section'],
-                                                 class_=pattern)
+                                                 class_=CONTAINER_CLASS_RE)
 
             for container in potential_containers:
                 links = container.find_all('a', href=True)
@@ -109,70 +312,72 @@ class BDMScraper:
             return False
 
         # Ignore links to special pages
-        ignore_patterns = [
-            '/category/', '/tag/', '/author/', '/page/',
-            '/contact', '/about', '/mentions-legales',
-            '/politique-confidentialite', '/search',
-            '.jpg', '.png', '.gif', '.pdf',
-            'mailto:', 'tel:', '#'
-        ]
-
-        for pattern in ignore_patterns:
-            if pattern in href.lower():
-                return False
+        if IGNORE_RE.search(href.lower()):
+            return False
 
         # Articles often contain dates or keywords
-        article_indicators = [
-            r'/20\d{2}/',  # Year in URL
-            r'/\d{4}/',    # Year in URL
-            r'[\w-]+/$',   # Ends with keyword/
-        ]
-
-        for pattern in article_indicators:
-            if re.search(pattern, href):
-                return True
+        if ARTICLE_LINK_RE.search(href):
+            return True
 
         # If URL contains at least 2 segments and no suspicious characters
-        segments = href.strip('/').split('/')
-        suspicious_chars = ['?', '#', '=']
-        if (len(segments) >= 2 and
-                not any(char in href for char in suspicious_chars)):
+        if (href.strip('/').count('/') >= 1 and
+                not SUSPICIOUS_CHARS_RE.search(href)):
             return True
 
         return False
 
-    def scrape_article(self, url):
+    def scrape_article(self, url, validators=None):
         """
         Scrape information from an individual article.
 
         Args:
             url (str): The URL of the article to scrape.
+            validators (dict, optional): Stored ``http_etag`` and
+                ``http_last_modified`` values used for a conditional GET.
 
         Returns:
-            dict or None: Article data if successful, None otherwise.
+            dict, NOT_MODIFIED or None: Article data if successful,
+            NOT_MODIFIED if the server reports no change, None otherwise.
         """
         try:
             print(f"Scraping de l'article: {url}")
 
-            # Delay to respect the server
-            time.sleep(1)
-
-            response = self.session.get(url)
+            headers = {}
+            if validators:
+                if validators.get('http_etag'):
+                    headers['If-None-Match'] = validators['http_etag']
+                if validators.get('http_last_modified'):
+                    headers['If-Modified-Since'] = (
+                        validators['http_last_modified'])
+
+            # Respect the per-host politeness budget
+            self.rate_limiter.wait(url)
+
+            response = self.session.get(url, headers=headers,
+                                        timeout=self.timeout)
+            if response.status_code == 304:
+                print(f"Article inchange: {url}")
+                return NOT_MODIFIED
             response.raise_for_status()
 
-            soup = BeautifulSoup(response.content, 'html.parser')
+            soup = BeautifulSoup(response.content, self.html_parser)
+
+            page = self._index_page(soup)
 
             article_data = {
                 'url': url,
-                'title': self._extract_title(soup),
-                'thumbnail': self._extract_thumbnail(soup, url),
-                'subcategory': self._extract_subcategory(soup),
-                'summary': self._extract_summary(soup),
-                'publish_date': self._extract_publish_date(soup),
-                'author': self._extract_author(soup),
-                'content': self._extract_content(soup),
-                'images': self._extract_images(soup, url),
-                'scraped_at': datetime.now().isoformat()
+                'title': self._extract_title(page),
+                'thumbnail': self._extract_thumbnail(page, url),
+                'subcategory': self._extract_subcategory(page),
+                'summary': self._extract_summary(page),
+                'publish_date': self._extract_publish_date(page),
+                'author': self._extract_author(page),
+                'content': self._extract_content(page),
+                'images': self._extract_images(page, url),
+                'scraped_at': datetime.now().isoformat(),
+                # Validators for the next incremental run
+                'http_etag': response.headers.get('ETag'),
+                'http_last_modified': response.headers.get('Last-Modified')
             }
 
             title_preview = article_data['title'][:50]
@@ -186,31 +391,145 @@ class BDMScraper:
             print(f"Erreur lors du parsing de {url}: {e}")
             return None
 
-    def _extract_title(self, soup):
+    def _index_page(self, soup):
         """
-        Extract the article title.
+        Walk the page once and locate the nodes used by the extractors.
+
+        Replaces one ``select_one`` scan of the whole tree per selector of
+        every cascade with a single traversal.
 
         Args:
             soup (BeautifulSoup): Parsed HTML content.
 
+        Returns:
+            dict: The soup, the content of the first meta tag for each
+            ``(attribute, value)`` pair (``('name', 'description')``), the
+            first ``time`` element, every ``img``, the breadcrumb links,
+            the first match of each selector (``first``) and its position
+            in the document (``order``), and every match of the category
+            selectors (``all``).
+        """
+        by_tag, by_class, by_substring, by_rel = INDEX_RULES
+        meta = {}
+        time_elem = None
+        images = []
+        breadcrumb_links = []
+        first = {}
+        order = {}
+        matches = {selector: [] for selector in CATEGORY_SELECTORS}
+
+        def hit(selectors, tag):
+            for selector in selectors:
+                if selector not in first:
+                    first[selector] = tag
+                    order[selector] = position
+                if selector in matches:
+                    matches[selector].append(tag)
+
+        for position, tag in enumerate(soup.find_all(True)):
+            name = tag.name
+            if name == 'meta':
+                for attr in ('property', 'name'):
+                    key = tag.get(attr)
+                    if key:
+                        meta.setdefault((attr, key), tag.get('content'))
+            elif name == 'img':
+                images.append(tag)
+            elif name == 'time' and time_elem is None:
+                time_elem = tag
+
+            if name in by_tag:
+                hit(by_tag[name], tag)
+
+            classes = tag.get('class')
+            if classes:
+                for cls in classes:
+                    if cls in by_class:
+                        hit(by_class[cls], tag)
+                if 'breadcrumb' in classes:
+                    breadcrumb_links.extend(tag.find_all('a'))
+                class_attr = ' '.join(classes)
+                for value, selectors in by_substring.items():
+                    if value in class_attr:
+                        hit(selectors, tag)
+
+            rel = tag.get('rel')
+            if rel:
+                rel = ' '.join(rel) if isinstance(rel, list) else rel
+                if rel in by_rel:
+                    hit(by_rel[rel], tag)
+
+        # Nested breadcrumbs would list the same links twice
+        unique_links = list({id(link): link
+                             for link in breadcrumb_links}.values())
+
+        return {
+            'soup': soup,
+            'meta': meta,
+            'time': time_elem,
+            'images': images,
+            'breadcrumb_links': unique_links,
+            'first': first,
+            'order': order,
+            'all': matches
+        }
+
+    def _first_match(self, page, selectors):
+        """
+        Return the first node matched by a selector cascade.
+
+        Args:
+            page (dict): Nodes located by ``_index_page``.
+            selectors (list): Selectors, most specific first.
+
+        Returns:
+            Tag or None: First match of the first matching selector.
+        """
+        for selector in selectors:
+            if selector in page['first']:
+                return page['first'][selector]
+        return None
+
+    def _first_in_document(self, page, selectors):
+        """
+        Return the first node, in document order, matched by any selector.
+
+        Same result as ``select_one`` with the selectors joined by commas.
+
+        Args:
+            page (dict): Nodes located by ``_index_page``.
+            selectors (list): Selectors to combine.
+
+        Returns:
+            Tag or None: Earliest matching node.
+        """
+        found = [selector for selector in selectors if selector in page['first']]
+        if not found:
+            return None
+        tag = page['first'][min(found, key=page['order'].get)]
+        if tag.decomposed:
+            # Removed by _extract_content: the index no longer applies
+            return page['soup'].select_one(', '.join(selectors))
+        return tag
+
+    def _extract_title(self, page):
+        """
+        Extract the article title.
+
+        Args:
+            page (dict): Nodes located by ``_index_page``.
+
         Returns:
             str: The article title or default message.
         """
-        title_selectors = [
-            'h1',
-            '.entry-title',
-            '.post-title',
-            '.article-title',
-            '[class*="title"]',
-            'title'
-        ]
+        soup = page['soup']
 
-        for selector in title_selectors:
-            title_elem = soup.select_one(selector)
+        for selector in TITLE_SELECTORS:
+            title_elem = page['first'].get(selector)
             if title_elem and title_elem.get_text().strip():
                 title = title_elem.get_text().strip()
                 # Clean the title
-                title = re.sub(r'\s+', ' ', title)
+                title = WHITESPACE_RE.sub(' ', title)
                 return title
 
         # Fallback: page title
@@ -219,59 +538,46 @@ class BDMScraper:
 
         return "Titre non trouve"
 
-    def _extract_thumbnail(self, soup, url):
+    def _extract_thumbnail(self, page, url):
         """
         Extract the main thumbnail image.
 
         Args:
-            soup (BeautifulSoup): Parsed HTML content.
+            page (dict): Nodes located by ``_index_page``.
             url (str): Base URL for relative links.
 
         Returns:
             str or None: Thumbnail URL if found, None otherwise.
         """
-        # Strategy 1: Meta Open Graph
-        og_image = soup.find('meta', property='og:image')
-        if og_image and og_image.get('content'):
-            return urljoin(url, og_image['content'])
-
-        # Strategy 2: Meta Twitter
-        twitter_image = soup.find('meta', attrs={'name': 'twitter:image'})
-        if twitter_image and twitter_image.get('content'):
-            return urljoin(url, twitter_image['content'])
+        # Strategy 1: Meta Open Graph, Strategy 2: Meta Twitter
+        for key in (('property', 'og:image'), ('name', 'twitter:image')):
+            if page['meta'].get(key):
+                return urljoin(url, page['meta'][key])
 
         # Strategy 3: First image in the article
-        article_images = soup.find_all('img')
         skip_keywords = ['logo', 'avatar', 'icon']
 
-        for img in article_images:
+        for img in page['images']:
             src = img.get('src') or img.get('data-src')
             if src and not any(skip in src.lower() for skip in skip_keywords):
                 return urljoin(url, src)
 
         return None
 
-    def _extract_subcategory(self, soup):
+    def _extract_subcategory(self, page):
         """
         Extrait la sous-catégorie.
 
         Args:
-            soup (BeautifulSoup): Contenu HTML parsé.
+            page (dict): Noeuds localisés par ``_index_page``.
 
         Returns:
             str or None: Sous-catégorie si trouvée, None sinon.
         """
-        category_selectors = [
-            '.breadcrumb a',
-            '.category',
-            '.post-category',
-            '[class*="category"]',
-            '.tag',
-            '[rel="category"]'
-        ]
+        cascade = [page['breadcrumb_links']]
+        cascade.extend(page['all'][selector] for selector in CATEGORY_SELECTORS)
 
-        for selector in category_selectors:
-            elements = soup.select(selector)
+        for elements in cascade:
             if elements:
                 # Prendre la dernière catégorie (souvent la plus spécifique)
                 categories = [
@@ -283,39 +589,29 @@ class BDMScraper:
 
         return None
 
-    def _extract_summary(self, soup):
+    def _extract_summary(self, page):
         """
         Extrait le résumé/extrait de l'article.
 
         Args:
-            soup (BeautifulSoup): Contenu HTML parsé.
+            page (dict): Noeuds localisés par ``_index_page``.
 
         Returns:
             str or None: Résumé si trouvé, None sinon.
         """
         # Stratégie 1: Meta description
-        meta_desc = soup.find('meta', attrs={'name': 'description'})
-        if meta_desc and meta_desc.get('content'):
-            return meta_desc['content'].strip()
+        meta_desc = page['meta'].get(('name', 'description'))
+        if meta_desc:
+            return meta_desc.strip()
 
         # Stratégie 2: Excerpt/summary spécifique
-        summary_selectors = [
-            '.excerpt',
-            '.summary',
-            '.lead',
-            '.intro',
-            '[class*="excerpt"]',
-            '[class*="summary"]'
-        ]
-
-        for selector in summary_selectors:
-            summary_elem = soup.select_one(selector)
+        for selector in SUMMARY_SELECTORS:
+            summary_elem = page['first'].get(selector)
             if summary_elem and summary_elem.get_text().strip():
                 return summary_elem.get_text().strip()
 
         # Stratégie 3: Premier paragraphe du contenu
-        content_selectors = '.content, .entry-content, [class*="content"]'
-        content_elem = soup.select_one(content_selectors)
+        content_elem = self._first_in_document(page, SUMMARY_ROOT_SELECTORS)
         if content_elem:
             first_p = content_elem.find('p')
             if first_p and first_p.get_text().strip():
@@ -323,47 +619,32 @@ class BDMScraper:
 
         return None
 
-    def _extract_publish_date(self, soup):
+    def _extract_publish_date(self, page):
         """
         Extrait la date de publication au format AAAA-MM-JJ.
 
         Args:
-            soup (BeautifulSoup): Contenu HTML parsé.
+            page (dict): Noeuds localisés par ``_index_page``.
 
         Returns:
             str or None: Date de publication si trouvée, None sinon.
         """
         # Stratégie 1: élément time avec datetime
-        time_elem = soup.find('time')
-        if time_elem and time_elem.get('datetime'):
-            try:
-                date_str = time_elem['datetime']
-                date_obj = self._parse_date(date_str)
-                if date_obj:
-                    return date_obj.strftime('%Y-%m-%d')
-            except Exception:
-                pass
-
         # Stratégie 2: Meta article:published_time
-        meta_date = soup.find('meta', property='article:published_time')
-        if meta_date and meta_date.get('content'):
-            try:
-                date_obj = self._parse_date(meta_date['content'])
+        time_elem = page['time']
+        candidates = [
+            time_elem.get('datetime') if time_elem else None,
+            page['meta'].get(('property', 'article:published_time'))
+        ]
+        for date_str in candidates:
+            if date_str:
+                date_obj = self._parse_date(date_str)
                 if date_obj:
                     return date_obj.strftime('%Y-%m-%d')
-            except Exception:
-                pass
 
         # Stratégie 3: Chercher dans le texte
-        date_selectors = [
-            '.date',
-            '.published',
-            '[class*="date"]',
-            '[class*="time"]'
-        ]
-
-        for selector in date_selectors:
-            date_elem = soup.select_one(selector)
+        for selector in DATE_SELECTORS:
+            date_elem = page['first'].get(selector)
             if date_elem:
                 date_text = date_elem.get_text().strip()
                 date_obj = self._parse_date(date_text)
@@ -383,96 +664,82 @@ class BDMScraper:
             datetime or None: Objet datetime parsé ou None si échec.
         """
         # Nettoyer la chaîne
-        date_str = re.sub(r'[^\d\-/:. ]', '', date_str).strip()
-
-        # Patterns de date courants
-        date_patterns = [
-            '%Y-%m-%d',
-            '%d/%m/%Y',
-            '%d-%m-%Y',
-            '%Y-%m-%dT%H:%M:%S',
-            '%Y-%m-%d %H:%M:%S',
-            '%d/%m/%Y %H:%M',
-        ]
+        date_str = DATE_NOISE_RE.sub('', date_str).strip()
+        if not date_str:
+            return None
 
-        for pattern in date_patterns:
+        # Un site utilise presque toujours le même format : essayer d'abord
+        # celui qui a fonctionné en dernier
+        last_format = getattr(self._date_memo, 'format', DATE_FORMATS[0])
+        try:
+            return datetime.strptime(date_str, last_format)
+        except ValueError:
+            pass
+
+        for pattern in DATE_FORMATS:
+            if pattern == last_format:
+                continue
             try:
-                return datetime.strptime(date_str, pattern)
+                date_obj = datetime.strptime(date_str, pattern)
             except ValueError:
                 continue
+            self._date_memo.format = pattern
+            return date_obj
 
         return None
 
-    def _extract_author(self, soup):
+    def _extract_author(self, page):
         """
         Extrait l'auteur de l'article.
 
         Args:
-            soup (BeautifulSoup): Contenu HTML parsé.
+            page (dict): Noeuds localisés par ``_index_page``.
 
         Returns:
             str or None: Nom de l'auteur si trouvé, None sinon.
         """
-        author_selectors = [
-            '.author',
-            '.byline',
-            '[rel="author"]',
-            '[class*="author"]',
-            '.post-author'
-        ]
-
-        for selector in author_selectors:
-            author_elem = soup.select_one(selector)
+        for selector in AUTHOR_SELECTORS:
+            author_elem = page['first'].get(selector)
             if author_elem and author_elem.get_text().strip():
                 author = author_elem.get_text().strip()
                 # Nettoyer (enlever "Par", "By", etc.)
-                author = re.sub(r'^(par|by|de)\s+', '', author, flags=re.I)
+                author = AUTHOR_PREFIX_RE.sub('', author)
                 return author
 
         return None
 
-    def _extract_content(self, soup):
+    def _extract_content(self, page):
         """
         Extrait le contenu principal de l'article.
 
         Args:
-            soup (BeautifulSoup): Contenu HTML parsé.
+            page (dict): Noeuds localisés par ``_index_page``.
 
         Returns:
             str or None: Contenu de l'article si trouvé, None sinon.
         """
-        content_selectors = [
-            '.entry-content',
-            '.post-content',
-            '.article-content',
-            '.content',
-            '[class*="content"]',
-            'main'
-        ]
-
-        for selector in content_selectors:
-            content_elem = soup.select_one(selector)
-            if content_elem:
-                # Nettoyer le contenu
-                # Supprimer les scripts, styles, etc.
-                unwanted_tags = ['script', 'style', 'nav', 'aside']
-                for unwanted in content_elem(unwanted_tags):
-                    unwanted.decompose()
-
-                # Extraire et nettoyer le texte
-                content = content_elem.get_text()
-                content = re.sub(r'\n+', '\n', content)
-                content = re.sub(r'\s+', ' ', content)
-                return content.strip()
+        content_elem = self._first_match(page, CONTENT_SELECTORS)
+        if content_elem:
+            # Nettoyer le contenu
+            # Supprimer les scripts, styles, etc.
+            unwanted_tags = ['script', 'style', 'nav', 'aside']
+            for unwanted in content_elem(unwanted_tags):
+                unwanted.decompose()
+
+            # Extraire et nettoyer le texte
+            content = content_elem.get_text()
+            content = NEWLINES_RE.sub('\n', content)
+            content = WHITESPACE_RE.sub(' ', content)
+            return content.strip()
 
         return None
 
-    def _extract_images(self, soup, base_url):
+    def _extract_images(self, page, base_url):
         """
         Extrait toutes les images de l'article avec leurs légendes.
 
         Args:
-            soup (BeautifulSoup): Contenu HTML parsé.
+            page (dict): Noeuds localisés par ``_index_page``.
             base_url (str): URL de base pour les liens relatifs.
 
         Returns:
@@ -481,14 +748,11 @@ class BDMScraper:
         images_dict = {}
 
         # Chercher dans le contenu principal
-        content_selectors = (
-            '.entry-content, .post-content,'
-            '.article-content, .content, [class*="content"]')
-        content_elem = soup.select_one(content_selectors)
-        if not content_elem:
-            content_elem = soup
-
-        images = content_elem.find_all('img')
+        content_elem = self._first_in_document(page, IMAGES_ROOT_SELECTORS)
+        if content_elem:
+            images = content_elem.find_all('img')
+        else:
+            images = [img for img in page['images'] if not img.decomposed]
 
         for i, img in enumerate(images):
             src = img.get('src') or img.get('data-src')
@@ -530,12 +794,47 @@ class BDMScraper:
 
         return images_dict
 
-    def scrape_homepage_articles(self, max_articles=None):
+    def iter_articles(self, urls, max_workers=None, validators=None):
+        """
+        Scrape articles concurrently and yield them as they complete.
+
+        Args:
+            urls (list): Article URLs to scrape.
+            max_workers (int, optional): Number of concurrent downloads.
+            validators (dict, optional): Conditional GET validators by URL.
+
+        Yields:
+            tuple: ``(url, article_data)`` where ``article_data`` is the
+            result of ``scrape_article``.
+        """
+        workers = max_workers or self.max_workers
+        validators = validators or {}
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {executor.submit(self.scrape_article, url,
+                                       validators.get(url)): url
+                       for url in urls}
+            try:
+                for future in as_completed(futures):
+                    yield futures[future], future.result()
+            finally:
+                # Stop pending downloads if the consumer gives up early
+                for future in futures:
+                    future.cancel()
+
+    def scrape_homepage_articles(self, max_articles=None, max_workers=None,
+                                 lookup_known=None, revalidate=False):
         """
         Scrape tous les articles de la page d'accueil.
 
         Args:
             max_articles (int, optional): Nombre maximum d'articles à scraper.
+            max_workers (int, optional): Nombre de téléchargements simultanés.
+            lookup_known (callable, optional): Mode incrémental. Reçoit la
+                liste des URLs candidates et renvoie un dict
+                ``{url: validateurs}`` des articles déjà stockés.
+            revalidate (bool): En mode incrémental, revalider les articles
+                connus par GET conditionnel au lieu de les ignorer.
 
         Returns:
             list: Liste des données d'articles scrapés.
@@ -549,19 +848,35 @@ class BDMScraper:
             print("Aucun article trouve sur la page d'accueil")
             return []
 
+        validators = {}
+        if lookup_known:
+            known = lookup_known(article_links)
+            if revalidate:
+                validators = known
+                print(f"{len(known)} articles connus a revalider")
+            else:
+                article_links = [url for url in article_links
+                                 if url not in known]
+                print(f"{len(known)} articles deja en base ignores, "
+                      f"{len(article_links)} nouveaux")
+
         # Limiter le nombre d'articles si spécifié
         if max_articles:
             article_links = article_links[:max_articles]
             print(f"Limitation a {max_articles} articles")
 
         scraped_articles = []
+        unchanged = 0
+        total_attempted = len(article_links)
 
-        for i, url in enumerate(article_links, 1):
-            print(f"\n[{i}/{len(article_links)}] Scraping de l'article...")
-
-            article_data = self.scrape_article(url)
+        results = self.iter_articles(article_links, max_workers=max_workers,
+                                     validators=validators)
+        for i, (url, article_data) in enumerate(results, 1):
+            print(f"\n[{i}/{total_attempted}] Article termine")
 
-            if article_data:
+            if article_data is NOT_MODIFIED:
+                unchanged += 1
+            elif article_data:
                 scraped_articles.append(article_data)
                 title_preview = article_data['title'][:50]
                 print(f"Article ajoute: {title_preview}...")
@@ -569,9 +884,10 @@ class BDMScraper:
                 print(f"Echec du scraping pour: {url}")
 
         total_articles = len(scraped_articles)
-        total_attempted = len(article_links)
         print(f"\nScraping termine! {total_articles} articles recuperes "
               f"sur {total_attempted} tentes")
+        if unchanged:
+            print(f"{unchanged} articles inchanges depuis le dernier passage")
         return scraped_articles
 
 
@@ -21,9 +21,14 @@ MONGODB_CONFIG = {
 # Configuration du scraper
 SCRAPER_CONFIG = {
     'base_url': 'https://www.blogdumoderateur.com',
-    'delay_between_requests': 1.0,  # Délai en secondes
+    # Intervalle minimal (secondes) entre deux requêtes vers un même hôte
+    'delay_between_requests': 1.0,
+    'max_workers': 5,  # Nombre de téléchargements simultanés
     'max_retries': 3,
     'timeout': 30,
+    # Constructeur d'arbre BeautifulSoup ('lxml' est bien plus rapide que
+    # 'html.parser', utilisé en repli s'il n'est pas installé)
+    'html_parser': os.getenv('BDM_HTML_PARSER', 'lxml'),
     'user_agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
 }
 
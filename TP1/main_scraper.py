@@ -1,44 +1,25 @@
 import argparse
-import json
 import sys
 from datetime import datetime
 
+from article_export import export_articles
 from bdm_scraper import BDMScraper
-from mongodb_handler import MongoDBHandler
+from mongodb_handler import SUMMARY_FIELDS, MongoDBHandler
+from search_articles import ask_match_mode
 
 
-def make_json_serializable(obj):
-    """
-    Convertit un objet en format serializable JSON.
-
-    Args:
-        obj: L'objet à convertir.
-
-    Returns:
-        L'objet converti en format serializable JSON.
-    """
-    from bson import ObjectId
-
-    if isinstance(obj, dict):
-        return {key: make_json_serializable(value)
-                for key, value in obj.items() if key != '_id'}
-    elif isinstance(obj, list):
-        return [make_json_serializable(item) for item in obj]
-    elif isinstance(obj, ObjectId):
-        return str(obj)
-    elif isinstance(obj, datetime):
-        return obj.isoformat()
-    else:
-        return obj
-
-
-def scrape_and_save(max_articles=None, save_json=True):
+def scrape_and_save(max_articles=None, save_json=True, max_workers=None,
+                    incremental=False, revalidate=False):
     """
     Scrape les articles et les sauvegarde en MongoDB.
 
     Args:
         max_articles (int, optional): Nombre maximum d'articles à scraper.
         save_json (bool): Sauvegarder aussi en JSON.
+        max_workers (int, optional): Nombre de téléchargements simultanés.
+        incremental (bool): Ignorer les articles déjà en base.
+        revalidate (bool): Revalider les articles déjà en base par GET
+            conditionnel et mettre à jour ceux qui ont changé.
 
     Returns:
         bool: True si succès, False sinon.
@@ -47,7 +28,7 @@ def scrape_and_save(max_articles=None, save_json=True):
     print("=" * 60)
 
     # Initialiser le scraper
-    scraper = BDMScraper()
+    scraper = BDMScraper(max_workers=max_workers)
 
     # Initialiser MongoDB
     try:
@@ -61,26 +42,32 @@ def scrape_and_save(max_articles=None, save_json=True):
         # Scraper les articles
         limit_text = max_articles or 'aucune'
         print(f"Scraping des articles (limite: {limit_text})...")
-        articles = scraper.scrape_homepage_articles(max_articles=max_articles)
+        incremental = incremental or revalidate
+        articles = scraper.scrape_homepage_articles(
+            max_articles=max_articles,
+            lookup_known=db_handler.get_known_articles if incremental else None,
+            revalidate=revalidate
+        )
 
         if not articles:
+            if incremental:
+                print("Aucun article nouveau ou modifie")
+                return True
             print("Aucun article recupere")
             return False
 
         # Sauvegarder en MongoDB
         print(f"\nSauvegarde de {len(articles)} articles en MongoDB...")
-        save_stats = db_handler.save_articles(articles)
+        save_stats = db_handler.save_articles(articles,
+                                              update_existing=revalidate)
 
         # Sauvegarder en JSON si demandé
         if save_json:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             json_filename = f"bdm_articles_{timestamp}.json"
 
-            # Nettoyer les données pour JSON
-            clean_articles = make_json_serializable(articles)
-
-            with open(json_filename, 'w', encoding='utf-8') as f:
-                json.dump(clean_articles, f, ensure_ascii=False, indent=2)
+            # ObjectId/datetime convertis pendant l'encodage, sans copie
+            export_articles(articles, json_filename, 'json')
 
             print(f"Sauvegarde JSON: {json_filename}")
 
@@ -176,7 +163,10 @@ def search_by_category(db_handler):
         print("Categorie vide")
         return
 
-    articles = db_handler.get_articles_by_category(category)
+    match = ask_match_mode()
+
+    articles = db_handler.get_articles_by_category(
+        category, match=match, projection=SUMMARY_FIELDS)
     display_search_results(articles)
 
 
@@ -190,11 +180,12 @@ def advanced_search(db_handler):
     print("\nRecherche avancee")
     print("Laissez vide pour ignorer un critere")
 
-    title = input("Mot-cle dans le titre: ").strip() or None
+    keywords = input("Mots-cles (titre et contenu): ").strip() or None
     author = input("Auteur: ").strip() or None
     category = input("Categorie: ").strip() or None
     date_start = input("Date debut (YYYY-MM-DD): ").strip() or None
     date_end = input("Date fin (YYYY-MM-DD): ").strip() or None
+    match = ask_match_mode() if author or category else 'contains'
 
     try:
         limit_input = input("Nombre max de resultats (defaut: 20): ").strip()
@@ -203,12 +194,14 @@ def advanced_search(db_handler):
         limit = 20
 
     articles = db_handler.search_articles(
-        title_substring=title,
+        keywords=keywords,
         author=author,
         category=category,
         date_start=date_start,
         date_end=date_end,
-        limit=limit
+        limit=limit,
+        match=match,
+        projection=SUMMARY_FIELDS
     )
 
     display_search_results(articles)
@@ -310,13 +303,23 @@ def main():
                         help="Nombre max d'articles a scraper")
     parser.add_argument("--no-json", action="store_true",
                         help="Ne pas sauvegarder en JSON")
+    parser.add_argument("--workers", type=int,
+                        help="Nombre de telechargements simultanes")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Ignorer les articles deja en base")
+    parser.add_argument("--revalidate", action="store_true",
+                        help="Revalider les articles connus (ETag/"
+                             "Last-Modified) et mettre a jour ceux modifies")
 
     args = parser.parse_args()
 
     if args.scrape:
         success = scrape_and_save(
             max_articles=args.max_articles,
-            save_json=not args.no_json
+            save_json=not args.no_json,
+            max_workers=args.workers,
+            incremental=args.incremental,
+            revalidate=args.revalidate
         )
         sys.exit(0 if success else 1)
 
@@ -1,27 +1,99 @@
+import re
+import time
+import unicodedata
 from datetime import datetime
 from typing import Dict, List
 
-from pymongo import ASCENDING, DESCENDING, MongoClient
-from pymongo.errors import ConnectionFailure, DuplicateKeyError
+from pymongo import ASCENDING, DESCENDING, MongoClient, UpdateOne
+from pymongo.errors import (BulkWriteError, ConnectionFailure,
+                            DuplicateKeyError)
+
+# Nombre d'operations envoyees par appel bulk_write
+BULK_BATCH_SIZE = 1000
+
+# Champs de recherche normalises (minuscules, sans accents) maintenus a cote
+# des champs d'origine pour que les recherches exactes ou par prefixe
+# utilisent un index au lieu d'un $regex insensible a la casse. Un index avec
+# collation ne suffirait pas : MongoDB ne l'utilise pas pour un $regex, donc
+# pas pour le prefixe, et l'index texte n'accepte pas de collation (le $text
+# ignore deja casse et accents).
+SEARCH_FIELDS = {
+    'author': 'author_lc',
+    'subcategory': 'subcategory_lc',
+    'title': 'title_lc'
+}
+
+# Modes de correspondance pour author/category/subcategory : 'contains'
+# (defaut, sous-chaine comme avant) parcourt la collection, 'exact' et
+# 'prefix' sont servis par les index des champs normalises
+MATCH_MODES = ('contains', 'prefix', 'exact')
+
+# Version des champs normalises : le rattrapage des anciens articles ne
+# tourne qu'une fois par version (marqueur dans la collection meta)
+SEARCH_FIELDS_VERSION = 1
+
+# Duree de validite (secondes) des statistiques mises en cache
+STATS_CACHE_TTL = 30
+
+# Champs utiles a l'affichage d'une liste d'articles : content et images,
+# les plus volumineux, restent cote serveur
+SUMMARY_FIELDS = ['url', 'title', 'publish_date', 'author', 'subcategory',
+                  'summary']
+
+
+def normalize_search_text(value):
+    """
+    Normalise un texte pour la recherche (minuscules, sans accents).
+
+    Args:
+        value (str): Texte a normaliser.
+
+    Returns:
+        str or None: Texte normalise, None si la valeur est vide.
+    """
+    if not value:
+        return None
+    value = unicodedata.normalize('NFKD', str(value))
+    value = ''.join(c for c in value if not unicodedata.combining(c))
+    return ' '.join(value.casefold().split())
+
+
+def add_search_fields(document):
+    """
+    Ajoute a un document ses champs de recherche normalises.
+
+    Args:
+        document (Dict): Article a completer (modifie en place).
+
+    Returns:
+        Dict: Le document.
+    """
+    for field, search_field in SEARCH_FIELDS.items():
+        document[search_field] = normalize_search_text(document.get(field))
+    return document
 
 
 class MongoDBHandler:
     """Gestionnaire pour les operations MongoDB des articles."""
 
     def __init__(self, connection_string="mongodb://localhost:27017/",
-                 database_name="bdm_scraper"):
+                 database_name="bdm_scraper", stats_ttl=STATS_CACHE_TTL):
         """
         Initialise la connexion MongoDB.
 
         Args:
             connection_string (str): Chaine de connexion MongoDB.
             database_name (str): Nom de la base de donnees.
+            stats_ttl (float): Duree de cache des statistiques en secondes
+                (0 pour desactiver le cache).
         """
         self.connection_string = connection_string
         self.database_name = database_name
         self.client = None
         self.db = None
         self.collection = None
+        self.stats_ttl = stats_ttl
+        self._stats_cache = None
 
         self.connect()
 
@@ -64,10 +136,27 @@ class MongoDBHandler:
             # Index pour les recherches par categorie
             self.collection.create_index("subcategory")
 
+            # Index sur les champs normalises, suivis de la date pour que
+            # le tri des resultats soit lui aussi servi par l'index
+            for search_field in ('author_lc', 'subcategory_lc'):
+                self.collection.create_index(
+                    [(search_field, ASCENDING), ("publish_date", DESCENDING)])
+            self.collection.create_index("title_lc")
+
             # Index pour les recherches textuelles dans le titre
             text_indexes = [("title", "text"), ("content", "text")]
             self.collection.create_index(text_indexes)
 
+            marker = {'_id': 'search_fields',
+                      'version': SEARCH_FIELDS_VERSION}
+            if self.db.meta.count_documents(marker, limit=1) == 0:
+                self.backfill_search_fields()
+                self.db.meta.update_one(
+                    {'_id': 'search_fields'},
+                    {'$set': {'version': SEARCH_FIELDS_VERSION,
+                              'backfilled_at': datetime.now()}},
+                    upsert=True)
+
             print("Index MongoDB crees avec succes")
 
         except Exception as e:
@@ -86,9 +175,11 @@ class MongoDBHandler:
         try:
             # Ajouter la date de sauvegarde
             article_data['saved_at'] = datetime.now()
+            add_search_fields(article_data)
 
             # Tentative d'insertion
             self.collection.insert_one(article_data)
+            self._stats_cache = None
 
             title = article_data.get('title', 'Sans titre')[:50]
             print(f"Article sauvegarde: {title}...")
@@ -102,12 +193,20 @@ class MongoDBHandler:
             print(f"Erreur lors de la sauvegarde: {e}")
             return False
 
-    def save_articles(self, articles_list: List[Dict]) -> Dict[str, int]:
+    def save_articles(self, articles_list: List[Dict],
+                      batch_size: int = BULK_BATCH_SIZE,
+                      update_existing: bool = False) -> Dict[str, int]:
         """
-        Sauvegarde une liste d'articles.
+        Sauvegarde une liste d'articles par lots (bulk_write non ordonne).
+
+        Chaque article est un upsert sur l'URL. Par defaut ($setOnInsert) un
+        article deja present n'est pas modifie et compte comme doublon ; avec
+        update_existing ($set) il est mis a jour s'il a change.
 
         Args:
             articles_list (List[Dict]): Liste des articles a sauvegarder.
+            batch_size (int): Nombre d'operations par aller-retour.
+            update_existing (bool): Mettre a jour les articles existants.
 
         Returns:
             Dict[str, int]: Statistiques de sauvegarde.
@@ -115,52 +214,341 @@ class MongoDBHandler:
         stats = {
             'total': len(articles_list),
             'saved': 0,
+            'updated': 0,
             'duplicates': 0,
             'errors': 0
         }
 
         print(f"Sauvegarde de {stats['total']} articles...")
 
+        operations = []
+        seen_urls = set()
+        saved_at = datetime.now()
+
         for article in articles_list:
-            if self.save_article(article):
-                stats['saved'] += 1
+            url = article.get('url')
+            if not url:
+                stats['errors'] += 1
+                continue
+            # Doublons a l'interieur du lot
+            if url in seen_urls:
+                stats['duplicates'] += 1
+                continue
+            seen_urls.add(url)
+
+            document = add_search_fields(dict(article))
+            document.pop('_id', None)
+            if update_existing:
+                update = {'$set': document,
+                          '$setOnInsert': {'saved_at': saved_at}}
             else:
-                # Verifier si c'est un doublon ou une erreur
-                try:
-                    if self.collection.find_one({'url': article.get('url')}):
-                        stats['duplicates'] += 1
-                    else:
-                        stats['errors'] += 1
-                except Exception:
-                    stats['errors'] += 1
+                document['saved_at'] = saved_at
+                update = {'$setOnInsert': document}
+            operations.append(UpdateOne({'url': url}, update, upsert=True))
+
+        for start in range(0, len(operations), batch_size):
+            self._bulk_save(operations[start:start + batch_size], stats)
+        self._stats_cache = None
 
         print("Sauvegarde terminee:")
         print(f"   Sauvegardes: {stats['saved']}")
+        if update_existing:
+            print(f"   Mis a jour: {stats['updated']}")
         print(f"   Doublons: {stats['duplicates']}")
         print(f"   Erreurs: {stats['errors']}")
 
         return stats
 
+    def _bulk_save(self, operations: List[UpdateOne],
+                   stats: Dict[str, int]):
+        """
+        Execute un lot d'upserts et met a jour les statistiques.
+
+        Args:
+            operations (List[UpdateOne]): Operations du lot.
+            stats (Dict[str, int]): Statistiques a completer.
+        """
+        try:
+            result = self.collection.bulk_write(operations, ordered=False)
+            stats['saved'] += result.upserted_count
+            stats['updated'] += result.modified_count
+            stats['duplicates'] += result.matched_count - result.modified_count
+        except BulkWriteError as e:
+            details = e.details
+            modified = details.get('nModified', 0)
+            stats['saved'] += details.get('nUpserted', 0)
+            stats['updated'] += modified
+            stats['duplicates'] += details.get('nMatched', 0) - modified
+            for error in details.get('writeErrors', []):
+                # 11000 : l'article a ete insere en parallele
+                if error.get('code') == 11000:
+                    stats['duplicates'] += 1
+                else:
+                    stats['errors'] += 1
+        except Exception as e:
+            print(f"Erreur lors de la sauvegarde groupee: {e}")
+            stats['errors'] += len(operations)
+
+    def backfill_search_fields(self) -> int:
+        """
+        Complete les articles enregistres avant l'ajout des champs normalises.
+
+        Returns:
+            int: Nombre d'articles mis a jour.
+        """
+        projection = {field: 1 for field in SEARCH_FIELDS}
+        cursor = self.collection.find(
+            {'subcategory_lc': {'$exists': False}}, projection)
+
+        operations = []
+        updated = 0
+        for doc in cursor:
+            fields = add_search_fields({field: doc.get(field)
+                                        for field in SEARCH_FIELDS})
+            search_values = {search_field: fields[search_field]
+                             for search_field in SEARCH_FIELDS.values()}
+            operations.append(UpdateOne({'_id': doc['_id']},
+                                        {'$set': search_values}))
+            if len(operations) >= BULK_BATCH_SIZE:
+                updated += self.collection.bulk_write(
+                    operations, ordered=False).modified_count
+                operations = []
+        if operations:
+            updated += self.collection.bulk_write(
+                operations, ordered=False).modified_count
+
+        if updated:
+            print(f"Champs de recherche ajoutes a {updated} articles")
+        return updated
+
+    def build_search_query(self,
+                           title_substring: str = None,
+                           keywords: str = None,
+                           author: str = None,
+                           category: str = None,
+                           subcategory: str = None,
+                           date_start: str = None,
+                           date_end: str = None,
+                           match: str = 'contains') -> Dict:
+        """
+        Construit un filtre MongoDB qui s'appuie sur les index.
+
+        author, category et subcategory sont compares aux champs normalises
+        (author_lc, subcategory_lc) : 'contains' (defaut) garde la recherche
+        par sous-chaine et parcourt toute la collection, 'exact' et 'prefix'
+        sont servis par l'index. keywords utilise l'index texte.
+
+        Args:
+            title_substring (str): Sous-chaine a rechercher dans le titre.
+            keywords (str): Mots-cles recherches dans le titre et le contenu.
+            author (str): Nom de l'auteur.
+            category (str): Categorie.
+            subcategory (str): Sous-categorie (prioritaire sur category).
+            date_start (str): Date de debut (format YYYY-MM-DD).
+            date_end (str): Date de fin (format YYYY-MM-DD).
+            match (str): Mode de correspondance ('contains', 'prefix',
+                'exact').
+
+        Returns:
+            Dict: Filtre MongoDB.
+        """
+        if match not in MATCH_MODES:
+            raise ValueError(f"Mode de correspondance inconnu: {match}")
+
+        def condition(value):
+            value = normalize_search_text(value) or ''
+            if match == 'exact':
+                return value
+            if match == 'prefix':
+                # Regex ancree et sensible a la casse : bornes d'index
+                return {'$regex': '^' + re.escape(value)}
+            return {'$regex': re.escape(value)}
+
+        query = {}
+
+        # Recherche plein texte (index texte titre/contenu)
+        if keywords:
+            query['$text'] = {'$search': keywords}
+
+        # Recherche par titre
+        if title_substring:
+            query['title_lc'] = {'$regex': re.escape(
+                normalize_search_text(title_substring) or '')}
+
+        # Recherche par auteur
+        if author:
+            query['author_lc'] = condition(author)
+
+        # Recherche par sous-categorie (plus specifique) ou categorie
+        if subcategory or category:
+            query['subcategory_lc'] = condition(subcategory or category)
+
+        # Recherche par date
+        date_query = {}
+        if date_start:
+            date_query['$gte'] = date_start
+        if date_end:
+            date_query['$lte'] = date_end
+
+        if date_query:
+            query['publish_date'] = date_query
+
+        return query
+
+    def explain_search(self, **criteria) -> List[str]:
+        """
+        Donne les etapes du plan retenu par MongoDB pour une recherche.
+
+        Args:
+            **criteria: Criteres acceptes par build_search_query.
+
+        Returns:
+            List[str]: Etapes du plan gagnant (ex. ['FETCH', 'IXSCAN']).
+        """
+        query = self.build_search_query(**criteria)
+        plan = self.collection.find(query).sort(
+            'publish_date', DESCENDING).explain()
+        stage = plan['queryPlanner']['winningPlan']
+        stages = []
+        while stage:
+            stages.append(stage.get('stage'))
+            stage = stage.get('inputStage') or (stage.get('inputStages')
+                                                or [None])[0]
+        return stages
+
+    def get_known_articles(self, urls: List[str]) -> Dict[str, Dict]:
+        """
+        Recupere les articles deja stockes parmi une liste d'URLs.
+
+        Args:
+            urls (List[str]): URLs candidates.
+
+        Returns:
+            Dict[str, Dict]: Validateurs HTTP (http_etag, http_last_modified)
+            par URL deja presente en base.
+        """
+        try:
+            cursor = self.collection.find(
+                {'url': {'$in': list(urls)}},
+                {'_id': 0, 'url': 1, 'http_etag': 1, 'http_last_modified': 1}
+            )
+            return {doc['url']: doc for doc in cursor}
+        except Exception as e:
+            print(f"Erreur lors de la verification des articles connus: {e}")
+            return {}
+
+    def find_articles(self, projection: List[str] = None,
+                      limit: int = None, skip: int = 0,
+                      **criteria):
+        """
+        Recherche paresseuse : renvoie le curseur sans le parcourir.
+
+        Tri, pagination et projection sont appliques par le serveur ; les
+        documents ne sont transferes qu'au fil de l'iteration.
+
+        Args:
+            projection (List[str] or Dict, optional): Champs a renvoyer
+                (tous si None), ou specification de projection MongoDB.
+            limit (int, optional): Nombre maximum de resultats.
+            skip (int): Nombre de resultats a sauter.
+            **criteria: Criteres acceptes par build_search_query.
+
+        Returns:
+            Cursor: Curseur MongoDB trie par date decroissante.
+        """
+        query = self.build_search_query(**criteria)
+        cursor = self.collection.find(query, projection).sort(
+            'publish_date', DESCENDING)
+        if skip:
+            cursor = cursor.skip(skip)
+        if limit:
+            cursor = cursor.limit(limit)
+        return cursor
+
+    def iter_article_summaries(self, limit: int = None, skip: int = 0,
+                               **criteria):
+        """
+        Resume des articles avec longueurs calculees par le serveur.
+
+        Renvoie les SUMMARY_FIELDS plus content_length (caracteres) et
+        image_count, sans transferer content ni images.
+
+        Args:
+            limit (int, optional): Nombre maximum de resultats.
+            skip (int): Nombre de resultats a sauter.
+            **criteria: Criteres acceptes par build_search_query.
+
+        Returns:
+            CommandCursor: Curseur d'agregation, parcouru a la demande.
+        """
+        pipeline = [
+            {'$match': self.build_search_query(**criteria)},
+            {'$sort': {'publish_date': DESCENDING}}
+        ]
+        if skip:
+            pipeline.append({'$skip': skip})
+        if limit:
+            pipeline.append({'$limit': limit})
+
+        projection = {field: 1 for field in SUMMARY_FIELDS}
+        projection['content_length'] = {
+            '$strLenCP': {'$ifNull': ['$content', '']}}
+        projection['image_count'] = {
+            '$size': {'$objectToArray': {'$ifNull': ['$images', {}]}}}
+        pipeline.append({'$project': projection})
+
+        return self.collection.aggregate(pipeline)
+
+    def export_articles(self, path: str, projection=None, **criteria) -> int:
+        """
+        Exporte en flux les articles d'une recherche vers un fichier.
+
+        Le format vient de l'extension (.json, .jsonl, .csv, .gz, ou
+        .parquet pour un export colonnaire type, qui necessite pyarrow).
+
+        Args:
+            path (str): Fichier de sortie.
+            projection (List[str] or Dict, optional): Champs a exporter.
+            **criteria: Criteres acceptes par find_articles.
+
+        Returns:
+            int: Nombre d'articles exportes.
+        """
+        from article_export import export_articles
+
+        if projection is None:
+            # Champs de recherche internes exclus
+            projection = {field: 0 for field in SEARCH_FIELDS.values()}
+        cursor = self.find_articles(projection=projection, **criteria)
+        count = export_articles(cursor, path)
+        print(f"{count} articles exportes dans {path}")
+        return count
+
     def get_articles_by_category(self, category: str,
-                                 subcategory: str = None) -> List[Dict]:
+                                 subcategory: str = None,
+                                 match: str = 'contains',
+                                 projection: List[str] = None,
+                                 limit: int = None,
+                                 skip: int = 0) -> List[Dict]:
         """
         Recupere les articles par categorie/sous-categorie.
 
         Args:
             category (str): Categorie principale.
             subcategory (str, optional): Sous-categorie.
+            match (str): Mode de correspondance ('contains', 'prefix',
+                'exact').
+            projection (List[str], optional): Champs a renvoyer.
+            limit (int, optional): Nombre maximum de resultats.
+            skip (int): Nombre de resultats a sauter.
 
         Returns:
             List[Dict]: Liste des articles trouves.
         """
         try:
-            query = {}
-
-            search_term = subcategory if subcategory else category
-            query['subcategory'] = {'$regex': search_term, '$options': 'i'}
-
-            articles = list(self.collection.find(query).sort('publish_date',
-                                                             DESCENDING))
+            articles = list(self.find_articles(
+                projection=projection, limit=limit, skip=skip,
+                category=category, subcategory=subcategory, match=match))
 
             category_name = subcategory or category
             print(f"{len(articles)} articles trouves pour la categorie "
@@ -179,7 +567,11 @@ class MongoDBHandler:
                         subcategory: str = None,
                         date_start: str = None,
                         date_end: str = None,
-                        limit: int = None) -> List[Dict]:
+                        limit: int = None,
+                        keywords: str = None,
+                        match: str = 'contains',
+                        projection: List[str] = None,
+                        skip: int = 0) -> List[Dict]:
         """
         Recherche avancee d'articles.
 
@@ -191,50 +583,27 @@ class MongoDBHandler:
             date_start (str): Date de debut (format YYYY-MM-DD).
             date_end (str): Date de fin (format YYYY-MM-DD).
             limit (int): Nombre maximum de resultats.
+            keywords (str): Mots-cles (recherche plein texte $text).
+            match (str): Mode de correspondance pour author/category/
+                subcategory ('contains', 'prefix', 'exact').
+            projection (List[str], optional): Champs a renvoyer.
+            skip (int): Nombre de resultats a sauter.
 
         Returns:
             List[Dict]: Articles correspondant aux criteres.
         """
         try:
-            query = {}
-
-            # Recherche par titre
-            if title_substring:
-                query['title'] = {'$regex': title_substring, '$options': 'i'}
-
-            # Recherche par auteur
-            if author:
-                query['author'] = {'$regex': author, '$options': 'i'}
-
-            # Recherche par categorie
-            if category:
-                query['subcategory'] = {'$regex': category, '$options': 'i'}
-
-            # Recherche par sous-categorie (plus specifique)
-            if subcategory:
-                query['subcategory'] = {'$regex': subcategory,
-                                        '$options': 'i'}
-
-            # Recherche par date
-            date_query = {}
-            if date_start:
-                date_query['$gte'] = date_start
-            if date_end:
-                date_query['$lte'] = date_end
-
-            if date_query:
-                query['publish_date'] = date_query
-
-            print(f"Recherche avec les criteres: {query}")
-
-            # Executer la requete
-            cursor = self.collection.find(query).sort('publish_date',
-                                                      DESCENDING)
-
-            if limit:
-                cursor = cursor.limit(limit)
+            criteria = {
+                'title_substring': title_substring, 'keywords': keywords,
+                'author': author, 'category': category,
+                'subcategory': subcategory, 'date_start': date_start,
+                'date_end': date_end, 'match': match
+            }
+            print(f"Recherche avec les criteres: "
+                  f"{self.build_search_query(**criteria)}")
 
-            articles = list(cursor)
+            articles = list(self.find_articles(
+                projection=projection, limit=limit, skip=skip, **criteria))
 
             print(f"{len(articles)} articles trouves")
 
@@ -278,54 +647,79 @@ class MongoDBHandler:
             print(f"Erreur lors de la recuperation des auteurs: {e}")
             return []
 
-    def get_statistics(self) -> Dict:
+    def get_statistics(self, use_cache: bool = True) -> Dict:
         """
         Recupere les statistiques de la base de donnees.
 
+        Une seule agregation $facet calcule le total, les effectifs par
+        categorie et par auteur et la plage de dates. Le resultat est garde
+        stats_ttl secondes et invalide a chaque sauvegarde.
+
+        Args:
+            use_cache (bool): Utiliser le resultat en cache s'il est valide.
+
         Returns:
-            Dict: Statistiques de la base.
+            Dict: Statistiques de la base ('total_articles',
+            'total_categories', 'total_authors', 'date_range',
+            'categories' et 'authors' : effectifs par nom).
         """
+        if use_cache and self._stats_cache and self.stats_ttl:
+            cached_at, stats = self._stats_cache
+            if time.monotonic() - cached_at < self.stats_ttl:
+                return stats
+
+        def count_by(field):
+            return [
+                {'$match': {field: {'$nin': [None, '']}}},
+                {'$group': {'_id': f'${field}', 'count': {'$sum': 1}}},
+                {'$sort': {'_id': ASCENDING}}
+            ]
+
+        pipeline = [{'$facet': {
+            'totals': [{'$group': {
+                '_id': None,
+                'count': {'$sum': 1},
+                # $min/$max ignorent les dates absentes (None)
+                'oldest': {'$min': '$publish_date'},
+                'newest': {'$max': '$publish_date'}
+            }}],
+            'categories': count_by('subcategory'),
+            'authors': count_by('author')
+        }}]
+
         try:
-            stats = {
-                'total_articles': self.collection.count_documents({}),
-                'total_categories': len(self.get_all_categories()),
-                'total_authors': len(self.get_all_authors()),
-                'date_range': self.get_date_range()
-            }
-            return stats
+            result = next(self.collection.aggregate(pipeline))
         except Exception as e:
             print(f"Erreur lors du calcul des statistiques: {e}")
             return {}
 
-    def get_date_range(self) -> Dict:
+        totals = result['totals'][0] if result['totals'] else {}
+        categories = {doc['_id']: doc['count']
+                      for doc in result['categories']}
+        authors = {doc['_id']: doc['count'] for doc in result['authors']}
+        stats = {
+            'total_articles': totals.get('count', 0),
+            'total_categories': len(categories),
+            'total_authors': len(authors),
+            'date_range': {
+                'oldest': totals.get('oldest'),
+                'newest': totals.get('newest')
+            },
+            'categories': categories,
+            'authors': authors
+        }
+
+        self._stats_cache = (time.monotonic(), stats)
+        return stats
+
+    def get_category_counts(self) -> Dict[str, int]:
         """
-        Recupere la plage de dates des articles.
+        Nombre d'articles par categorie, en une seule requete.
 
         Returns:
-            Dict: Plage de dates avec 'oldest' et 'newest'.
+            Dict[str, int]: Effectif par categorie, trie par nom.
         """
-        try:
-            # Article le plus ancien
-            oldest_query = {'publish_date': {'$ne': None}}
-            oldest = self.collection.find(
-                oldest_query).sort('publish_date',
-                                   ASCENDING).limit(1)
-            oldest = list(oldest)
-
-            # Article le plus recent
-            newest_query = {'publish_date': {'$ne': None}}
-            newest = self.collection.find(
-                newest_query).sort('publish_date',
-                                   DESCENDING).limit(1)
-            newest = list(newest)
-
-            return {
-                'oldest': oldest[0]['publish_date'] if oldest else None,
-                'newest': newest[0]['publish_date'] if newest else None
-            }
-        except Exception as e:
-            print(f"Erreur lors du calcul de la plage de dates: {e}")
-            return {'oldest': None, 'newest': None}
+        return self.get_statistics().get('categories', {})
 
     def close_connection(self):
         """Ferme la connexion MongoDB."""
@@ -1,13 +1,39 @@
 import argparse
-import csv
-import json
 from datetime import datetime
 
-from mongodb_handler import MongoDBHandler
+from article_export import article_sizes, export_articles
+from mongodb_handler import MATCH_MODES, SEARCH_FIELDS, MongoDBHandler
+
+# Champs de recherche internes, exclus des exports
+EXPORT_PROJECTION = {field: 0 for field in SEARCH_FIELDS.values()}
+
+# Libelles des modes de correspondance proposes en mode interactif
+MATCH_LABELS = {
+    'contains': "Contient (defaut)",
+    'prefix': "Commence par (utilise l'index)",
+    'exact': "Exacte (utilise l'index)"
+}
+
+
+def ask_match_mode():
+    """
+    Demande le mode de correspondance des recherches par texte.
+
+    Returns:
+        str: Mode choisi parmi MATCH_MODES ('contains' par defaut).
+    """
+    print("\nCorrespondance:")
+    for i, mode in enumerate(MATCH_MODES, 1):
+        print(f"{i}. {MATCH_LABELS[mode]}")
+
+    choice = input(f"Choisissez (1-{len(MATCH_MODES)}): ").strip()
+    if choice.isdigit() and 1 <= int(choice) <= len(MATCH_MODES):
+        return MATCH_MODES[int(choice) - 1]
+    return 'contains'
 
 
 def get_articles_by_category(category, subcategory=None, limit=None,
-                            output_format="console"):
+                            output_format="console", match="contains"):
     """
     Recupere tous les articles d'une categorie ou sous-categorie.
 
@@ -16,9 +42,10 @@ def get_articles_by_category(category, subcategory=None, limit=None,
         subcategory (str): Sous-categorie (optionnel).
         limit (int): Limite du nombre de resultats (optionnel).
         output_format (str): Format de sortie ('console', 'json', 'csv').
+        match (str): Mode de correspondance ('contains', 'prefix', 'exact').
 
     Returns:
-        List[Dict]: Liste des articles trouves.
+        int: Nombre d'articles trouves.
     """
     try:
         # Connexion a MongoDB
@@ -28,31 +55,61 @@ def get_articles_by_category(category, subcategory=None, limit=None,
         search_term = subcategory if subcategory else category
         print(f"Recherche d'articles pour la categorie: '{search_term}'")
 
-        articles = db_handler.get_articles_by_category(category, subcategory)
-
-        if not articles:
-            print(f"Aucun article trouve pour la categorie '{search_term}'")
-            return []
-
-        # Appliquer la limite si spécifiée
         if limit and limit > 0:
-            articles = articles[:limit]
             print(f"Limitation a {limit} resultats")
-
-        # Affichage selon le format demandé
-        if output_format == "console":
-            display_articles_console(articles, search_term)
-        elif output_format == "json":
-            save_articles_json(articles, search_term)
-        elif output_format == "csv":
-            save_articles_csv(articles, search_term)
+        count = output_articles(db_handler, category, subcategory, limit,
+                                output_format, search_term, match)
 
         db_handler.close_connection()
-        return articles
+        return count
 
     except Exception as e:
         print(f"Erreur lors de la recherche: {e}")
-        return []
+        return 0
+
+
+def output_articles(db_handler, category, subcategory=None, limit=None,
+                    output_format="console", label=None, match="contains"):
+    """
+    Affiche ou exporte les articles d'une categorie, limites cote serveur.
+
+    L'affichage console et le CSV n'utilisent que des resumes dont les
+    longueurs sont calculees par MongoDB ; seul l'export JSON lit les
+    documents complets. Les exports sont ecrits au fil du curseur.
+
+    Args:
+        db_handler: Gestionnaire de base de donnees MongoDB.
+        category (str): Categorie principale.
+        subcategory (str): Sous-categorie (optionnel).
+        limit (int): Limite du nombre de resultats (optionnel).
+        output_format (str): Format de sortie ('console', 'json', 'csv').
+        label (str): Nom de la recherche pour l'affichage et les fichiers.
+        match (str): Mode de correspondance ('contains', 'prefix', 'exact').
+
+    Returns:
+        int: Nombre d'articles trouves.
+    """
+    limit = limit if limit and limit > 0 else None
+    label = label or subcategory or category
+    criteria = {'category': category, 'subcategory': subcategory,
+                'limit': limit, 'match': match}
+
+    if output_format == "json":
+        count = save_articles_json(
+            db_handler.find_articles(projection=EXPORT_PROJECTION,
+                                     **criteria), label)
+    elif output_format == "csv":
+        count = save_articles_csv(
+            db_handler.iter_article_summaries(**criteria), label)
+    else:
+        articles = list(db_handler.iter_article_summaries(**criteria))
+        count = len(articles)
+        if articles:
+            display_articles_console(articles, label)
+
+    if not count:
+        print(f"Aucun article trouve pour la categorie '{label}'")
+    return count
 
 
 def display_articles_console(articles, category_name):
@@ -82,10 +139,10 @@ def display_articles_console(articles, category_name):
                 summary = summary[:100] + "..."
             print(f"   Resume: {summary}")
 
-        if article.get('images'):
-            print(f"   Images: {len(article['images'])} trouvees")
+        image_count, content_length = article_sizes(article)
+        if image_count:
+            print(f"   Images: {image_count} trouvees")
 
-        content_length = len(article.get('content', ''))
         print(f"   Contenu: {content_length} caracteres")
 
 
@@ -94,28 +151,29 @@ def save_articles_json(articles, category_name):
     Sauvegarde les articles en JSON.
 
     Args:
-        articles (list): Liste des articles a sauvegarder.
+        articles (iterable): Articles a sauvegarder (liste ou curseur).
         category_name (str): Nom de la categorie.
+
+    Returns:
+        int: Nombre d'articles sauvegardes.
     """
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     safe_category_name = category_name.replace(' ', '_')
     filename = f"articles_{safe_category_name}_{timestamp}.json"
 
     try:
-        export_data = {
+        metadata = {
             'category': category_name,
-            'total_articles': len(articles),
-            'exported_at': datetime.now().isoformat(),
-            'articles': articles
+            'exported_at': datetime.now().isoformat()
         }
-
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(export_data, f, ensure_ascii=False, indent=2)
+        count = export_articles(articles, filename, 'json', metadata)
 
         print(f"Articles sauvegardes en JSON: {filename}")
+        return count
 
     except Exception as e:
         print(f"Erreur lors de la sauvegarde JSON: {e}")
+        return 0
 
 
 def save_articles_csv(articles, category_name):
@@ -123,64 +181,87 @@ def save_articles_csv(articles, category_name):
     Sauvegarde les articles en CSV.
 
     Args:
-        articles (list): Liste des articles a sauvegarder.
+        articles (iterable): Articles a sauvegarder (liste ou curseur).
         category_name (str): Nom de la categorie.
+
+    Returns:
+        int: Nombre d'articles sauvegardes.
     """
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     safe_category_name = category_name.replace(' ', '_')
     filename = f"articles_{safe_category_name}_{timestamp}.csv"
 
     try:
-        with open(filename, 'w', newline='', encoding='utf-8') as f:
-            if not articles:
-                print("Aucun article a sauvegarder")
-                return
-
-            # En-tetes CSV
-            fieldnames = [
-                'titre', 'url', 'auteur', 'date_publication',
-                'categorie', 'resume', 'nb_images', 'taille_contenu'
-            ]
-
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            writer.writeheader()
-
-            # Ecrire les articles
-            for article in articles:
-                writer.writerow({
-                    'titre': article.get('title', ''),
-                    'url': article.get('url', ''),
-                    'auteur': article.get('author', ''),
-                    'date_publication': article.get('publish_date', ''),
-                    'categorie': article.get('subcategory', ''),
-                    'resume': article.get('summary', ''),
-                    'nb_images': len(article.get('images', {})),
-                    'taille_contenu': len(article.get('content', ''))
-                })
-
-        print(f"Articles sauvegardes en CSV: {filename}")
+        count = export_articles(articles, filename, 'csv')
+
+        if count:
+            print(f"Articles sauvegardes en CSV: {filename}")
+        else:
+            print("Aucun article a sauvegarder")
+        return count
 
     except Exception as e:
         print(f"Erreur lors de la sauvegarde CSV: {e}")
+        return 0
+
+
+def export_collection(path, category=None, subcategory=None, limit=None,
+                      match="contains"):
+    """
+    Exporte la collection (ou une categorie) en flux depuis MongoDB.
+
+    Le format est deduit de l'extension : .json, .jsonl ou .csv, suivie
+    eventuellement de .gz pour compresser, ou .parquet (colonnaire).
+
+    Args:
+        path (str): Fichier de sortie.
+        category (str): Categorie a exporter (toutes si absente).
+        subcategory (str): Sous-categorie (optionnel).
+        limit (int): Nombre maximum d'articles (optionnel).
+        match (str): Mode de correspondance ('contains', 'prefix', 'exact').
+
+    Returns:
+        int: Nombre d'articles exportes.
+    """
+    try:
+        db_handler = MongoDBHandler()
+        try:
+            cursor = db_handler.find_articles(projection=EXPORT_PROJECTION,
+                                              category=category,
+                                              subcategory=subcategory,
+                                              limit=limit, match=match)
+            metadata = {
+                'category': subcategory or category,
+                'exported_at': datetime.now().isoformat()
+            }
+            count = export_articles(cursor, path, metadata=metadata)
+        finally:
+            db_handler.close_connection()
+
+        print(f"{count} articles exportes dans {path}")
+        return count
+
+    except Exception as e:
+        print(f"Erreur lors de l'export: {e}")
+        return 0
 
 
 def list_all_categories():
     """Liste toutes les categories disponibles."""
     try:
         db_handler = MongoDBHandler()
-        categories = db_handler.get_all_categories()
+        # Effectifs de toutes les categories en une seule agregation
+        category_counts = db_handler.get_category_counts()
 
-        if not categories:
+        if not category_counts:
             print("Aucune categorie trouvee dans la base de donnees")
             return
 
-        print(f"\n{len(categories)} CATEGORIES DISPONIBLES:")
+        print(f"\n{len(category_counts)} CATEGORIES DISPONIBLES:")
         print("=" * 50)
 
-        for i, category in enumerate(categories, 1):
-            # Compter les articles pour cette catégorie
-            articles = db_handler.get_articles_by_category(category)
-            print(f"{i:2d}. {category} ({len(articles)} articles)")
+        for i, (category, count) in enumerate(category_counts.items(), 1):
+            print(f"{i:2d}. {category} ({count} articles)")
 
         db_handler.close_connection()
 
@@ -249,6 +330,8 @@ def interactive_category_search(db_handler):
     subcategory = category if is_subcategory_input == 'o' else None
     main_category = category if not subcategory else None
 
+    match = ask_match_mode()
+
     # Demander la limite
     try:
         limit_input = input("Nombre maximum de resultats "
@@ -268,24 +351,9 @@ def interactive_category_search(db_handler):
     formats = {"1": "console", "2": "json", "3": "csv"}
     output_format = formats.get(format_choice, "console")
 
-    # Effectuer la recherche
-    articles = db_handler.get_articles_by_category(main_category, subcategory)
-
-    if not articles:
-        print(f"Aucun article trouve pour '{category}'")
-        return
-
-    # Appliquer la limite
-    if limit and limit > 0:
-        articles = articles[:limit]
-
-    # Afficher selon le format
-    if output_format == "console":
-        display_articles_console(articles, category)
-    elif output_format == "json":
-        save_articles_json(articles, category)
-    elif output_format == "csv":
-        save_articles_csv(articles, category)
+    # Effectuer la recherche et afficher selon le format
+    output_articles(db_handler, main_category, subcategory, limit,
+                    output_format, category, match)
 
 
 def show_database_stats(db_handler):
@@ -323,6 +391,12 @@ def main():
                         help="Nombre maximum de resultats")
     parser.add_argument("--format", choices=["console", "json", "csv"],
                         default="console", help="Format de sortie")
+    parser.add_argument("--export", metavar="FICHIER",
+                        help="Exporter en flux (.json, .jsonl, .csv, "
+                             "suffixe .gz pour compresser, ou .parquet)")
+    parser.add_argument("--match", choices=MATCH_MODES, default="contains",
+                        help="Correspondance de la categorie (prefix et "
+                             "exact utilisent l'index)")
     parser.add_argument("--list-categories", action="store_true",
                         help="Lister toutes les categories")
     parser.add_argument("--interactive", action="store_true",
@@ -332,6 +406,9 @@ def main():
 
     if args.list_categories:
         list_all_categories()
+    elif args.export:
+        export_collection(args.export, args.category, args.subcategory,
+                          args.limit, args.match)
     elif args.interactive:
         interactive_search()
     elif args.category:
@@ -339,7 +416,8 @@ def main():
             args.category,
             args.subcategory,
             args.limit,
-            args.format
+            args.format,
+            args.match
         )
     else:
         # Mode interactif par défaut si aucun argument
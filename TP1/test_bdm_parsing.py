@@ -0,0 +1,242 @@
+import random
+import re
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import pytest
+from bs4 import BeautifulSoup
+
+from bdm_scraper import BDMScraper
+
+SAMPLES = 3000
+
+
+def reference_is_article_link(href):
+    """
+    Ancienne version de _is_article_link (listes reconstruites a chaque
+    appel, un test par motif), gardee comme reference.
+
+    Args:
+        href (str): Attribut href a tester.
+
+    Returns:
+        bool: True si le lien ressemble a un article.
+    """
+    if not href:
+        return False
+    if href.startswith('http') and 'blogdumoderateur.com' not in href:
+        return False
+    ignore_patterns = [
+        '/category/', '/tag/', '/author/', '/page/',
+        '/contact', '/about', '/mentions-legales',
+        '/politique-confidentialite', '/search',
+        '.jpg', '.png', '.gif', '.pdf',
+        'mailto:', 'tel:', '#'
+    ]
+    for pattern in ignore_patterns:
+        if pattern in href.lower():
+            return False
+    for pattern in [r'/20\d{2}/', r'/\d{4}/', r'[\w-]+/$']:
+        if re.search(pattern, href):
+            return True
+    segments = href.strip('/').split('/')
+    if (len(segments) >= 2 and
+            not any(char in href for char in ['?', '#', '='])):
+        return True
+    return False
+
+
+def reference_parse_date(date_str):
+    """
+    Ancienne version de _parse_date (formats essayes dans l'ordre).
+
+    Args:
+        date_str (str): Chaine de date a parser.
+
+    Returns:
+        datetime or None: Date parsee ou None si echec.
+    """
+    date_str = re.sub(r'[^\d\-/:. ]', '', date_str).strip()
+    for pattern in ['%Y-%m-%d', '%d/%m/%Y', '%d-%m-%Y',
+                    '%Y-%m-%dT%H:%M:%S', '%Y-%m-%d %H:%M:%S',
+                    '%d/%m/%Y %H:%M']:
+        try:
+            return datetime.strptime(date_str, pattern)
+        except ValueError:
+            continue
+    return None
+
+
+HREF_PARTS = [
+    '', '/', 'https://www.blogdumoderateur.com', 'https://example.com',
+    '/2024/', '/1999/', '/20ab/', 'article-ia', 'Web', '/category/',
+    '/TAG/', '/author/x', '/page/2', '/contact', '/About', '/search',
+    '.jpg', '.PDF', 'mailto:', 'tel:', '#top', '?p=1', '=', '/',
+    'reseaux-sociaux/', 'outils', '_x', 'é',
+]
+
+DATE_PARTS = [
+    '2024', '01', '1', '31', '13', '-', '/', ':', ' ', 'T', '.',
+    '12:30', '00:00:00', 'Publie le', 'janv.', '\n',
+]
+
+
+def random_strings(parts, seed):
+    """
+    Chaines aleatoires assemblees a partir de fragments.
+
+    Args:
+        parts (list): Fragments possibles.
+        seed (int): Graine du generateur.
+
+    Returns:
+        list: SAMPLES chaines.
+    """
+    rng = random.Random(seed)
+    return [''.join(rng.choices(parts, k=rng.randint(0, 7)))
+            for _ in range(SAMPLES)]
+
+
+@pytest.fixture(scope='module')
+def scraper():
+    """Scraper sans acces reseau (seules les methodes d'analyse servent)."""
+    return BDMScraper(max_workers=2)
+
+
+def test_is_article_link_matches_reference(scraper):
+    """Les regex precompilees rendent les memes decisions qu'avant."""
+    hrefs = random_strings(HREF_PARTS, seed=14)
+    for href in hrefs:
+        assert scraper._is_article_link(href) == \
+            reference_is_article_link(href), href
+
+
+def test_parse_date_matches_reference(scraper):
+    """Le format memorise ne change pas le resultat, quel que soit l'ordre."""
+    dates = random_strings(DATE_PARTS, seed=14) + [
+        '2024-01-15', '15/01/2024', '15-01-2024', '2024-01-15T10:30:00',
+        '2024-01-15 10:30:00', '15/01/2024 10:30', 'Publie le 15/01/2024',
+    ] * 10
+    random.Random(14).shuffle(dates)
+    assert any(reference_parse_date(date) for date in dates)
+    for date in dates:
+        assert scraper._parse_date(date) == reference_parse_date(date), date
+
+
+def test_parse_date_from_several_threads(scraper):
+    """Chaque thread garde son propre format memorise."""
+    dates = ['2024-01-15', '15/01/2024', '15/01/2024 10:30'] * 200
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        parsed = list(executor.map(scraper._parse_date, dates))
+    assert parsed == [reference_parse_date(date) for date in dates]
+
+
+# Une zone "widget-content" precede le corps de l'article : le resume et
+# les images prennent le premier noeud "content" du document (selecteur
+# combine), le contenu suit la cascade .entry-content d'abord
+SIDEBAR_FIRST_PAGE = """
+<html><head>
+  <meta property="description" content="Description Open Graph">
+  <meta property="og:image" content="/og.jpg">
+</head><body>
+  <div class="widget-content"><p>Texte du widget</p><img src="/widget.png"></div>
+  <div class="entry-content">
+    <p>Premier paragraphe</p>
+    <img src="/corps.png" alt="Corps">
+    <aside><img src="/pub.png"></aside>
+  </div>
+</body></html>
+"""
+
+# Seule la balise meta name="description" sert de resume ; le contenu
+# retire l'aside, dont l'image n'est plus listee ensuite
+NAMED_DESCRIPTION_PAGE = """
+<html><head>
+  <meta property="description" content="Description Open Graph">
+  <meta name="description" content="Description de la page">
+  <meta name="twitter:image" content="/twitter.jpg">
+</head><body>
+  <div class="entry-content">
+    <p>Premier paragraphe</p>
+    <img src="/corps.png" alt="Corps">
+    <aside><img src="/pub.png"></aside>
+  </div>
+</body></html>
+"""
+
+
+def extract(scraper, html):
+    """
+    Applique les extracteurs dans l'ordre de scrape_article.
+
+    Args:
+        scraper (BDMScraper): Scraper a tester.
+        html (str): Page HTML.
+
+    Returns:
+        dict: Resume, vignette, contenu et images extraits.
+    """
+    page = scraper._index_page(BeautifulSoup(html, scraper.html_parser))
+    return {
+        'thumbnail': scraper._extract_thumbnail(page, 'https://bdm.test/a/'),
+        'summary': scraper._extract_summary(page),
+        'content': scraper._extract_content(page),
+        'images': sorted(image['url'] for image in
+                         scraper._extract_images(page, 'https://bdm.test/a/')
+                         .values()),
+    }
+
+
+def test_extractors_on_sidebar_first_page(scraper):
+    """Resume et images : premier noeud "content" dans l'ordre du document."""
+    assert extract(scraper, SIDEBAR_FIRST_PAGE) == {
+        'thumbnail': 'https://bdm.test/og.jpg',
+        'summary': 'Texte du widget',
+        'content': 'Premier paragraphe',
+        'images': ['https://bdm.test/widget.png'],
+    }
+
+
+def test_extractors_on_named_description_page(scraper):
+    """Meta description par name= seulement, images hors aside retiree."""
+    assert extract(scraper, NAMED_DESCRIPTION_PAGE) == {
+        'thumbnail': 'https://bdm.test/twitter.jpg',
+        'summary': 'Description de la page',
+        'content': 'Premier paragraphe',
+        'images': ['https://bdm.test/corps.png'],
+    }
+
+
+def benchmark(repeat=5):
+    """
+    Compare les temps de l'ancienne et de la nouvelle version.
+
+    Args:
+        repeat (int): Nombre de passes sur les echantillons.
+    """
+    import timeit
+
+    scraper = BDMScraper(max_workers=2)
+    hrefs = random_strings(HREF_PARTS, seed=14)
+    same_format = ['15/01/2024'] * SAMPLES
+    mixed = random_strings(DATE_PARTS, seed=14)
+    cases = [
+        ('_is_article_link', hrefs, reference_is_article_link,
+         scraper._is_article_link),
+        ('_parse_date (meme format)', same_format, reference_parse_date,
+         scraper._parse_date),
+        ('_parse_date (melange)', mixed, reference_parse_date,
+         scraper._parse_date),
+    ]
+    for name, inputs, old, new in cases:
+        timings = []
+        for function in (old, new):
+            seconds = min(timeit.repeat(
+                lambda: [function(value) for value in inputs],
+                number=1, repeat=repeat))
+            timings.append(seconds / len(inputs) * 1e6)
+        print(f"{name}: {timings[0]:.1f} -> {timings[1]:.1f} us par appel")
+
+
+if __name__ == '__main__':
+    benchmark()
@@ -0,0 +1,104 @@
+import pytest
+from pymongo import MongoClient
+
+import mongodb_handler
+from mongodb_handler import MongoDBHandler
+
+CONNECTION_STRING = "mongodb://localhost:27017/"
+
+# Base temporaire, supprimee a la fin du test
+TEST_DATABASE = "bdm_scraper_test_indexes"
+
+SAMPLE_ARTICLES = [
+    {
+        'url': f'https://www.blogdumoderateur.com/test-{i}/',
+        'title': f'Article de test {i}',
+        'author': author,
+        'subcategory': subcategory,
+        'publish_date': f'2024-01-{i + 1:02d}',
+        'content': 'Contenu de test'
+    }
+    for i, (author, subcategory) in enumerate([
+        ('Jean Dupont', 'Intelligence artificielle'),
+        ('Marie Durand', 'Réseaux sociaux'),
+        ('Jean Martin', 'Intelligence artificielle'),
+        ('Éloïse Petit', 'Web'),
+    ] * 5)
+]
+
+
+def mongodb_available():
+    """
+    Verifie qu'un serveur MongoDB repond.
+
+    Returns:
+        bool: True si MongoDB est accessible, False sinon.
+    """
+    try:
+        client = MongoClient(CONNECTION_STRING, serverSelectionTimeoutMS=2000)
+        client.admin.command('ping')
+        client.close()
+        return True
+    except Exception:
+        return False
+
+
+def open_handler():
+    """
+    Ouvre la base de test et y enregistre les articles d'exemple.
+
+    Returns:
+        MongoDBHandler: Gestionnaire connecte a la base de test.
+    """
+    db_handler = MongoDBHandler(CONNECTION_STRING, TEST_DATABASE)
+    db_handler.save_articles(SAMPLE_ARTICLES)
+    return db_handler
+
+
+@pytest.fixture(scope='module')
+def mongodb():
+    """Base de test sur un vrai serveur MongoDB (plans d'execution)."""
+    if not mongodb_available():
+        pytest.skip("MongoDB requis pour verifier les plans d'execution")
+    db_handler = open_handler()
+    yield db_handler
+    db_handler.client.drop_database(TEST_DATABASE)
+    db_handler.close_connection()
+
+
+@pytest.fixture
+def mockdb(monkeypatch):
+    """Base de test en memoire (mongomock) pour les resultats de recherche."""
+    mongomock = pytest.importorskip('mongomock')
+    monkeypatch.setattr(mongodb_handler, 'MongoClient', mongomock.MongoClient)
+    db_handler = open_handler()
+    yield db_handler
+    db_handler.close_connection()
+
+
+@pytest.mark.parametrize('match', ['exact', 'prefix'])
+@pytest.mark.parametrize('criteria', [
+    {'author': 'Jean Dupont'},
+    {'category': 'intelligence'},
+    {'subcategory': 'Reseaux sociaux'},
+])
+def test_search_uses_indexes(mongodb, criteria, match):
+    """Les recherches 'exact' et 'prefix' sont servies par un index."""
+    stages = mongodb.explain_search(match=match, **criteria)
+    assert 'IXSCAN' in stages, f"Pas d'IXSCAN pour {criteria}: {stages}"
+    assert 'COLLSCAN' not in stages, f"COLLSCAN pour {criteria}: {stages}"
+
+
+@pytest.mark.parametrize('criteria, expected', [
+    # Les champs normalises ignorent casse et accents
+    ({'author': 'eloise', 'match': 'prefix'}, 5),
+    ({'author': 'JEAN DUPONT', 'match': 'exact'}, 5),
+    ({'author': 'jean', 'match': 'exact'}, 0),
+    ({'subcategory': 'réseaux', 'match': 'prefix'}, 5),
+    # 'contains' (defaut) garde la recherche par sous-chaine
+    ({'author': 'dupont'}, 5),
+    ({'category': 'artificielle'}, 10),
+])
+def test_search_results(mockdb, criteria, expected):
+    """Chaque mode de correspondance renvoie les articles attendus."""
+    assert len(mockdb.search_articles(**criteria)) == expected
@@ -7,6 +7,8 @@ import csv
 import os
 from collections import defaultdict
 
+from ffvb_scraper import columnar
+
 def analyze_and_clean_players():
     """Analyse et nettoie les données des joueurs"""
     print("🧹 NETTOYAGE ET DÉDUPLICATION DES JOUEURS")
@@ -16,12 +18,15 @@ def analyze_and_clean_players():
         print("❌ Fichier ffvb_players_complete.csv non trouvé")
         return
     
-    # Charger les données
-    players = load_players_data()
+    # Charger les données (une seule lecture, Parquet si pyarrow est disponible)
+    table, players = load_players_data()
     print(f"📊 Total lignes dans le fichier: {len(players)}")
     
-    # Analyser les doublons
-    duplicates_analysis = analyze_duplicates(players)
+    # Analyser les doublons (regroupements vectorisés si pyarrow est disponible)
+    if table is not None:
+        duplicates_analysis = analyze_duplicates_columnar(table)
+    else:
+        duplicates_analysis = analyze_duplicates(players)
     
     # Nettoyer les doublons
     unique_players = deduplicate_players(players)
@@ -33,17 +38,13 @@ def analyze_and_clean_players():
     print_cleaning_summary(len(players), len(unique_players), duplicates_analysis)
 
 def load_players_data():
-    """Charge les données des joueurs"""
-    players = []
-    
+    """Charge les données des joueurs, retourne (table colonnaire ou None, lignes)"""
     try:
-        with open('ffvb_players_complete.csv', 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            players = list(reader)
+        return columnar.load_rows('ffvb_players_complete.csv',
+                                  columnar.PLAYER_COMPLETE_COLUMNS)
     except Exception as e:
         print(f"❌ Erreur lecture fichier: {e}")
-    
-    return players
+        return None, []
 
 def analyze_duplicates(players):
     """Analyse les types de doublons"""
@@ -93,6 +94,35 @@ def analyze_duplicates(players):
         'by_image': image_duplicates
     }
 
+def analyze_duplicates_columnar(table):
+    """Analyse les doublons par group-by sur la table colonnaire"""
+    import pyarrow.compute as pc
+    
+    print(f"\n🔍 ANALYSE DES DOUBLONS:")
+    print("-" * 30)
+    
+    duplicates = {}
+    for key, column in (('by_name', 'nom_joueur'), ('by_number', 'numero'), ('by_image', 'url_cv_image')):
+        counts = columnar.value_counts(table, column)
+        duplicates[key] = {value: count for value, count in counts.items() if count > 1}
+    
+    print(f"👥 Doublons par nom: {len(duplicates['by_name'])}")
+    print(f"🔢 Doublons par numéro: {len(duplicates['by_number'])}")
+    print(f"🖼️ Doublons par image: {len(duplicates['by_image'])}")
+    
+    # Afficher quelques exemples
+    if duplicates['by_name']:
+        print(f"\n📋 Exemples doublons par nom:")
+        names = table.column('nom_joueur')
+        urls = table.column('url_page_principale')
+        for name, count in list(duplicates['by_name'].items())[:3]:
+            print(f"   {name}: {count} occurrences")
+            rows = pc.indices_nonzero(pc.equal(names, name)).to_pylist()[:2]  # Max 2 exemples
+            for idx in rows:
+                print(f"     - Ligne {idx+1}: {urls[idx].as_py() or 'N/A'}")
+    
+    return duplicates
+
 def deduplicate_players(players):
     """Déduplique les joueurs en gardant la meilleure version"""
     print(f"\n🎯 DÉDUPLICATION EN COURS...")
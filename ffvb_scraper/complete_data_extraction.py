@@ -11,6 +11,8 @@ import sys
 from datetime import datetime
 import subprocess
 
+from ffvb_scraper import columnar
+
 def main():
     """Menu principal pour extraction complète"""
     print("🏐 EXTRACTION COMPLÈTE DONNÉES FFVB")
@@ -187,28 +189,39 @@ def analyze_current_data():
         return
     
     try:
-        with open('ffvb_players_complete.csv', 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            players = list(reader)
+        # Version colonnaire (Parquet mappé) si pyarrow est disponible
+        table = columnar.load_or_convert('ffvb_players_complete.csv',
+                                         columnar.PLAYER_COMPLETE_COLUMNS)
+        if table is not None:
+            total = table.num_rows
+            filled_by_field = columnar.filled_counts(table)
+        else:
+            with open('ffvb_players_complete.csv', 'r', encoding='utf-8') as f:
+                reader = csv.DictReader(f)
+                players = list(reader)
+            total = len(players)
+            all_fields = list(players[0].keys()) if players else []
+            filled_by_field = {
+                field: sum(1 for player in players if player.get(field, '').strip())
+                for field in all_fields
+            }
         
-        print(f"📊 Total joueurs: {len(players)}")
+        print(f"📊 Total joueurs: {total}")
         
         # Analyser les champs remplis
-        all_fields = list(players[0].keys()) if players else []
         field_stats = {}
         
-        for field in all_fields:
-            filled_count = sum(1 for player in players if player.get(field, '').strip())
+        for field, filled_count in filled_by_field.items():
             field_stats[field] = {
                 'filled': filled_count,
-                'percentage': (filled_count / len(players)) * 100 if players else 0
+                'percentage': (filled_count / total) * 100 if total else 0
             }
         
         # Afficher les statistiques
         print(f"\n📈 COMPLÉTUDE PAR CHAMP:")
         for field, stats in sorted(field_stats.items(), key=lambda x: x[1]['percentage'], reverse=True):
             if stats['percentage'] > 0:
-                print(f"   {field}: {stats['filled']}/{len(players)} ({stats['percentage']:.1f}%)")
+                print(f"   {field}: {stats['filled']}/{total} ({stats['percentage']:.1f}%)")
         
         # Identifier les données manquantes critiques
         critical_missing = []
@@ -228,8 +241,8 @@ def analyze_current_data():
             print(f"   → Utilisez l'extraction OCR (option 1)")
         
         # Analyser les URLs d'images
-        images_count = sum(1 for player in players if player.get('url_cv_image', '').strip())
-        print(f"\n🖼️ Images CV disponibles: {images_count}/{len(players)}")
+        images_count = filled_by_field.get('url_cv_image', 0)
+        print(f"\n🖼️ Images CV disponibles: {images_count}/{total}")
         
         if images_count > 0:
             print(f"✅ OCR possible sur {images_count} joueurs")
@@ -4,14 +4,12 @@ Extracteur OCR optimisé pour récupérer TOUTES les données manquantes
 depuis les images CV des 51 joueurs extraits
 """
 
-import requests
 import csv
 import json
 import re
 import os
 from urllib.parse import unquote
 from datetime import datetime
-import time
 
 # Tentative d'import OCR (optionnel)
 try:
@@ -25,12 +23,18 @@ except ImportError:
     OCR_AVAILABLE = False
     print("⚠️ OCR non disponible - extraction basique uniquement")
 
+from ffvb_scraper.image_fetcher import get_image_fetcher, load_image
+from ffvb_scraper.ocr_cache import get_ocr_cache
+
+# À incrémenter quand enhance_image_for_ocr change : invalide le cache OCR
+PREPROCESSING_KEY = 'enhanced.v1'
+OCR_CONFIG = '--psm 6 -l fra'
+
 class EnhancedOCRExtractor:
     def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        })
+        # Client HTTP et cache d'images partagés entre extracteurs
+        self.image_fetcher = get_image_fetcher()
+        self.ocr_cache = get_ocr_cache() if OCR_AVAILABLE else None
         
         self.output_file = 'ffvb_players_enhanced_complete.csv'
         self.failed_extractions = []
@@ -95,6 +99,10 @@ class EnhancedOCRExtractor:
         # Initialiser le fichier de sortie
         self.initialize_output_file()
         
+        # Télécharger en parallèle les images absentes du cache
+        if OCR_AVAILABLE:
+            self.image_fetcher.prefetch(players)
+        
         # Traiter chaque joueur
         for i, player in enumerate(players, 1):
             print(f"\n🏐 [{i}/{len(players)}] {player.get('nom_joueur', 'N/A')} (#{player.get('numero', 'N/A')})")
@@ -104,9 +112,6 @@ class EnhancedOCRExtractor:
                 self.save_enhanced_player(enhanced_data)
                 self.success_count += 1
                 
-                # Pause respectueuse
-                time.sleep(1)
-                
             except Exception as e:
                 print(f"   ❌ Erreur: {e}")
                 self.failed_extractions.append({
@@ -159,27 +164,21 @@ class EnhancedOCRExtractor:
             return {}
         
         try:
-            # Construire URL complète
-            if image_url.startswith('/'):
-                full_url = f"http://www.ffvb.org{image_url}"
-            else:
-                full_url = image_url
-            
-            print(f"   🖼️ Téléchargement image: {full_url}")
+            # Image depuis le cache partagé (téléchargée au plus une fois)
+            fetched = self.image_fetcher.fetch(image_url)
             
-            # Télécharger image
-            response = self.session.get(full_url, timeout=15)
-            response.raise_for_status()
-            
-            # Traiter avec OCR
-            from io import BytesIO
-            image = Image.open(BytesIO(response.content))
-            
-            # Préprocessing pour améliorer OCR
-            processed_image = self.enhance_image_for_ocr(image)
-            
-            # Extraction OCR
-            text = pytesseract.image_to_string(processed_image, config='--psm 6 -l fra')
+            # Texte déjà extrait pour cette image : pas de préprocessing ni d'OCR
+            cached = self.ocr_cache.get(fetched.sha256, PREPROCESSING_KEY, OCR_CONFIG)
+            if cached is not None:
+                self.ocr_cache.hits += 1
+                text = cached['text']
+            else:
+                # Préprocessing pour améliorer OCR
+                processed_image = self.enhance_image_for_ocr(load_image(fetched.content))
+                
+                # Extraction OCR
+                text = self.ocr_cache.image_to_string(processed_image, fetched.sha256,
+                                                      PREPROCESSING_KEY, OCR_CONFIG)
             
             if not text.strip():
                 print("   ⚠️ Aucun texte détecté dans l'image")
@@ -445,6 +444,8 @@ class EnhancedOCRExtractor:
         print(f"✅ Succès: {self.success_count}")
         print(f"❌ Échecs: {len(self.failed_extractions)}")
         print(f"📄 Résultats dans: {self.output_file}")
+        if self.ocr_cache:
+            print(self.ocr_cache.summary())
         
         if self.failed_extractions:
             print(f"\n⚠️ Échecs détaillés:")
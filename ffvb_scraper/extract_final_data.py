@@ -6,25 +6,41 @@ Produit un CSV complet avec toutes les informations des joueurs
 
 import csv
 import os
-import requests
 import re
-import time
 from datetime import datetime
-from io import BytesIO
 import pytesseract
-from PIL import Image, ImageEnhance
-import cv2
-import numpy as np
+
+from ffvb_scraper.image_fetcher import get_image_fetcher, load_image
+from ffvb_scraper.image_preprocessing import build_variants, format_timings
+from ffvb_scraper.ocr_cache import get_ocr_cache
 
 # Configuration OCR
 pytesseract.pytesseract.tesseract_cmd = r"C:\Program Files\Tesseract-OCR\tesseract.exe"
 
+# Versions produites par create_image_variants -> étape de build_variants
+VARIANT_STAGES = {
+    'Original': 'original',
+    'Contrast': 'contrast',
+    'Sharp': 'sharp',
+    'Gray': 'grayscale',
+    'OpenCV': 'opencv',
+}
+VARIANT_NAMES = list(VARIANT_STAGES)
+
+# À incrémenter quand create_image_variants change : invalide le cache OCR
+PREPROCESSING_VERSION = 2
+
 class FFVBFinalExtractor:
     def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        })
+        # Client HTTP et cache d'images partagés entre extracteurs
+        self.image_fetcher = get_image_fetcher()
+        
+        # Résultats OCR déjà calculés (texte brut par image/préprocessing/config)
+        self.ocr_cache = get_ocr_cache()
+        
+        # Durées cumulées par étape de préprocessing
+        self.preprocessing_timings = {}
+        self.preprocessed_images = 0
         
         # Fichier de sortie final
         self.output_file = 'FFVB_JOUEURS_COMPLET.csv'
@@ -51,6 +67,9 @@ class FFVBFinalExtractor:
         # 2. Initialiser le fichier final
         self.init_final_csv()
         
+        # Télécharger en parallèle les images absentes du cache
+        self.image_fetcher.prefetch(players)
+        
         # 3. Traiter chaque joueur
         for i, player in enumerate(players, 1):
             name = player.get('nom_joueur', 'N/A')
@@ -72,15 +91,16 @@ class FFVBFinalExtractor:
                 if complete_player.get('extraction_success'):
                     self.successful_extractions += 1
                 
-                # Pause respectueuse
-                time.sleep(1.5)
-                
             except Exception as e:
                 print(f"   ❌ Erreur: {e}")
                 # Sauvegarder au moins les données de base
                 self.save_to_final_csv(player)
         
         # 4. Résumé final
+        print(self.ocr_cache.summary())
+        if self.preprocessed_images:
+            print(f"⏱️ Préprocessing par image: "
+                  f"{format_timings(self.preprocessing_timings, self.preprocessed_images)}")
         self.show_final_summary(len(players))
 
     def load_existing_data(self):
@@ -149,19 +169,12 @@ class FFVBFinalExtractor:
     def extract_from_cv_image(self, image_url, player_name):
         """Extraction OCR depuis l'image CV"""
         try:
-            # Construire URL complète
-            if image_url.startswith('/'):
-                full_url = f"http://www.ffvb.org{image_url}"
-            else:
-                full_url = image_url
-            
-            # Télécharger image
-            response = self.session.get(full_url, timeout=15)
-            response.raise_for_status()
+            # Image depuis le cache partagé (téléchargée au plus une fois)
+            fetched = self.image_fetcher.fetch(image_url)
+            image = load_image(fetched.content)
             
             # Traitement OCR optimisé
-            image = Image.open(BytesIO(response.content))
-            best_text, method = self.get_best_ocr_text(image)
+            best_text, method = self.get_best_ocr_text(image, fetched.sha256)
             
             if not best_text:
                 print(f"   ⚠️ Aucun texte extrait")
@@ -178,8 +191,12 @@ class FFVBFinalExtractor:
             print(f"   ❌ Erreur OCR: {e}")
             return None
 
-    def get_best_ocr_text(self, image):
-        """Obtient le meilleur texte OCR possible"""
+    def get_best_ocr_text(self, image, image_sha256=None):
+        """Obtient le meilleur texte OCR possible
+        
+        Les textes déjà en cache pour cette image sont réutilisés ; les
+        variantes ne sont calculées que si une combinaison manque.
+        """
         # Configurations OCR à tester
         ocr_configs = [
             ('PSM6-ENG', '--psm 6 -l eng'),
@@ -187,18 +204,30 @@ class FFVBFinalExtractor:
             ('PSM3-ENG', '--psm 3 -l eng')
         ]
         
-        # Préprocessings à tester
-        preprocessed_images = self.create_image_variants(image)
+        # Préprocessings à tester (calculés à la demande)
+        cached_texts = self.ocr_cache.get_texts(image_sha256) if image_sha256 else {}
+        preprocessed_images = None
         
         best_text = ""
         best_method = "none"
         max_length = 0
         
         # Tester toutes les combinaisons
-        for preprocess_name, processed_img in preprocessed_images.items():
+        for preprocess_name in VARIANT_NAMES:
+            cache_key = f"{preprocess_name}.v{PREPROCESSING_VERSION}"
             for config_name, config_str in ocr_configs:
                 try:
-                    text = pytesseract.image_to_string(processed_img, config=config_str)
+                    text = cached_texts.get((cache_key, config_str))
+                    if text is not None:
+                        self.ocr_cache.hits += 1
+                    else:
+                        if preprocessed_images is None:
+                            preprocessed_images = self.create_image_variants(image)
+                        processed_img = preprocessed_images.get(preprocess_name)
+                        if processed_img is None:
+                            continue
+                        text = self.ocr_cache.image_to_string(processed_img, image_sha256,
+                                                              cache_key, config_str)
                     
                     if len(text) > max_length:
                         max_length = len(text)
@@ -211,64 +240,14 @@ class FFVBFinalExtractor:
         return best_text, best_method
 
     def create_image_variants(self, image):
-        """Crée plusieurs versions optimisées de l'image"""
-        variants = {}
-        
-        try:
-            # Redimensionner si nécessaire
-            if image.size[0] < 1200:
-                scale = 1200 / image.size[0]
-                new_size = (int(image.size[0] * scale), int(image.size[1] * scale))
-                resized = image.resize(new_size, Image.Resampling.LANCZOS)
-            else:
-                resized = image
-            
-            variants['Original'] = resized
-            
-            # Amélioration contraste
-            enhancer = ImageEnhance.Contrast(resized)
-            variants['Contrast'] = enhancer.enhance(2.0)
-            
-            # Amélioration netteté
-            enhancer = ImageEnhance.Sharpness(resized)
-            variants['Sharp'] = enhancer.enhance(2.5)
-            
-            # Niveaux de gris
-            gray = resized.convert('L')
-            variants['Gray'] = gray
-            
-            # OpenCV avancé
-            opencv_img = self.opencv_preprocessing(gray)
-            if opencv_img:
-                variants['OpenCV'] = opencv_img
-                
-        except Exception as e:
-            variants['Original'] = image
-        
-        return variants
-
-    def opencv_preprocessing(self, pil_image):
-        """Préprocessing OpenCV optimisé"""
+        """Crée plusieurs versions optimisées de l'image (tableaux NumPy)"""
         try:
-            # Convertir PIL vers OpenCV
-            opencv_img = np.array(pil_image)
-            
-            # Débruitage
-            denoised = cv2.fastNlMeansDenoising(opencv_img)
-            
-            # Amélioration contraste adaptatif
-            clahe = cv2.createCLAHE(clipLimit=3.0, tileGridSize=(8,8))
-            enhanced = clahe.apply(denoised)
-            
-            # Binarisation adaptative
-            binary = cv2.adaptiveThreshold(
-                enhanced, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY, 11, 2
-            )
-            
-            return Image.fromarray(binary)
-            
+            arrays = build_variants(image, VARIANT_STAGES.values(), contrast=2.0, sharpness=2.5,
+                                    timings=self.preprocessing_timings)
+            self.preprocessed_images += 1
+            return {name: arrays[stage] for name, stage in VARIANT_STAGES.items()}
         except Exception:
-            return None
+            return {'Original': image}
 
     def parse_player_data_from_text(self, text, player_name):
         """Parse le texte OCR pour extraire les données du joueur"""
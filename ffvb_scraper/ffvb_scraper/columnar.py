@@ -0,0 +1,357 @@
+# columnar.py
+"""Export et lecture colonnaire (Parquet / Arrow IPC) des données joueurs
+
+Les colonnes numériques (taille, poids, numéro...) et les dates sont typées
+à l'écriture : les scripts d'analyse relisent le fichier en mémoire mappée
+et font leurs comptages et regroupements avec pyarrow.compute au lieu de
+boucler sur des dictionnaires issus de csv.DictReader.
+
+pyarrow est optionnel : sans lui, PYARROW_AVAILABLE vaut False et les
+scripts gardent leur lecture CSV.
+"""
+
+import csv
+import os
+import re
+from datetime import date, datetime
+
+from ffvb_scraper.items import extract_height, extract_number, extract_weight
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.ipc as ipc
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    pa = pc = ipc = pq = None
+    PYARROW_AVAILABLE = False
+
+# Extensions reconnues : Parquet (compressé) ou Arrow IPC (mappable sans copie)
+PARQUET_EXTENSIONS = ('.parquet',)
+ARROW_EXTENSIONS = ('.arrow', '.feather', '.ipc')
+
+DATE_FORMATS = ('%d/%m/%Y', '%Y-%m-%d', '%d-%m-%Y', '%d.%m.%Y')
+
+# Schémas : (colonne, type) — les types sont résolus par build_schema pour
+# que le module reste importable sans pyarrow
+PLAYER_COMPLETE_COLUMNS = [
+    ('nom_joueur', 'string'), ('numero', 'int16'), ('poste', 'string'),
+    ('taille', 'int16'), ('poids', 'int16'), ('age', 'int16'),
+    ('date_naissance', 'date'), ('club_actuel', 'string'),
+    ('club_precedent', 'string'), ('nationalite', 'string'),
+    ('selections', 'int32'), ('points_totaux', 'int32'),
+    ('matches_joues', 'int32'), ('victoires', 'int32'),
+    ('defaites', 'int32'), ('ratio_victoires', 'float64'),
+    ('derniere_selection', 'string'), ('competitions', 'string'),
+    ('titres', 'string'), ('distinctions', 'string'),
+    ('bio_courte', 'string'), ('url_cv_image', 'string'),
+    ('url_page_principale', 'string'), ('urls_stats', 'string'),
+    ('date_extraction', 'timestamp'),
+]
+
+PLAYER_ITEM_COLUMNS = [
+    ('nom', 'string'), ('prenom', 'string'), ('nom_complet', 'string'),
+    ('numero_maillot', 'int16'), ('poste', 'string'), ('taille', 'int16'),
+    ('poids', 'int16'), ('age', 'int16'), ('date_naissance', 'date'),
+    ('club_actuel', 'string'), ('pays_club', 'string'),
+    ('selections', 'int32'), ('equipe', 'string'), ('categorie', 'string'),
+    ('nationalite', 'string'), ('lieu_naissance', 'string'),
+    ('formation', 'string'), ('photo_url', 'string'),
+    ('url_source', 'string'),
+]
+
+
+def parse_date(value):
+    """Convertir une date texte (ou date/datetime) en date"""
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    if not value:
+        return None
+    value = str(value).strip()
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(value, fmt).date()
+        except ValueError:
+            continue
+    return None
+
+
+def parse_timestamp(value):
+    """Convertir un horodatage ISO (ou datetime) en datetime"""
+    if isinstance(value, datetime):
+        return value
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(str(value).strip())
+    except ValueError:
+        date_value = parse_date(value)
+        return datetime.combine(date_value, datetime.min.time()) if date_value else None
+
+
+def parse_float(value):
+    """Convertir un nombre texte ('0,75', '75%') en float"""
+    if isinstance(value, (int, float)):
+        return float(value)
+    if not value:
+        return None
+    match = re.search(r'-?\d+(?:[.,]\d+)?', str(value))
+    return float(match.group().replace(',', '.')) if match else None
+
+
+def parse_int(value):
+    """Convertir une valeur en entier (premier nombre trouvé)"""
+    if isinstance(value, int):
+        return value
+    if isinstance(value, float):
+        return int(value)
+    return extract_number(str(value)) if value else None
+
+
+def parse_text(value):
+    """Texte nettoyé, listes jointes par ' | ', None si vide"""
+    if isinstance(value, (list, tuple)):
+        value = ' | '.join(str(v) for v in value if v)
+    if value is None:
+        return None
+    value = str(value).strip()
+    return value or None
+
+
+# Colonnes dont le texte demande une conversion spécifique
+SPECIAL_CONVERTERS = {
+    'taille': lambda v: v if isinstance(v, int) else (extract_height(str(v)) if v else None),
+    'poids': lambda v: v if isinstance(v, int) else (extract_weight(str(v)) if v else None),
+}
+
+TYPE_CONVERTERS = {
+    'string': parse_text,
+    'int16': parse_int,
+    'int32': parse_int,
+    'float64': parse_float,
+    'date': parse_date,
+    'timestamp': parse_timestamp,
+}
+
+
+def build_schema(columns):
+    """Construire le schéma pyarrow d'une liste (colonne, type)"""
+    types = {
+        'string': pa.string(),
+        'int16': pa.int16(),
+        'int32': pa.int32(),
+        'float64': pa.float64(),
+        'date': pa.date32(),
+        'timestamp': pa.timestamp('s'),
+    }
+    return pa.schema([(name, types[kind]) for name, kind in columns])
+
+
+# Bornes des colonnes entières : une valeur aberrante devient nulle au lieu
+# de faire échouer l'écriture du lot
+INT_BOUNDS = {'int16': (-2**15, 2**15 - 1), 'int32': (-2**31, 2**31 - 1)}
+
+
+def convert_value(name, kind, value):
+    """Convertir une valeur brute vers le type de sa colonne (None si invalide)"""
+    converter = SPECIAL_CONVERTERS.get(name) or TYPE_CONVERTERS[kind]
+    try:
+        value = converter(value)
+    except (TypeError, ValueError):
+        return None
+    if value is not None and kind in INT_BOUNDS:
+        low, high = INT_BOUNDS[kind]
+        if not low <= value <= high:
+            return None
+    return value
+
+
+def is_arrow_path(path):
+    """Vrai si le fichier est au format Arrow IPC plutôt que Parquet"""
+    return path.lower().endswith(ARROW_EXTENSIONS)
+
+
+class ColumnarWriter:
+    """Écriture en flux d'un fichier Parquet ou Arrow IPC typé
+
+    Les lignes sont accumulées par colonne puis écrites par lots de
+    `batch_size` (un row group Parquet / un record batch Arrow) : la mémoire
+    reste bornée quelle que soit la taille de l'export.
+    """
+
+    def __init__(self, path, columns, batch_size=1000):
+        if not PYARROW_AVAILABLE:
+            raise RuntimeError("pyarrow n'est pas installé (pip install pyarrow)")
+        self.path = path
+        self.columns = columns
+        self.schema = build_schema(columns)
+        self.batch_size = batch_size
+        self.rows_written = 0
+        self._buffer = {name: [] for name, _ in columns}
+        self._pending = 0
+
+        if is_arrow_path(path):
+            self._sink = pa.OSFile(path, 'wb')
+            self._writer = ipc.new_file(self._sink, self.schema)
+        else:
+            self._sink = None
+            self._writer = pq.ParquetWriter(path, self.schema, compression='zstd')
+
+    def write(self, row):
+        """Ajouter une ligne (dict ou item) ; les valeurs sont converties au type de la colonne"""
+        for name, kind in self.columns:
+            self._buffer[name].append(convert_value(name, kind, row.get(name)))
+        self._pending += 1
+        if self._pending >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        """Écrire les lignes en tampon"""
+        if not self._pending:
+            return
+        batch = pa.record_batch(
+            [pa.array(self._buffer[name], type=self.schema.field(name).type)
+             for name, _ in self.columns],
+            schema=self.schema,
+        )
+        self._writer.write_batch(batch)
+        self.rows_written += self._pending
+        self._buffer = {name: [] for name, _ in self.columns}
+        self._pending = 0
+
+    def close(self):
+        """Vider le tampon et fermer le fichier"""
+        self.flush()
+        self._writer.close()
+        if self._sink is not None:
+            self._sink.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def write_rows(rows, path, columns, batch_size=1000):
+    """Écrire une suite de lignes dans un fichier colonnaire, retourne le nombre de lignes"""
+    with ColumnarWriter(path, columns, batch_size) as writer:
+        for row in rows:
+            writer.write(row)
+    return writer.rows_written
+
+
+def csv_to_columnar(csv_path, path, columns, batch_size=1000):
+    """Convertir un CSV existant (ex. ffvb_players_complete.csv) en Parquet/Arrow"""
+    with open(csv_path, 'r', encoding='utf-8') as f:
+        return write_rows(csv.DictReader(f), path, columns, batch_size)
+
+
+def load_table(path, columns=None):
+    """Charger un fichier Parquet ou Arrow IPC en mémoire mappée
+
+    Un fichier Arrow IPC est lu sans copie depuis le mapping ; pour Parquet,
+    seules les colonnes demandées sont décodées.
+    """
+    if not PYARROW_AVAILABLE:
+        raise RuntimeError("pyarrow n'est pas installé (pip install pyarrow)")
+    if is_arrow_path(path):
+        table = ipc.open_file(pa.memory_map(path, 'r')).read_all()
+        return table.select(columns) if columns else table
+    return pq.read_table(path, columns=columns, memory_map=True)
+
+
+def columnar_path_for(csv_path, extension='.parquet'):
+    """Chemin colonnaire associé à un CSV (même nom, autre extension)"""
+    return os.path.splitext(csv_path)[0] + extension
+
+
+def load_columnar_for(csv_path, columns=None):
+    """Charger la version colonnaire d'un CSV si elle existe et est à jour
+
+    Retourne None quand pyarrow est absent ou que le CSV est plus récent :
+    l'appelant garde alors sa lecture CSV.
+    """
+    if not PYARROW_AVAILABLE:
+        return None
+    for extension in PARQUET_EXTENSIONS + ARROW_EXTENSIONS:
+        path = columnar_path_for(csv_path, extension)
+        if not os.path.exists(path):
+            continue
+        if os.path.exists(csv_path) and os.path.getmtime(csv_path) > os.path.getmtime(path):
+            continue
+        try:
+            return load_table(path, columns)
+        except Exception:
+            continue
+    return None
+
+
+def load_or_convert(csv_path, schema_columns, columns=None):
+    """Charger la version colonnaire d'un CSV, en la (re)créant si besoin
+
+    La conversion n'a lieu qu'une fois par version du CSV ; les analyses
+    suivantes relisent directement le fichier Parquet mappé. Retourne None
+    sans pyarrow ou si le CSV n'existe pas.
+    """
+    table = load_columnar_for(csv_path, columns)
+    if table is not None or not PYARROW_AVAILABLE or not os.path.exists(csv_path):
+        return table
+    path = columnar_path_for(csv_path)
+    csv_to_columnar(csv_path, path, schema_columns)
+    return load_table(path, columns)
+
+
+def text_value(value):
+    """Valeur typée -> texte au format du CSV ('' si nulle)"""
+    if value is None:
+        return ''
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return str(value)
+
+
+def iter_text_rows(table):
+    """Lignes d'une table sous forme de dicts de textes, lot par lot"""
+    for batch in table.to_batches():
+        for row in batch.to_pylist():
+            yield {name: text_value(value) for name, value in row.items()}
+
+
+def load_rows(csv_path, schema_columns, columns=None):
+    """Lignes d'un CSV (dicts de textes) et sa table colonnaire
+
+    Avec pyarrow, les lignes viennent de la table Parquet (le CSV n'est lu
+    qu'à la conversion) ; les valeurs sont celles normalisées par le schéma.
+    Sans pyarrow, lecture csv.DictReader. Retourne (table ou None, lignes).
+    """
+    table = load_or_convert(csv_path, schema_columns, columns)
+    if table is not None:
+        return table, list(iter_text_rows(table))
+    with open(csv_path, 'r', encoding='utf-8') as f:
+        return None, list(csv.DictReader(f))
+
+
+def filled_counts(table):
+    """Nombre de valeurs renseignées (non nulles, non vides) par colonne"""
+    counts = {}
+    for name in table.column_names:
+        column = table.column(name)
+        if pa.types.is_string(column.type):
+            filled = pc.sum(pc.greater(pc.utf8_length(pc.utf8_trim_whitespace(column)), 0)).as_py()
+        else:
+            filled = table.num_rows - column.null_count
+        counts[name] = filled or 0
+    return counts
+
+
+def value_counts(table, column):
+    """Effectifs par valeur non nulle d'une colonne, triés par effectif décroissant"""
+    grouped = table.group_by(column).aggregate([([], 'count_all')])
+    grouped = grouped.filter(pc.is_valid(grouped.column(column)))
+    grouped = grouped.sort_by([('count_all', 'descending')])
+    return dict(zip(grouped.column(column).to_pylist(),
+                    grouped.column('count_all').to_pylist()))
@@ -206,6 +206,10 @@ class FFVBCompletePipeline:
             
             print(f"🖼️ {len(players_with_images)} image(s) CV à traiter")
             
+            # Télécharger en parallèle les images absentes du cache partagé
+            from ffvb_scraper.image_fetcher import get_image_fetcher
+            get_image_fetcher().prefetch(players_with_images, url_field='image_url')
+            
             # Lancer OCR personnalisé
             ocr_results = []
             
@@ -270,34 +274,32 @@ class FFVBCompletePipeline:
     def process_single_image_ocr(self, player_data):
         """Traite une seule image avec OCR"""
         try:
-            import requests
-            from PIL import Image
             import pytesseract
             import cv2
             import numpy as np
-            from io import BytesIO
             import re
-            
-            # Construire URL complète
-            image_url = player_data['image_url']
-            if image_url.startswith('/'):
-                full_url = f"http://www.ffvb.org{image_url}"
+            from ffvb_scraper.image_fetcher import get_image_fetcher, load_image, resolve_image_url
+            from ffvb_scraper.ocr_cache import get_ocr_cache
+            
+            # Image depuis le cache partagé (téléchargée au plus une fois)
+            full_url = resolve_image_url(player_data['image_url'])
+            fetched = get_image_fetcher().fetch(full_url)
+            
+            # Texte déjà extrait pour cette image : pas de préprocessing ni d'OCR
+            ocr_cache = get_ocr_cache()
+            cached = ocr_cache.get(fetched.sha256, 'pipeline_gray.v1', '--psm 6 -l fra')
+            if cached is not None:
+                ocr_cache.hits += 1
+                text = cached['text']
             else:
-                full_url = image_url
-            
-            # Télécharger image
-            response = requests.get(full_url, timeout=10)
-            response.raise_for_status()
-            
-            # Traiter avec OCR
-            image = Image.open(BytesIO(response.content))
-            
-            # Preprocessing simple
-            opencv_image = cv2.cvtColor(np.array(image), cv2.COLOR_RGB2BGR)
-            gray = cv2.cvtColor(opencv_image, cv2.COLOR_BGR2GRAY)
-            
-            # OCR
-            text = pytesseract.image_to_string(gray, config='--psm 6 -l fra')
+                # Preprocessing simple
+                image = load_image(fetched.content)
+                opencv_image = cv2.cvtColor(np.array(image), cv2.COLOR_RGB2BGR)
+                gray = cv2.cvtColor(opencv_image, cv2.COLOR_BGR2GRAY)
+                
+                # OCR
+                text = ocr_cache.image_to_string(gray, fetched.sha256,
+                                                 'pipeline_gray.v1', '--psm 6 -l fra')
             
             if not text.strip():
                 return None
@@ -0,0 +1,169 @@
+# cv_layout.py
+"""Zones d'intérêt des fiches CV joueurs
+
+Les CV partagent un même gabarit : chaque champ (poste, taille, poids,
+naissance, club, sélections) occupe toujours la même zone. Les zones sont
+stockées en fractions de la taille de l'image dans cv_layout.json, déclarées
+à la main ou apprises depuis les boîtes image_to_data de quelques fiches
+complètes (position des libellés « Taille », « Poids »...).
+
+Seules ces zones sont ensuite passées à Tesseract, chacune avec un PSM et
+une liste de caractères autorisés propres au champ.
+"""
+
+import json
+import os
+import re
+import shlex
+from statistics import median
+
+DEFAULT_LAYOUT_FILE = os.getenv('FFVB_CV_LAYOUT', 'cv_layout.json')
+
+# Libellés repérés dans les boîtes OCR pour apprendre les zones
+FIELD_LABELS = {
+    'poste': re.compile(r'^(poste|position)', re.IGNORECASE),
+    'taille': re.compile(r'^(taille|height)', re.IGNORECASE),
+    'poids': re.compile(r'^(poids|weight)', re.IGNORECASE),
+    'naissance': re.compile(r'^(naissance|n[ée]e?$|birth)', re.IGNORECASE),
+    'club': re.compile(r'^(club|[ée]quipe)', re.IGNORECASE),
+    'selections': re.compile(r'^(s[ée]lections?|caps)', re.IGNORECASE),
+}
+
+_LETTERS = 'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyzÉÈÊÀÂÎÔÛÇéèêàâîôûç'
+
+# (PSM, caractères autorisés) par champ : une ligne de texte (PSM 7) sauf
+# le club, parfois sur deux lignes (PSM 6)
+FIELD_OCR = {
+    'poste': (7, _LETTERS + '-:'),
+    'taille': (7, _LETTERS + '0123456789.,:'),
+    'poids': (7, _LETTERS + '0123456789:'),
+    'naissance': (7, _LETTERS + '0123456789/.-:'),
+    'club': (6, _LETTERS + '0123456789-:.'),
+    'selections': (7, _LETTERS + '0123456789:'),
+}
+
+# Marges ajoutées autour des zones apprises (fraction de l'image)
+ZONE_MARGIN = 0.01
+
+
+def field_config(field, lang='eng'):
+    """Config Tesseract propre à un champ (PSM + liste blanche)"""
+    psm, whitelist = FIELD_OCR[field]
+    return (f"--psm {psm} -l {lang} "
+            f"-c {shlex.quote('tessedit_char_whitelist=' + whitelist)}")
+
+
+def label_zones(data):
+    """Zones des champs repérées sur une page (boîtes image_to_data)
+
+    La zone d'un champ va du début de son libellé à la fin de sa ligne, et
+    descend d'une hauteur de ligne pour couvrir une valeur placée dessous.
+    Retourne {champ: (x0, y0, x1, y1)} en fractions de la page.
+    """
+    levels = data.get('level', [])
+    pages = [i for i, level in enumerate(levels) if level == 1]
+    if not pages:
+        return {}
+    page_width = data['width'][pages[0]] or 1
+    page_height = data['height'][pages[0]] or 1
+
+    # Boîtes des lignes, indexées par (bloc, paragraphe, ligne)
+    lines = {}
+    for i, level in enumerate(levels):
+        if level == 4:
+            key = (data['block_num'][i], data['par_num'][i], data['line_num'][i])
+            lines[key] = (data['left'][i], data['top'][i],
+                          data['left'][i] + data['width'][i], data['top'][i] + data['height'][i])
+
+    zones = {}
+    for i, level in enumerate(levels):
+        if level != 5:
+            continue
+        word = (data['text'][i] or '').strip()
+        for field, label in FIELD_LABELS.items():
+            if field in zones or not label.match(word):
+                continue
+            line = lines.get((data['block_num'][i], data['par_num'][i], data['line_num'][i]))
+            if line is None:
+                continue
+            line_height = line[3] - line[1]
+            zones[field] = (
+                data['left'][i] / page_width,
+                line[1] / page_height,
+                line[2] / page_width,
+                min(line[3] + line_height, page_height) / page_height,
+            )
+    return zones
+
+
+class CVLayout:
+    """Zones des champs d'un CV, en fractions de largeur/hauteur"""
+
+    def __init__(self, zones, samples=0):
+        self.zones = zones
+        self.samples = samples
+
+    @classmethod
+    def learn(cls, pages_data, min_samples=2):
+        """Apprendre les zones depuis les boîtes OCR de plusieurs fiches
+
+        Chaque coordonnée est la médiane des fiches où le libellé a été vu ;
+        un champ vu sur moins de min_samples fiches est ignoré.
+        """
+        seen = {}
+        count = 0
+        for data in pages_data:
+            count += 1
+            for field, zone in label_zones(data).items():
+                seen.setdefault(field, []).append(zone)
+
+        zones = {}
+        for field, boxes in seen.items():
+            if len(boxes) < min(min_samples, count):
+                continue
+            x0, y0, x1, y1 = (median(box[k] for box in boxes) for k in range(4))
+            zones[field] = [max(0.0, x0 - ZONE_MARGIN), max(0.0, y0 - ZONE_MARGIN),
+                            min(1.0, x1 + ZONE_MARGIN), min(1.0, y1 + ZONE_MARGIN)]
+        return cls(zones, count) if zones else None
+
+    @classmethod
+    def load(cls, path=DEFAULT_LAYOUT_FILE):
+        """Charger un gabarit déclaré ou appris, None si absent"""
+        if not os.path.exists(path):
+            return None
+        with open(path, 'r', encoding='utf-8') as f:
+            layout = json.load(f)
+        zones = {field: zone for field, zone in layout.get('zones', {}).items()
+                 if field in FIELD_OCR}
+        return cls(zones, layout.get('samples', 0)) if zones else None
+
+    def save(self, path=DEFAULT_LAYOUT_FILE):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'zones': self.zones, 'samples': self.samples}, f, indent=2)
+
+    def zone_key(self, field):
+        """Identifiant d'une zone (change si elle bouge : clé du cache OCR)"""
+        return ':'.join(f'{v:.3f}' for v in self.zones[field])
+
+    def crop(self, array, field):
+        """Découper la zone d'un champ dans une image NumPy (vue, sans copie)"""
+        height, width = array.shape[:2]
+        x0, y0, x1, y1 = self.zones[field]
+        return array[int(y0 * height):int(y1 * height) + 1,
+                     int(x0 * width):int(x1 * width) + 1]
+
+    def pixel_fraction(self):
+        """Part des pixels de l'image couverte par les zones"""
+        return min(1.0, sum((x1 - x0) * (y1 - y0) for x0, y0, x1, y1 in self.zones.values()))
+
+    def ocr_fields(self, array, image_sha256, ocr_cache, preprocessing, lang='eng'):
+        """OCR de chaque zone avec sa config, retourne {champ: texte}"""
+        texts = {}
+        for field in self.zones:
+            crop = self.crop(array, field)
+            if not crop.size:
+                continue
+            texts[field] = ocr_cache.image_to_string(
+                crop, image_sha256, f"roi:{field}:{preprocessing}:{self.zone_key(field)}",
+                field_config(field, lang))
+        return texts
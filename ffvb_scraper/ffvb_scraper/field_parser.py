@@ -0,0 +1,69 @@
+# field_parser.py
+"""Extraction des champs d'un texte OCR avec une table de patterns compilée
+
+La table {champ: [pattern, ...]} est compilée une fois. Un pattern peut être
+déclaré avec ses mots-clés : (pattern, ('taille', 'height')). Le pattern ne
+peut correspondre que si l'un de ces mots figure dans le texte ; le texte
+est normalisé une seule fois (casefold) et un pattern dont aucun mot-clé
+n'apparaît est écarté par une simple recherche de sous-chaîne, sans lancer
+le moteur regex. Un pattern sans mots-clés est toujours évalué. Les
+patterns retenus sont parcourus paresseusement (finditer) : l'appelant
+s'arrête à la première valeur validée au lieu de construire toutes les
+listes findall.
+
+Les valeurs rendues, et leur ordre (priorité du pattern puis position),
+sont celles de re.findall.
+"""
+
+import re
+
+DEFAULT_FLAGS = re.IGNORECASE | re.MULTILINE
+
+# Caractères que re.IGNORECASE rapproche de i mais que casefold ne replie pas
+_FOLD_FIXES = str.maketrans({'ı': 'i', 'İ': 'i'})
+
+
+def fold(text):
+    """Normalisation utilisée pour tester les mots-clés sans tenir compte de la casse"""
+    if 'ı' in text or 'İ' in text:
+        text = text.translate(_FOLD_FIXES)
+    return text.casefold()
+
+
+class FieldParser:
+    """Table de patterns par champ, compilée avec préfiltre par mots-clés"""
+
+    def __init__(self, patterns, flags=DEFAULT_FLAGS):
+        self.ignore_case = bool(flags & re.IGNORECASE)
+        self.rules = {}
+        for field, field_patterns in patterns.items():
+            rules = []
+            for entry in field_patterns:
+                pattern, keywords = entry if isinstance(entry, tuple) else (entry, ())
+                keywords = tuple(self.prepare(word) for word in keywords)
+                rules.append((re.compile(pattern, flags), keywords))
+            self.rules[field] = rules
+
+    def prepare(self, text):
+        """Texte normalisé pour les tests de mots-clés (une fois par texte)"""
+        return fold(text) if self.ignore_case else text
+
+    def iter_values(self, field, text, prepared=None):
+        """Valeurs d'un champ, dans l'ordre patterns puis position
+
+        Chaque valeur a la forme rendue par re.findall (chaîne, ou tuple si
+        le pattern a plusieurs groupes).
+        """
+        if prepared is None:
+            prepared = self.prepare(text)
+        for regex, keywords in self.rules.get(field, ()):
+            if keywords and not any(word in prepared for word in keywords):
+                continue
+            groups = regex.groups
+            for match in regex.finditer(text):
+                if groups == 0:
+                    yield match.group()
+                elif groups == 1:
+                    yield match.group(1) or ''
+                else:
+                    yield tuple(value or '' for value in match.groups())
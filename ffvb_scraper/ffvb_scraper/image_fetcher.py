@@ -0,0 +1,297 @@
+# image_fetcher.py
+"""Téléchargement partagé des images CV avec cache disque
+
+Tous les extracteurs OCR passent par le même ImageFetcher : une session
+HTTP keep-alive avec pool de connexions, des téléchargements parallèles
+bornés et un cache adressé par contenu (sha256 des octets). L'index
+url_cv_image -> sha256 est persisté : chaque image n'est téléchargée
+qu'une seule fois, quel que soit l'outil qui la demande ensuite.
+
+Chaque nouveau téléchargement ajoute une ligne au journal index.jsonl ;
+l'instantané index.json n'est réécrit (fichier temporaire + os.replace)
+qu'à la fermeture du fetcher, qui vide alors le journal. Ajouts et
+compaction prennent le verrou fichier index.lock (fcntl) : plusieurs
+processus peuvent partager le même cache sans perdre d'entrées.
+"""
+
+import atexit
+import hashlib
+import json
+import os
+import threading
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from io import BytesIO
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None  # Windows : verrou entre threads seulement
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+FFVB_BASE_URL = 'http://www.ffvb.org'
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+
+# Dossier du projet Scrapy (celui de scrapy.cfg), indépendant du répertoire courant
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DEFAULT_CACHE_DIR = os.getenv('FFVB_IMAGE_CACHE', os.path.join(PROJECT_DIR, 'cache', 'cv_images'))
+DEFAULT_MAX_WORKERS = 4
+DEFAULT_TIMEOUT = 15
+
+# Image téléchargée : URL complète, empreinte sha256 et octets bruts
+FetchedImage = namedtuple('FetchedImage', ['url', 'sha256', 'content'])
+
+
+def resolve_image_url(image_url):
+    """URL complète d'une image CV (les chemins relatifs pointent vers ffvb.org)"""
+    image_url = (image_url or '').strip()
+    if image_url.startswith('/'):
+        return f"{FFVB_BASE_URL}{image_url}"
+    return image_url
+
+
+def load_image(content):
+    """Décoder des octets d'image en image PIL"""
+    if Image is None:
+        raise RuntimeError("Pillow n'est pas installé (pip install Pillow)")
+    image = Image.open(BytesIO(content))
+    image.load()
+    return image
+
+
+class ImageFetcher:
+    """Client HTTP partagé + cache disque adressé par contenu"""
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_workers=DEFAULT_MAX_WORKERS,
+                 timeout=DEFAULT_TIMEOUT):
+        self.cache_dir = cache_dir
+        self.objects_dir = os.path.join(cache_dir, 'objects')
+        self.index_file = os.path.join(cache_dir, 'index.json')
+        self.journal_file = os.path.join(cache_dir, 'index.jsonl')
+        self.lock_file = os.path.join(cache_dir, 'index.lock')
+        self.max_workers = max_workers
+        self.timeout = timeout
+
+        # Une connexion keep-alive par worker, réessais sur erreurs transitoires
+        self.session = requests.Session()
+        self.session.headers.update({'User-Agent': USER_AGENT})
+        adapter = HTTPAdapter(
+            pool_connections=max_workers,
+            pool_maxsize=max_workers,
+            max_retries=Retry(total=3, backoff_factor=0.5,
+                              status_forcelist=(429, 500, 502, 503, 504)),
+        )
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+        self.downloads = 0
+        self.cache_hits = 0
+
+        self._lock = threading.Lock()
+        self._in_flight = {}
+        os.makedirs(self.objects_dir, exist_ok=True)
+        self._index = self._load_index()
+
+    @contextmanager
+    def _index_lock(self):
+        """Verrou de l'index : entre threads, puis entre processus (index.lock)"""
+        with self._lock:
+            if fcntl is None:
+                yield
+                return
+            with open(self.lock_file, 'a') as lock:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def _load_index(self):
+        """Charger l'index url -> sha256 (instantané puis journal)"""
+        with self._index_lock():
+            index = self._read_snapshot()
+            index.update(self._read_journal())
+        return index
+
+    def _read_snapshot(self):
+        """Dernier instantané index.json écrit (par ce processus ou un autre)"""
+        try:
+            with open(self.index_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _read_journal(self):
+        """Entrées ajoutées depuis le dernier instantané"""
+        entries = {}
+        try:
+            with open(self.journal_file, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                        entries[entry['url']] = entry['sha256']
+                    except (ValueError, KeyError, TypeError):
+                        continue  # ligne tronquée par un arrêt brutal
+        except OSError:
+            pass
+        return entries
+
+    def _append_journal(self, url, digest):
+        """Ajouter une entrée au journal (appelé sous verrou)"""
+        line = json.dumps({'url': url, 'sha256': digest}, ensure_ascii=False)
+        with open(self.journal_file, 'a', encoding='utf-8') as f:
+            f.write(line + '\n')
+
+    def flush(self):
+        """Réécrire l'instantané index.json et vider le journal
+
+        L'écriture passe par un fichier temporaire + os.replace : un lecteur
+        voit toujours l'ancien ou le nouvel index complet.
+        """
+        with self._index_lock():
+            journal = self._read_journal()
+            if not journal:
+                return
+            # Instantané et journal peuvent contenir des entrées d'autres
+            # processus : les fusionner avant de réécrire
+            snapshot = self._read_snapshot()
+            snapshot.update(self._index)
+            snapshot.update(journal)
+            self._index = snapshot
+            tmp_file = f"{self.index_file}.{os.getpid()}.tmp"
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(self._index, f, ensure_ascii=False, indent=1)
+            os.replace(tmp_file, self.index_file)
+            os.remove(self.journal_file)
+
+    def close(self):
+        """Compacter l'index et fermer la session HTTP"""
+        self.flush()
+        self.session.close()
+
+    def _object_path(self, digest):
+        return os.path.join(self.objects_dir, digest[:2], digest)
+
+    def _read_cached(self, url, digest):
+        """Image en cache sous cette empreinte, None si le fichier manque"""
+        try:
+            with open(self._object_path(digest), 'rb') as f:
+                return FetchedImage(url, digest, f.read())
+        except OSError:
+            return None
+
+    def _store(self, url, content):
+        """Ranger les octets sous leur empreinte et indexer l'URL"""
+        digest = hashlib.sha256(content).hexdigest()
+        path = self._object_path(digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(content)
+            os.replace(tmp_path, path)
+        with self._index_lock():
+            self._index[url] = digest
+            self._append_journal(url, digest)
+        return FetchedImage(url, digest, content)
+
+    def fetch(self, image_url):
+        """Récupérer une image (cache disque, sinon téléchargement unique)
+
+        Les appels concurrents sur une même URL attendent le téléchargement
+        en cours au lieu d'en lancer un second.
+        """
+        url = resolve_image_url(image_url)
+        if not url:
+            raise ValueError("URL d'image vide")
+
+        with self._lock:
+            digest = self._index.get(url)
+            if not digest:
+                event = self._in_flight.get(url)
+                owner = event is None
+                if owner:
+                    event = self._in_flight[url] = threading.Event()
+
+        # Lecture disque hors verrou : seules les recherches d'index sont sérialisées
+        if digest:
+            cached = self._read_cached(url, digest)
+            with self._lock:
+                if cached is not None:
+                    self.cache_hits += 1
+                    return cached
+                # Fichier objet supprimé : oublier l'entrée et retélécharger
+                if self._index.get(url) == digest:
+                    del self._index[url]
+            return self.fetch(url)
+
+        if not owner:
+            event.wait()
+            return self.fetch(url)
+
+        try:
+            response = self.session.get(url, timeout=self.timeout)
+            response.raise_for_status()
+            with self._lock:
+                self.downloads += 1
+            return self._store(url, response.content)
+        finally:
+            with self._lock:
+                del self._in_flight[url]
+            event.set()
+
+    def fetch_bytes(self, image_url):
+        """Octets bruts de l'image"""
+        return self.fetch(image_url).content
+
+    def fetch_image(self, image_url):
+        """Image PIL prête pour le préprocessing OCR"""
+        return load_image(self.fetch(image_url).content)
+
+    def fetch_many(self, image_urls):
+        """Télécharger plusieurs images en parallèle (max_workers simultanés)
+
+        Retourne {url_cv_image: FetchedImage ou exception}.
+        """
+        urls = list(dict.fromkeys(u for u in image_urls if u and u.strip()))
+
+        def safe_fetch(url):
+            try:
+                return self.fetch(url)
+            except Exception as e:
+                return e
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            return dict(zip(urls, executor.map(safe_fetch, urls)))
+
+    def prefetch(self, players, url_field='url_cv_image'):
+        """Précharger les images CV d'une liste de joueurs, retourne le nombre d'échecs"""
+        results = self.fetch_many(player.get(url_field, '') for player in players)
+        failures = sum(1 for result in results.values() if isinstance(result, Exception))
+        print(f"🖼️ Images CV: {len(results) - failures}/{len(results)} disponibles "
+              f"({self.downloads} téléchargée(s), {self.cache_hits} en cache)")
+        return failures
+
+
+_shared_fetcher = None
+_shared_lock = threading.Lock()
+
+
+def get_image_fetcher(**kwargs):
+    """Instance partagée du fetcher (créée au premier appel)"""
+    global _shared_fetcher
+    with _shared_lock:
+        if _shared_fetcher is None:
+            _shared_fetcher = ImageFetcher(**kwargs)
+            atexit.register(_shared_fetcher.close)
+        return _shared_fetcher
@@ -0,0 +1,132 @@
+# image_preprocessing.py
+"""Préprocessing vectorisé des images CV pour l'OCR
+
+L'image PIL est convertie une seule fois en tableau NumPy ; les versions
+(contraste, netteté, gris, OpenCV, binaire) partagent les intermédiaires
+(gris natif, image agrandie) au lieu d'enchaîner des opérations PIL
+indépendantes. Contraste et seuillage passent par une table de
+correspondance (cv2.LUT) et le débruitage, l'étape la plus coûteuse, se
+fait à la résolution native avant agrandissement.
+"""
+
+import time
+from contextlib import contextmanager
+
+import cv2
+import numpy as np
+
+# Largeur minimale visée avant OCR
+TARGET_WIDTH = 1200
+
+# Seuil de binarisation simple
+BINARY_THRESHOLD = 128
+
+# Noyau de ImageFilter.SMOOTH, dégradé utilisé par ImageEnhance.Sharpness
+_SMOOTH_KERNEL = np.array([[1, 1, 1], [1, 5, 1], [1, 1, 1]], dtype=np.float32) / 13
+
+_BINARY_LUT = np.where(np.arange(256) < BINARY_THRESHOLD, 0, 255).astype(np.uint8)
+
+
+@contextmanager
+def stage_timer(timings, stage):
+    """Cumuler la durée d'une étape dans timings[stage] (si timings n'est pas None)"""
+    if timings is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[stage] = timings.get(stage, 0.0) + time.perf_counter() - start
+
+
+def to_rgb_array(image):
+    """Image PIL (tout mode) -> tableau RGB uint8"""
+    if image.mode != 'RGB':
+        image = image.convert('RGB')
+    return np.asarray(image)
+
+
+def upscale(array, target_width=TARGET_WIDTH):
+    """Agrandir (Lanczos) jusqu'à target_width, sans réduire les grandes images"""
+    height, width = array.shape[:2]
+    if width >= target_width:
+        return array
+    scale = target_width / width
+    return cv2.resize(array, (int(width * scale), int(height * scale)),
+                      interpolation=cv2.INTER_LANCZOS4)
+
+
+def contrast_lut(gray, factor):
+    """Table de ImageEnhance.Contrast : mélange avec le gris moyen de l'image"""
+    mean = int(gray.mean() + 0.5)
+    values = mean + factor * (np.arange(256, dtype=np.float32) - mean)
+    return np.clip(values + 0.5, 0, 255).astype(np.uint8)
+
+
+def sharpen(array, factor):
+    """Équivalent de ImageEnhance.Sharpness : extrapolation depuis l'image lissée"""
+    smooth = cv2.filter2D(array, -1, _SMOOTH_KERNEL, borderType=cv2.BORDER_REPLICATE)
+    return cv2.addWeighted(array, factor, smooth, 1 - factor, 0)
+
+
+def opencv_variant(native_gray, target_width=TARGET_WIDTH):
+    """Débruitage natif, agrandissement, CLAHE puis binarisation adaptative"""
+    denoised = cv2.fastNlMeansDenoising(native_gray)
+    enhanced = cv2.createCLAHE(clipLimit=3.0, tileGridSize=(8, 8)).apply(
+        upscale(denoised, target_width))
+    return cv2.adaptiveThreshold(
+        enhanced, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY, 11, 2
+    )
+
+
+def build_variants(image, names, contrast=1.8, sharpness=2.0,
+                   target_width=TARGET_WIDTH, timings=None):
+    """Construire les versions demandées d'une image PIL
+
+    names: sous-ensemble de ('original', 'contrast', 'sharp', 'grayscale',
+    'opencv', 'binary'). Retourne {nom: tableau uint8} ; timings (dict)
+    reçoit la durée cumulée de chaque étape.
+    """
+    variants = {}
+
+    with stage_timer(timings, 'conversion'):
+        native = to_rgb_array(image)
+        native_gray = cv2.cvtColor(native, cv2.COLOR_RGB2GRAY)
+
+    with stage_timer(timings, 'resize'):
+        resized = upscale(native, target_width)
+        gray = upscale(native_gray, target_width)
+
+    if 'original' in names:
+        variants['original'] = resized
+
+    if 'contrast' in names:
+        with stage_timer(timings, 'contrast'):
+            variants['contrast'] = cv2.LUT(resized, contrast_lut(gray, contrast))
+
+    if 'sharp' in names:
+        with stage_timer(timings, 'sharp'):
+            variants['sharp'] = sharpen(resized, sharpness)
+
+    if 'grayscale' in names:
+        variants['grayscale'] = gray
+
+    if 'opencv' in names:
+        with stage_timer(timings, 'opencv'):
+            variants['opencv'] = opencv_variant(native_gray, target_width)
+
+    if 'binary' in names:
+        with stage_timer(timings, 'binary'):
+            variants['binary'] = cv2.LUT(gray, _BINARY_LUT)
+
+    return variants
+
+
+def format_timings(timings, count=None):
+    """Résumé lisible des durées par étape (moyenne par image si count)"""
+    total = sum(timings.values())
+    divisor = count or 1
+    parts = [f"{stage} {duration / divisor * 1000:.0f} ms"
+             for stage, duration in sorted(timings.items(), key=lambda item: -item[1])]
+    return f"{total / divisor * 1000:.0f} ms ({', '.join(parts)})"
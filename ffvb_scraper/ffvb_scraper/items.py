@@ -26,11 +26,11 @@ def extract_height(value):
         # Formats possibles: "1m95", "195cm", "195", "1,95m"
         value = value.replace(',', '.')
         
-        # Format 1m95 ou 1.95m
-        match = re.search(r'(\d+)[\.,]?(\d+)?m', value)
+        # Format 1m95, 1.95m, 1,95 ou 2m
+        match = re.search(r'(?<!\d)(\d)\s*[m\.]\s*(\d{1,2})?', value)
         if match:
             meters = int(match.group(1))
-            cm = int(match.group(2)) if match.group(2) else 0
+            cm = int(match.group(2).ljust(2, '0')) if match.group(2) else 0
             return meters * 100 + cm
         
         # Format 195cm ou juste 195
@@ -1,10 +1,15 @@
 # middlewares.py
+import json
+import os
 import random
+import sqlite3
 import time
 from scrapy import signals
-from scrapy.http import HtmlResponse
-from scrapy.downloadermiddlewares.retry import RetryMiddleware
+from scrapy.http import Headers
+from scrapy.responsetypes import responsetypes
+from scrapy.downloadermiddlewares.retry import RetryMiddleware, get_retry_request
 from scrapy.downloadermiddlewares.httpproxy import HttpProxyMiddleware
+from scrapy.utils.project import data_path
 from itemadapter import is_item, ItemAdapter
 import logging
 
@@ -29,13 +34,26 @@ class RotateUserAgentMiddleware:
         spider.logger.debug(f"User-Agent utilisé: {ua}")
 
 class CustomRetryMiddleware(RetryMiddleware):
-    """Middleware de retry personnalisé avec backoff exponentiel"""
+    """Middleware de retry personnalisé avec backoff exponentiel non bloquant
+
+    La copie de la requête est renvoyée tout de suite au moteur, comme un
+    retry Scrapy classique, avec son délai de backoff dans
+    meta['retry_backoff'] : ThrottleMiddleware l'applique au slot de
+    téléchargement du domaine. Rien n'attend dans le middleware, les autres
+    domaines et les pipelines avancent pendant le backoff.
+    """
     
     def __init__(self, settings):
         super().__init__(settings)
         self.backoff_base = settings.getfloat('RETRY_BACKOFF_BASE', 2.0)
         self.backoff_max = settings.getfloat('RETRY_BACKOFF_MAX', 60.0)
     
+    @classmethod
+    def from_crawler(cls, crawler):
+        mw = cls(crawler.settings)
+        mw.crawler = crawler
+        return mw
+    
     def process_response(self, request, response, spider):
         if request.meta.get('dont_retry', False):
             return response
@@ -43,16 +61,28 @@ class CustomRetryMiddleware(RetryMiddleware):
         if response.status in self.retry_http_codes:
             reason = response_status_message(response.status)
             
+            # Construit la requête de retry et met à jour les stats retry/*
+            retry_request = get_retry_request(
+                request,
+                spider=spider,
+                reason=reason,
+                max_retry_times=request.meta.get('max_retry_times', self.max_retry_times),
+                priority_adjust=request.meta.get('priority_adjust', self.priority_adjust),
+            )
+            if retry_request is None:
+                return response
+            
             # Calculer le délai avec backoff exponentiel
-            retry_times = request.meta.get('retry_times', 0) + 1
+            retry_times = retry_request.meta['retry_times']
             delay = min(self.backoff_base ** retry_times, self.backoff_max)
             
             spider.logger.warning(f"Retry {retry_times} pour {request.url} dans {delay:.1f}s - Raison: {reason}")
             
-            # Attendre avant de retry
-            time.sleep(delay)
+            retry_request.meta['retry_backoff'] = delay
+            self.crawler.stats.inc_value('retry/delayed_count')
+            self.crawler.stats.inc_value('retry/delayed_seconds', delay)
             
-            return self._retry(request, reason, spider) or response
+            return retry_request
         
         return response
 
@@ -108,57 +138,348 @@ class LoggingMiddleware:
         spider.logger.error(f"❌ Erreur #{self.error_count}: {exception} - {request.url}")
 
 class CacheMiddleware:
-    """Middleware de cache simple pour éviter les requêtes redondantes"""
+    """Cache HTTP persistant et borné pour éviter les requêtes redondantes
     
-    def __init__(self):
-        self.cache = {}
-        self.cache_hits = 0
-        self.cache_misses = 0
+    Les réponses (statut, en-têtes, corps) sont stockées dans une base SQLite
+    (RESPONSE_CACHE_PATH, relatif au dossier .scrapy du projet comme le
+    HTTPCACHE de Scrapy) limitée à RESPONSE_CACHE_MAX_MB, avec éviction LRU. Une entrée plus jeune
+    que RESPONSE_CACHE_MAX_AGE secondes est servie directement ; au-delà elle
+    est revalidée avec If-None-Match / If-Modified-Since et un 304 la rafraîchit.
+    Activé par RESPONSE_CACHE_ENABLED ou l'attribut `use_cache` du spider.
+    """
+    
+    def __init__(self, stats, fingerprinter, path, max_bytes, max_age, enabled=False):
+        self.stats = stats
+        self.fingerprinter = fingerprinter
+        self.path = path
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.enabled = enabled
+        self.db = None
+        self.total_bytes = 0
+    
+    @classmethod
+    def from_crawler(cls, crawler):
+        settings = crawler.settings
+        mw = cls(
+            crawler.stats,
+            crawler.request_fingerprinter,
+            path=data_path(settings.get('RESPONSE_CACHE_PATH', 'response_cache.db')),
+            max_bytes=int(settings.getfloat('RESPONSE_CACHE_MAX_MB', 256) * 1024 * 1024),
+            max_age=settings.getfloat('RESPONSE_CACHE_MAX_AGE', 3600),
+            enabled=settings.getbool('RESPONSE_CACHE_ENABLED', False),
+        )
+        crawler.signals.connect(mw.spider_closed, signal=signals.spider_closed)
+        return mw
+    
+    def _open(self):
+        if self.db is not None:
+            return
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.db = sqlite3.connect(self.path)
+        self.db.execute("PRAGMA journal_mode = WAL")
+        self.db.execute("PRAGMA synchronous = NORMAL")
+        self.db.execute('''
+            CREATE TABLE IF NOT EXISTS responses (
+                fingerprint TEXT PRIMARY KEY,
+                url TEXT,
+                status INTEGER,
+                headers TEXT,
+                body BLOB,
+                size INTEGER,
+                etag TEXT,
+                last_modified TEXT,
+                stored_at REAL,
+                last_access REAL
+            )
+        ''')
+        self.db.execute("CREATE INDEX IF NOT EXISTS idx_responses_lru ON responses (last_access)")
+        self.db.commit()
+        self.total_bytes = self.db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+    
+    def _is_enabled(self, request, spider):
+        if request.method != 'GET' or request.meta.get('dont_cache'):
+            return False
+        return getattr(spider, 'use_cache', self.enabled)
     
     def process_request(self, request, spider):
-        # Pour le développement, on peut activer le cache
-        if hasattr(spider, 'use_cache') and spider.use_cache:
-            if request.url in self.cache:
-                self.cache_hits += 1
-                spider.logger.debug(f"🎯 Cache hit: {request.url}")
-                return HtmlResponse(
-                    url=request.url,
-                    body=self.cache[request.url],
-                    encoding='utf-8'
-                )
+        if not self._is_enabled(request, spider):
+            return None
+        
+        self._open()
+        key = self.fingerprinter.fingerprint(request).hex()
+        row = self.db.execute(
+            "SELECT status, headers, body, etag, last_modified, stored_at FROM responses WHERE fingerprint = ?",
+            (key,)
+        ).fetchone()
+        
+        if row is None:
+            self.stats.inc_value('cache/miss')
+            return None
+        
+        status, headers, body, etag, last_modified, stored_at = row
+        if time.time() - stored_at < self.max_age:
+            self.stats.inc_value('cache/hit')
+            self._touch(key)
+            spider.logger.debug(f"🎯 Cache hit: {request.url}")
+            return self._build_response(request, status, headers, body)
+        
+        # Entrée périmée : revalidation conditionnelle
+        self.stats.inc_value('cache/stale')
+        if etag or last_modified:
+            if etag:
+                request.headers['If-None-Match'] = etag
+            if last_modified:
+                request.headers['If-Modified-Since'] = last_modified
+            request.meta['_cache_revalidate'] = key
         return None
     
     def process_response(self, request, response, spider):
+        if 'cached' in response.flags or not self._is_enabled(request, spider):
+            return response
+        
+        self._open()
+        key = request.meta.pop('_cache_revalidate', None)
+        if key and response.status == 304:
+            row = self.db.execute(
+                "SELECT status, headers, body FROM responses WHERE fingerprint = ?", (key,)
+            ).fetchone()
+            if row:
+                self.stats.inc_value('cache/revalidated')
+                now = time.time()
+                with self.db:
+                    self.db.execute(
+                        "UPDATE responses SET stored_at = ?, last_access = ? WHERE fingerprint = ?",
+                        (now, now, key)
+                    )
+                spider.logger.debug(f"🔄 Cache revalidé: {request.url}")
+                return self._build_response(request, *row)
+            
+            # Entrée évincée entre-temps : redemander la page complète
+            retry_request = request.replace(dont_filter=True)
+            retry_request.headers.pop('If-None-Match', None)
+            retry_request.headers.pop('If-Modified-Since', None)
+            return retry_request
+        
         # Mettre en cache les réponses réussies
-        if hasattr(spider, 'use_cache') and spider.use_cache and response.status == 200:
-            self.cache[request.url] = response.body
-            self.cache_misses += 1
+        if response.status == 200:
+            self._store(self.fingerprinter.fingerprint(request).hex(), response)
             spider.logger.debug(f"💾 Mise en cache: {request.url}")
         
         return response
+    
+    def _store(self, key, response):
+        headers = {
+            k.decode('latin1'): [v.decode('latin1') for v in values]
+            for k, values in response.headers.items()
+        }
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        size = len(response.body)
+        now = time.time()
+        
+        with self.db:
+            previous = self.db.execute(
+                "SELECT size FROM responses WHERE fingerprint = ?", (key,)
+            ).fetchone()
+            self.db.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, response.url, response.status, json.dumps(headers), response.body, size,
+                 etag.decode('latin1') if etag else None,
+                 last_modified.decode('latin1') if last_modified else None,
+                 now, now)
+            )
+        self.total_bytes += size - (previous[0] if previous else 0)
+        self.stats.inc_value('cache/stored')
+        self._evict()
+    
+    def _evict(self):
+        """Supprimer les entrées les moins récemment utilisées au-delà du budget"""
+        while self.total_bytes > self.max_bytes:
+            victims = self.db.execute(
+                "SELECT fingerprint, size FROM responses ORDER BY last_access LIMIT 32"
+            ).fetchall()
+            if not victims:
+                break
+            with self.db:
+                for key, size in victims:
+                    if self.total_bytes <= self.max_bytes:
+                        break
+                    self.db.execute("DELETE FROM responses WHERE fingerprint = ?", (key,))
+                    self.total_bytes -= size
+                    self.stats.inc_value('cache/evicted')
+    
+    def _touch(self, key):
+        with self.db:
+            self.db.execute(
+                "UPDATE responses SET last_access = ? WHERE fingerprint = ?", (time.time(), key)
+            )
+    
+    def _build_response(self, request, status, headers, body):
+        headers = Headers(json.loads(headers))
+        respcls = responsetypes.from_args(headers=headers, url=request.url, body=body)
+        return respcls(
+            url=request.url, status=status, headers=headers, body=body,
+            flags=['cached'], request=request
+        )
+    
+    def spider_closed(self, spider):
+        # Taux de réponses servies sans télécharger de corps (hits + 304)
+        lookups = sum(self.stats.get_value(f'cache/{k}', 0) for k in ('hit', 'miss', 'stale'))
+        served = self.stats.get_value('cache/hit', 0) + self.stats.get_value('cache/revalidated', 0)
+        if lookups:
+            hit_rate = round(100.0 * served / lookups, 1)
+            self.stats.set_value('cache/hit_rate', hit_rate)
+            spider.logger.info(f"🎯 Cache: {served}/{lookups} réponses servies par le cache ({hit_rate}%)")
+        self.stats.set_value('cache/size_bytes', self.total_bytes)
+        if self.db is not None:
+            self.db.close()
+            self.db = None
 
 class ThrottleMiddleware:
-    """Middleware pour limiter le débit de requêtes par domaine"""
+    """Middleware pour limiter le débit de requêtes par domaine
     
-    def __init__(self):
-        self.domain_delays = {}
-        self.last_request_time = {}
+    Le rythme est imposé par le slot de téléchargement du domaine : au
+    premier passage d'un domaine, son slot reçoit un délai d'une requête
+    toutes les `custom_delay` secondes (attribut du spider,
+    THROTTLE_DEFAULT_DELAY sinon), plafonné par
+    SECURITY_CONFIG['request_rate_limit'] (requêtes/minute), sans descendre
+    sous DOWNLOAD_DELAY, et une concurrence de THROTTLE_MAX_CONCURRENCY. Une
+    entrée DOWNLOAD_SLOTS du domaine reste prioritaire. Un délai ou un
+    plafond à 0 désactive la contrainte correspondante.
+    
+    Aucune requête n'attend dans le middleware : elle patiente dans la file
+    du slot de son domaine, et DownloaderAwarePriorityQueue
+    (SCHEDULER_PRIORITY_QUEUE) sert d'abord les domaines ayant le moins de
+    requêtes au downloader. Un domaine lent n'occupe donc pas toute la
+    concurrence CONCURRENT_REQUESTS ; les autres domaines, les réponses en
+    cache et les pipelines continuent.
+    
+    Le backoff d'un retry (meta['retry_backoff'], posé par
+    CustomRetryMiddleware) allonge le délai du slot du domaine, compté à
+    partir du retry, jusqu'à la première réponse hors RETRY_HTTP_CODES.
+    """
+    
+    META_KEY = '_throttle_queued_at'
+    
+    def __init__(self, crawler, rate_per_minute, max_concurrency, default_delay=2.0):
+        if rate_per_minute < 0 or default_delay < 0:
+            raise ValueError("Le débit et le délai du throttle doivent être >= 0")
+        self.crawler = crawler
+        self.stats = crawler.stats
+        self.rate_per_minute = rate_per_minute
+        self.default_delay = default_delay
+        self.min_delay = crawler.settings.getfloat('DOWNLOAD_DELAY')
+        self.max_concurrency = max(1, max_concurrency)
+        self.retry_http_codes = {int(code) for code in crawler.settings.getlist('RETRY_HTTP_CODES')}
+        self.delays = {}  # domaine -> délai du slot, None si non limité
+        self.backoffs = {}  # domaine en backoff -> délai du slot à restaurer
+    
+    @classmethod
+    def from_crawler(cls, crawler):
+        settings = crawler.settings
+        security_config = settings.getdict('SECURITY_CONFIG')
+        rate = settings.getfloat(
+            'THROTTLE_RATE_PER_MINUTE', security_config.get('request_rate_limit', 60)
+        )
+        return cls(
+            crawler,
+            rate_per_minute=rate,
+            max_concurrency=settings.getint(
+                'THROTTLE_MAX_CONCURRENCY', settings.getint('CONCURRENT_REQUESTS_PER_DOMAIN', 1)
+            ),
+            default_delay=settings.getfloat('THROTTLE_DEFAULT_DELAY', 2.0),
+        )
+    
+    def _rate(self, spider):
+        """Requêtes par seconde pour un domaine, None si aucune limite"""
+        delay = getattr(spider, 'custom_delay', None)
+        if delay is None:
+            delay = self.default_delay
+        rates = []
+        if delay > 0:
+            rates.append(1.0 / delay)
+        if self.rate_per_minute > 0:
+            rates.append(self.rate_per_minute / 60.0)
+        return min(rates) if rates else None
+    
+    def _configure_slot(self, key, spider):
+        """Régler délai et concurrence du slot d'un domaine (une fois)"""
+        rate = self._rate(spider)
+        if rate is None:
+            self.delays[key] = None
+            return
+        downloader = self.crawler.engine.downloader
+        slot_settings = downloader.per_slot_settings.setdefault(key, {})
+        slot_settings.setdefault('delay', max(self.min_delay, 1.0 / rate))
+        slot_settings.setdefault('concurrency', self.max_concurrency)
+        self.delays[key] = slot_settings['delay']
+        
+        # Slot déjà créé par une requête précédente (dont_throttle)
+        slot = downloader.slots.get(key)
+        if slot is not None:
+            slot.delay = slot_settings['delay']
+            slot.concurrency = slot_settings['concurrency']
+    
+    def _set_slot_delay(self, key, delay):
+        downloader = self.crawler.engine.downloader
+        downloader.per_slot_settings.setdefault(key, {})['delay'] = delay
+        slot = downloader.slots.get(key)
+        if slot is not None:
+            slot.delay = delay
+        return slot
+    
+    def _apply_backoff(self, key, backoff):
+        """Espacer les requêtes du domaine d'au moins `backoff` secondes"""
+        downloader = self.crawler.engine.downloader
+        if key not in self.backoffs:
+            slot = downloader.slots.get(key)
+            self.backoffs[key] = slot.delay if slot is not None else (
+                downloader.per_slot_settings.get(key, {}).get('delay', self.min_delay)
+            )
+        slot = self._set_slot_delay(key, max(self.backoffs[key], backoff))
+        if slot is not None:
+            # Le backoff court à partir du retry, pas du dernier départ du slot
+            slot.lastseen = time.monotonic()
     
     def process_request(self, request, spider):
-        domain = request.url.split('/')[2]  # Extraire le domaine
+        key = self.crawler.engine.downloader.get_slot_key(request)
+        backoff = request.meta.pop('retry_backoff', None)
+        if backoff:
+            self._apply_backoff(key, backoff)
+            request.meta['autothrottle_dont_adjust_delay'] = True
         
-        # Délai par défaut ou configuré
-        delay = getattr(spider, 'custom_delay', 2.0)
+        if request.meta.get('dont_throttle'):
+            return None
+        if key not in self.delays:
+            self._configure_slot(key, spider)
+        if self.delays[key] is None:
+            return None
         
-        # Vérifier le délai depuis la dernière requête
-        if domain in self.last_request_time:
-            elapsed = time.time() - self.last_request_time[domain]
-            if elapsed < delay:
-                sleep_time = delay - elapsed
-                spider.logger.debug(f"⏱️  Throttle: attendre {sleep_time:.1f}s pour {domain}")
-                time.sleep(sleep_time)
+        # Le débit est un plafond : AutoThrottle ne doit pas réduire ce délai
+        request.meta['autothrottle_dont_adjust_delay'] = True
+        request.meta[self.META_KEY] = time.monotonic()
+        return None
+    
+    def process_response(self, request, response, spider):
+        key = request.meta.get('download_slot')
+        if key in self.backoffs and response.status not in self.retry_http_codes:
+            self._set_slot_delay(key, self.backoffs.pop(key))
         
-        self.last_request_time[domain] = time.time()
+        queued_at = request.meta.pop(self.META_KEY, None)
+        if queued_at is not None:
+            # Temps passé dans la file du slot, hors téléchargement
+            waited = time.monotonic() - queued_at - request.meta.get('download_latency', 0)
+            self._record_wait(key, max(0.0, waited))
+        return response
+    
+    def _record_wait(self, domain, waited):
+        self.stats.inc_value('throttle/wait_count')
+        self.stats.inc_value('throttle/wait_seconds', waited)
+        self.stats.inc_value(f'throttle/wait_seconds/{domain}', waited)
+        self.stats.max_value('throttle/max_wait_seconds', waited)
 
 class ResponseSizeMiddleware:
     """Middleware pour surveiller la taille des réponses"""
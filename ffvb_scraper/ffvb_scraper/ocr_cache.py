@@ -0,0 +1,128 @@
+# ocr_cache.py
+"""Cache persistant des résultats OCR
+
+Un résultat est identifié par (sha256 des octets de l'image, nom du
+préprocessing, configuration Tesseract, version de Tesseract) et conserve
+le texte brut ainsi que les boîtes de image_to_data. Modifier un pattern
+d'extraction ne demande donc plus de relancer Tesseract : le texte en
+cache est simplement re-parsé. Les OCR manquants passent par le moteur
+Tesseract persistant (ocr_engine).
+"""
+
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime
+
+from ffvb_scraper.ocr_engine import get_tesseract_engine
+
+DEFAULT_CACHE_PATH = os.getenv('FFVB_OCR_CACHE', 'cache/ocr_results.sqlite')
+
+
+class OCRCache:
+    """Résultats OCR en SQLite, partageables entre threads"""
+
+    def __init__(self, db_path=DEFAULT_CACHE_PATH, engine=None):
+        self.db_path = db_path
+        self.engine = engine or get_tesseract_engine()
+        if os.path.dirname(db_path):
+            os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self.connection = sqlite3.connect(db_path, check_same_thread=False)
+        self.connection.execute('''
+            CREATE TABLE IF NOT EXISTS ocr_results (
+                image_sha256 TEXT NOT NULL,
+                preprocessing TEXT NOT NULL,
+                config TEXT NOT NULL,
+                tesseract_version TEXT NOT NULL,
+                text TEXT NOT NULL,
+                data TEXT,
+                created_at TEXT,
+                PRIMARY KEY (image_sha256, preprocessing, config, tesseract_version)
+            )
+        ''')
+        self.connection.commit()
+        self.version = self.engine.version()
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def get(self, image_sha256, preprocessing, config):
+        """Résultat en cache {'text', 'data'} ou None"""
+        with self._lock:
+            row = self.connection.execute(
+                'SELECT text, data FROM ocr_results WHERE image_sha256 = ? '
+                'AND preprocessing = ? AND config = ? AND tesseract_version = ?',
+                (image_sha256, preprocessing, config, self.version),
+            ).fetchone()
+        if row is None:
+            return None
+        return {'text': row[0], 'data': json.loads(row[1]) if row[1] else None}
+
+    def get_texts(self, image_sha256):
+        """Tous les textes en cache d'une image : {(preprocessing, config): texte}"""
+        with self._lock:
+            rows = self.connection.execute(
+                'SELECT preprocessing, config, text FROM ocr_results '
+                'WHERE image_sha256 = ? AND tesseract_version = ?',
+                (image_sha256, self.version),
+            ).fetchall()
+        return {(preprocessing, config): text for preprocessing, config, text in rows}
+
+    def put(self, image_sha256, preprocessing, config, text, data=None):
+        """Enregistrer un résultat OCR"""
+        with self._lock:
+            with self.connection:
+                self.connection.execute(
+                    'INSERT OR REPLACE INTO ocr_results VALUES (?, ?, ?, ?, ?, ?, ?)',
+                    (image_sha256, preprocessing, config, self.version, text,
+                     json.dumps(data, ensure_ascii=False) if data is not None else None,
+                     datetime.now().isoformat()),
+                )
+
+    def image_to_string(self, image, image_sha256, preprocessing, config):
+        """image_to_string du moteur avec cache (sans cache si image_sha256 est vide)"""
+        if image_sha256:
+            cached = self.get(image_sha256, preprocessing, config)
+            if cached is not None:
+                self.hits += 1
+                return cached['text']
+        text = self.engine.image_to_string(image, config=config)
+        if image_sha256:
+            self.misses += 1
+            self.put(image_sha256, preprocessing, config, text)
+        return text
+
+    def image_to_data(self, image, image_sha256, preprocessing, config):
+        """Texte + boîtes image_to_data (dict) avec cache, retourne (texte, data)"""
+        if image_sha256:
+            cached = self.get(image_sha256, preprocessing, config)
+            if cached is not None and cached['data'] is not None:
+                self.hits += 1
+                return cached['text'], cached['data']
+        text, data = self.engine.image_to_text_and_data(image, config=config)
+        if image_sha256:
+            self.misses += 1
+            self.put(image_sha256, preprocessing, config, text, data)
+        return text, data
+
+    def summary(self):
+        """Résumé des accès au cache"""
+        return f"💾 Cache OCR: {self.hits} résultat(s) réutilisé(s), {self.misses} OCR exécuté(s)"
+
+    def close(self):
+        with self._lock:
+            self.connection.close()
+
+
+_shared_cache = None
+_shared_lock = threading.Lock()
+
+
+def get_ocr_cache(**kwargs):
+    """Instance partagée du cache OCR (créée au premier appel)"""
+    global _shared_cache
+    with _shared_lock:
+        if _shared_cache is None:
+            _shared_cache = OCRCache(**kwargs)
+        return _shared_cache
@@ -0,0 +1,193 @@
+# ocr_engine.py
+"""Moteur Tesseract persistant
+
+Avec tesserocr (liaison directe à libtesseract), les instances de l'API
+restent chargées : les données de langue ne sont lues qu'une fois par
+instance et les images NumPy sont transmises en mémoire brute
+(SetImageBytes), sans processus ni fichier PNG temporaire par appel.
+tesserocr libère le GIL pendant la reconnaissance : un ThreadPoolExecutor
+suffit pour occuper plusieurs cœurs, chaque thread empruntant une
+instance au pool.
+
+Sans tesserocr, le moteur retombe sur pytesseract (un processus par appel).
+"""
+
+import queue
+import shlex
+import threading
+
+import numpy as np
+
+try:
+    import tesserocr
+    TESSEROCR_AVAILABLE = True
+except ImportError:
+    tesserocr = None
+    TESSEROCR_AVAILABLE = False
+
+try:
+    import pytesseract
+except ImportError:
+    pytesseract = None
+
+# Colonnes de image_to_data (identiques à la sortie TSV de Tesseract)
+DATA_COLUMNS = ['level', 'page_num', 'block_num', 'par_num', 'line_num', 'word_num',
+                'left', 'top', 'width', 'height', 'conf', 'text']
+
+
+def parse_config(config):
+    """Découper une config pytesseract ('--psm 6 -l fra -c clé=valeur')
+
+    Retourne (langue, oem, psm, variables).
+    """
+    lang, oem, psm, variables = 'eng', None, 3, {}
+    tokens = shlex.split(config or '')
+    i = 0
+    while i < len(tokens):
+        token = tokens[i]
+        value = tokens[i + 1] if i + 1 < len(tokens) else ''
+        if token == '-l':
+            lang = value
+        elif token == '--oem':
+            oem = int(value)
+        elif token == '--psm':
+            psm = int(value)
+        elif token == '-c' and '=' in value:
+            key, _, var = value.partition('=')
+            variables[key] = var
+        else:
+            i += 1
+            continue
+        i += 2
+    return lang, oem, psm, variables
+
+
+def to_array(image):
+    """Image PIL ou tableau -> tableau uint8 contigu (gris, RGB ou RGBA)"""
+    if not isinstance(image, np.ndarray):
+        if image.mode not in ('L', 'RGB', 'RGBA'):
+            image = image.convert('L' if image.mode in ('1', 'I', 'F') else 'RGB')
+        image = np.asarray(image)
+    if image.dtype != np.uint8:
+        image = image.astype(np.uint8)
+    return np.ascontiguousarray(image)
+
+
+def parse_tsv(tsv):
+    """Sortie TSV de Tesseract -> dict de colonnes (format pytesseract.Output.DICT)"""
+    data = {column: [] for column in DATA_COLUMNS}
+    for line in tsv.splitlines():
+        fields = line.split('\t')
+        if len(fields) < len(DATA_COLUMNS) - 1:
+            continue
+        if len(fields) == len(DATA_COLUMNS) - 1:
+            fields.append('')
+        for column, value in zip(DATA_COLUMNS, fields):
+            if column == 'text':
+                data[column].append(value)
+            elif column == 'conf':
+                data[column].append(float(value))
+            else:
+                data[column].append(int(value))
+    return data
+
+
+class TesseractEngine:
+    """OCR via un pool d'instances tesserocr, ou pytesseract en repli"""
+
+    def __init__(self, backend=None):
+        if backend is None:
+            backend = 'tesserocr' if TESSEROCR_AVAILABLE else 'pytesseract'
+        if backend == 'tesserocr' and not TESSEROCR_AVAILABLE:
+            raise RuntimeError("tesserocr n'est pas installé (pip install tesserocr)")
+        if backend == 'pytesseract' and pytesseract is None:
+            raise RuntimeError("pytesseract n'est pas installé (pip install pytesseract)")
+        self.backend = backend
+        self.calls = 0
+        self._pools = {}
+        self._apis = []
+        self._lock = threading.Lock()
+
+    def version(self):
+        """Version de Tesseract (sert aussi de clé au cache OCR)"""
+        try:
+            if self.backend == 'tesserocr':
+                return tesserocr.tesseract_version().split()[1]
+            return str(pytesseract.get_tesseract_version())
+        except Exception:
+            return 'unavailable'
+
+    def _acquire(self, lang, oem, variables):
+        """Emprunter une instance initialisée pour (langue, oem, variables)"""
+        key = (lang, oem, tuple(sorted(variables.items())))
+        with self._lock:
+            pool = self._pools.setdefault(key, queue.SimpleQueue())
+        try:
+            return key, pool.get_nowait()
+        except queue.Empty:
+            kwargs = {'lang': lang, 'variables': variables}
+            if oem is not None:
+                kwargs['oem'] = tesserocr.OEM(oem)
+            api = tesserocr.PyTessBaseAPI(**kwargs)
+            with self._lock:
+                self._apis.append(api)
+            return key, api
+
+    def _recognize(self, image, config, with_data):
+        """Reconnaissance avec une instance du pool, retourne (texte, tsv)"""
+        lang, oem, psm, variables = parse_config(config)
+        array = to_array(image)
+        height, width = array.shape[:2]
+        channels = 1 if array.ndim == 2 else array.shape[2]
+
+        key, api = self._acquire(lang, oem, variables)
+        try:
+            api.SetPageSegMode(tesserocr.PSM(psm))
+            api.SetImageBytes(array.tobytes(), width, height, channels, width * channels)
+            text = api.GetUTF8Text()
+            tsv = api.GetTSVText(0) if with_data else None
+            api.Clear()
+        finally:
+            self._pools[key].put(api)
+        return text, tsv
+
+    def image_to_string(self, image, config=''):
+        """Texte reconnu (même contrat que pytesseract.image_to_string)"""
+        with self._lock:
+            self.calls += 1
+        if self.backend == 'pytesseract':
+            return pytesseract.image_to_string(image, config=config)
+        return self._recognize(image, config, with_data=False)[0]
+
+    def image_to_text_and_data(self, image, config=''):
+        """Texte + boîtes en une seule reconnaissance, retourne (texte, data)"""
+        with self._lock:
+            self.calls += 1
+        if self.backend == 'pytesseract':
+            text = pytesseract.image_to_string(image, config=config)
+            data = pytesseract.image_to_data(image, config=config,
+                                             output_type=pytesseract.Output.DICT)
+            return text, data
+        text, tsv = self._recognize(image, config, with_data=True)
+        return text, parse_tsv(tsv)
+
+    def close(self):
+        """Libérer les instances tesserocr"""
+        with self._lock:
+            for api in self._apis:
+                api.End()
+            self._apis = []
+            self._pools = {}
+
+
+_shared_engine = None
+_shared_lock = threading.Lock()
+
+
+def get_tesseract_engine(**kwargs):
+    """Instance partagée du moteur (créée au premier appel)"""
+    global _shared_engine
+    with _shared_lock:
+        if _shared_engine is None:
+            _shared_engine = TesseractEngine(**kwargs)
+        return _shared_engine
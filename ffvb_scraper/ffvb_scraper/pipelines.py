@@ -2,11 +2,14 @@
 import csv
 import json
 import sqlite3
+import time
 from datetime import datetime
 from itemadapter import ItemAdapter
-from scrapy.exceptions import DropItem
+from scrapy.exceptions import DropItem, NotConfigured
 import logging
 
+from ffvb_scraper import columnar
+
 class ValidationPipeline:
     """Pipeline de validation des données"""
     
@@ -159,57 +162,173 @@ class CSVExportPipeline:
         return item
 
 class JSONExportPipeline:
-    """Pipeline d'export JSON"""
+    """Pipeline d'export JSON en streaming
+    
+    Chaque item est écrit dès son arrivée dans un fichier JSON Lines par type
+    (joueurs, équipes, staff) : la mémoire reste constante et les données déjà
+    extraites sont sur disque même si le crawl s'interrompt. À la fermeture,
+    ffvb_data_complete.json est assemblé ligne par ligne depuis ces fichiers
+    et complété par le bloc metadata.
+    """
+    
+    OUTPUT_FILE = 'ffvb_data_complete.json'
+    PART_FILES = {
+        'joueurs': 'ffvb_joueurs.jsonl',
+        'equipes': 'ffvb_equipes.jsonl',
+        'staff': 'ffvb_staff.jsonl',
+    }
     
     def open_spider(self, spider):
-        self.all_items = []
+        # Fichiers bufferisés par ligne : chaque item atteint le disque
+        self.files = {
+            key: open(path, 'w', encoding='utf-8', buffering=1)
+            for key, path in self.PART_FILES.items()
+        }
+        self.counts = {key: 0 for key in self.PART_FILES}
+        self.total_items = 0
     
     def close_spider(self, spider):
-        # Organiser les données par type
-        data = {
-            'joueurs': [],
-            'equipes': [],
-            'staff': [],
-            'metadata': {
-                'date_extraction': datetime.now().isoformat(),
-                'spider': spider.name,
-                'total_items': len(self.all_items)
-            }
+        for f in self.files.values():
+            f.close()
+        
+        metadata = {
+            'date_extraction': datetime.now().isoformat(),
+            'spider': spider.name,
+            'total_items': self.total_items,
+            'counts': self.counts,
         }
         
-        for item in self.all_items:
-            adapter = ItemAdapter(item)
-            
-            if adapter.get('nom_complet') or (adapter.get('nom') and adapter.get('prenom')):
-                data['joueurs'].append(dict(adapter))
-            elif adapter.get('nom_equipe'):
-                data['equipes'].append(dict(adapter))
-            elif adapter.get('fonction'):
-                data['staff'].append(dict(adapter))
+        # Assembler le JSON final sans recharger les items en mémoire
+        with open(self.OUTPUT_FILE, 'w', encoding='utf-8') as out:
+            out.write('{\n')
+            for key, path in self.PART_FILES.items():
+                out.write(f'  "{key}": [')
+                with open(path, 'r', encoding='utf-8') as part:
+                    for i, line in enumerate(part):
+                        out.write(',\n    ' if i else '\n    ')
+                        out.write(line.rstrip('\n'))
+                if self.counts[key]:
+                    out.write('\n  ')
+                out.write('],\n')
+            metadata_json = json.dumps(metadata, ensure_ascii=False, indent=2)
+            out.write('  "metadata": ' + metadata_json.replace('\n', '\n  ') + '\n}\n')
         
-        # Sauvegarder en JSON
-        with open('ffvb_data_complete.json', 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        spider.logger.info(f"📄 Fichier JSON créé: {self.OUTPUT_FILE}")
+    
+    def process_item(self, item, spider):
+        adapter = ItemAdapter(item)
+        self.total_items += 1
         
-        spider.logger.info(f"📄 Fichier JSON créé: ffvb_data_complete.json")
+        if adapter.get('nom_complet') or (adapter.get('nom') and adapter.get('prenom')):
+            key = 'joueurs'
+        elif adapter.get('nom_equipe'):
+            key = 'equipes'
+        elif adapter.get('fonction'):
+            key = 'staff'
+        else:
+            return item
+        
+        self.files[key].write(json.dumps(dict(adapter), ensure_ascii=False, default=str) + '\n')
+        self.counts[key] += 1
+        return item
+
+class ColumnarExportPipeline:
+    """Pipeline d'export colonnaire (Parquet ou Arrow IPC) des joueurs
+    
+    Les joueurs sont écrits par lots dans ffvb_players.<columnar_format> avec
+    des colonnes typées (numéro, taille, poids, âge en entiers, date de
+    naissance en date) pour les scripts d'analyse. Désactivé si pyarrow
+    n'est pas installé.
+    """
+    
+    def __init__(self, config=None):
+        config = config or {}
+        self.path = f"ffvb_players.{config.get('columnar_format', 'parquet')}"
+        self.batch_size = config.get('columnar_batch_size', 500)
+    
+    @classmethod
+    def from_crawler(cls, crawler):
+        if not columnar.PYARROW_AVAILABLE:
+            raise NotConfigured("pyarrow non installé - export colonnaire désactivé")
+        return cls(crawler.settings.getdict('DATA_EXPORT_CONFIG'))
+    
+    def open_spider(self, spider):
+        self.writer = columnar.ColumnarWriter(self.path, columnar.PLAYER_ITEM_COLUMNS, self.batch_size)
+    
+    def close_spider(self, spider):
+        self.writer.close()
+        spider.logger.info(f"🧱 Fichier colonnaire créé: {self.path} ({self.writer.rows_written} joueurs)")
     
     def process_item(self, item, spider):
-        self.all_items.append(item)
+        adapter = ItemAdapter(item)
+        if adapter.get('nom_complet') or (adapter.get('nom') and adapter.get('prenom')):
+            self.writer.write(adapter)
         return item
 
 class DatabasePipeline:
-    """Pipeline de sauvegarde en base de données SQLite"""
+    """Pipeline de sauvegarde en base de données SQLite
+    
+    Les lignes sont mises en tampon par table puis écrites par lots
+    (executemany dans une seule transaction) quand le tampon atteint
+    `sqlite_batch_size` lignes, après `sqlite_flush_interval` secondes,
+    et à la fermeture du spider. Le délai n'est vérifié qu'à l'arrivée
+    d'un item : un crawl inactif garde ses lignes jusqu'à close_spider.
+    """
+    
+    TABLES = {
+        'joueurs': {
+            'columns': [
+                'nom', 'prenom', 'nom_complet', 'numero_maillot', 'poste', 'taille', 'poids',
+                'age', 'date_naissance', 'club_actuel', 'pays_club', 'selections', 'equipe',
+                'categorie', 'nationalite', 'lieu_naissance', 'formation', 'photo_url', 'url_source'
+            ],
+            'keys': ['nom_complet', 'equipe'],
+        },
+        'equipes': {
+            'columns': [
+                'nom_equipe', 'categorie', 'entraineur', 'staff_technique', 'nombre_joueurs', 'url_source'
+            ],
+            'keys': ['nom_equipe', 'categorie'],
+        },
+        'staff': {
+            'columns': ['nom', 'prenom', 'fonction', 'equipe', 'url_source'],
+            'keys': ['nom', 'prenom', 'fonction', 'equipe'],
+        },
+    }
+    
+    def __init__(self, config=None):
+        config = config or {}
+        self.db_path = config.get('sqlite_path', 'ffvb_database.db')
+        self.timeout = config.get('sqlite_timeout', 30)
+        self.journal_mode = config.get('sqlite_journal_mode', 'WAL')
+        self.synchronous = config.get('sqlite_synchronous', 'NORMAL')
+        self.batch_size = config.get('sqlite_batch_size', 100)
+        self.flush_interval = config.get('sqlite_flush_interval', 5.0)
+    
+    @classmethod
+    def from_crawler(cls, crawler):
+        return cls(crawler.settings.getdict('DATA_EXPORT_CONFIG'))
     
     def open_spider(self, spider):
-        self.connection = sqlite3.connect('ffvb_database.db')
+        self.connection = sqlite3.connect(self.db_path, timeout=self.timeout)
         self.cursor = self.connection.cursor()
+        self.logger = spider.logger
+        self.cursor.execute(f"PRAGMA journal_mode = {self.journal_mode}")
+        self.cursor.execute(f"PRAGMA synchronous = {self.synchronous}")
+        
+        self.buffers = {table: [] for table in self.TABLES}
+        self.buffered_rows = 0
+        self.last_flush = time.monotonic()
+        self.rows_written = 0
         
         # Créer les tables
         self.create_tables()
+        self.create_unique_indexes(spider)
     
     def close_spider(self, spider):
+        self.flush()
         self.connection.close()
-        spider.logger.info(f"🗄️  Base de données créée: ffvb_database.db")
+        spider.logger.info(f"🗄️  Base de données créée: {self.db_path} ({self.rows_written} lignes écrites)")
     
     def create_tables(self):
         """Créer les tables de la base de données"""
@@ -270,69 +389,114 @@ class DatabasePipeline:
         
         self.connection.commit()
     
+    def create_unique_indexes(self, spider):
+        """Index uniques sur les clés naturelles (re-run = upsert)
+        
+        Migration unique : les doublons hérités des anciens runs ne sont
+        supprimés (en gardant le plus récent) que lors de la création de
+        l'index, jamais aux lancements suivants.
+        """
+        for table in self.TABLES:
+            index_name = f"idx_{table}_natural_key"
+            exists = self.cursor.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = ?", (index_name,)
+            ).fetchone()
+            if exists:
+                continue
+            
+            key_exprs = self._key_expressions(table)
+            with self.connection:
+                removed = self.cursor.execute(f'''
+                    DELETE FROM {table} WHERE id NOT IN (
+                        SELECT MAX(id) FROM {table} GROUP BY {key_exprs}
+                    )
+                ''').rowcount
+                self.cursor.execute(f'''
+                    CREATE UNIQUE INDEX {index_name} ON {table} ({key_exprs})
+                ''')
+            if removed:
+                spider.logger.warning(
+                    f"🧹 Migration {index_name}: {removed} doublon(s) supprimé(s) de {table}"
+                )
+            else:
+                spider.logger.info(f"🔑 Index unique créé: {index_name}")
+    
+    def _key_expressions(self, table):
+        # COALESCE car SQLite considère les NULL comme tous distincts
+        return ', '.join(f"COALESCE({col}, '')" for col in self.TABLES[table]['keys'])
+    
+    def _upsert_sql(self, table):
+        spec = self.TABLES[table]
+        columns = spec['columns']
+        updates = ', '.join(
+            f"{col} = excluded.{col}" for col in columns if col not in spec['keys']
+        )
+        return f'''
+            INSERT INTO {table} ({', '.join(columns)})
+            VALUES ({', '.join('?' for _ in columns)})
+            ON CONFLICT ({self._key_expressions(table)}) DO UPDATE SET
+                {updates}, date_scraping = CURRENT_TIMESTAMP
+        '''
+    
     def process_item(self, item, spider):
         adapter = ItemAdapter(item)
         
         if adapter.get('nom_complet') or (adapter.get('nom') and adapter.get('prenom')):
-            # Insérer joueur
-            self.cursor.execute('''
-                INSERT INTO joueurs (
-                    nom, prenom, nom_complet, numero_maillot, poste, taille, poids,
-                    age, date_naissance, club_actuel, pays_club, selections, equipe,
-                    categorie, nationalite, lieu_naissance, formation, photo_url, url_source
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                adapter.get('nom'),
-                adapter.get('prenom'),
-                adapter.get('nom_complet'),
-                adapter.get('numero_maillot'),
-                adapter.get('poste'),
-                adapter.get('taille'),
-                adapter.get('poids'),
-                adapter.get('age'),
-                adapter.get('date_naissance'),
-                adapter.get('club_actuel'),
-                adapter.get('pays_club'),
-                adapter.get('selections'),
-                adapter.get('equipe'),
-                adapter.get('categorie'),
-                adapter.get('nationalite'),
-                adapter.get('lieu_naissance'),
-                adapter.get('formation'),
-                adapter.get('photo_url'),
-                adapter.get('url_source')
-            ))
-            
+            table = 'joueurs'
         elif adapter.get('nom_equipe'):
-            # Insérer équipe
-            self.cursor.execute('''
-                INSERT INTO equipes (
-                    nom_equipe, categorie, entraineur, staff_technique, nombre_joueurs, url_source
-                ) VALUES (?, ?, ?, ?, ?, ?)
-            ''', (
-                adapter.get('nom_equipe'),
-                adapter.get('categorie'),
-                adapter.get('entraineur'),
-                adapter.get('staff_technique'),
-                adapter.get('nombre_joueurs'),
-                adapter.get('url_source')
-            ))
-            
+            table = 'equipes'
         elif adapter.get('fonction'):
-            # Insérer staff
-            self.cursor.execute('''
-                INSERT INTO staff (nom, prenom, fonction, equipe, url_source)
-                VALUES (?, ?, ?, ?, ?)
-            ''', (
-                adapter.get('nom'),
-                adapter.get('prenom'),
-                adapter.get('fonction'),
-                adapter.get('equipe'),
-                adapter.get('url_source')
-            ))
+            table = 'staff'
+        else:
+            return item
+        
+        self.buffers[table].append(
+            tuple(adapter.get(col) for col in self.TABLES[table]['columns'])
+        )
+        self.buffered_rows += 1
+        
+        if (self.buffered_rows >= self.batch_size
+                or time.monotonic() - self.last_flush >= self.flush_interval):
+            self.flush()
         
-        self.connection.commit()
         return item
+    
+    def flush(self):
+        """Écrire les lignes en attente dans une seule transaction
+        
+        Les tampons ne sont vidés qu'après le commit. Si la transaction est
+        annulée, les lignes sont réécrites une à une et celles qui échouent
+        encore sont journalisées puis abandonnées.
+        """
+        if self.buffered_rows:
+            try:
+                with self.connection:
+                    for table, rows in self.buffers.items():
+                        if rows:
+                            self.connection.executemany(self._upsert_sql(table), rows)
+                written = self.buffered_rows
+            except sqlite3.Error as e:
+                self.logger.warning(f"⚠️ Lot SQLite annulé ({e}), écriture ligne par ligne")
+                written = self._write_rows_one_by_one()
+            for rows in self.buffers.values():
+                rows.clear()
+            self.rows_written += written
+            self.buffered_rows = 0
+        self.last_flush = time.monotonic()
+    
+    def _write_rows_one_by_one(self):
+        """Écrire chaque ligne dans sa propre transaction, retourne le nombre écrit"""
+        written = 0
+        for table, rows in self.buffers.items():
+            sql = self._upsert_sql(table)
+            for row in rows:
+                try:
+                    with self.connection:
+                        self.connection.execute(sql, row)
+                    written += 1
+                except sqlite3.Error as e:
+                    self.logger.error(f"❌ Ligne {table} abandonnée ({e}): {row}")
+        return written
 
 class DuplicateFilterPipeline:
     """Pipeline pour filtrer les doublons"""
@@ -41,11 +41,12 @@ DOWNLOADER_MIDDLEWARES = {
     'ffvb_scraper.middlewares.RotateUserAgentMiddleware': 400,
     'ffvb_scraper.middlewares.HeadersMiddleware': 500,
     'ffvb_scraper.middlewares.CustomRetryMiddleware': 550,
-    'ffvb_scraper.middlewares.ThrottleMiddleware': 600,
     'ffvb_scraper.middlewares.LoggingMiddleware': 650,
     'ffvb_scraper.middlewares.ResponseSizeMiddleware': 700,
     'ffvb_scraper.middlewares.ErrorHandlingMiddleware': 750,
     'ffvb_scraper.middlewares.CacheMiddleware': 800,
+    # Après les caches : les réponses en cache ne consomment pas de jeton
+    'ffvb_scraper.middlewares.ThrottleMiddleware': 950,
 }
 
 # Configuration des spider middlewares
@@ -58,17 +59,35 @@ ITEM_PIPELINES = {
     'ffvb_scraper.pipelines.ValidationPipeline': 200,
     'ffvb_scraper.pipelines.DuplicateFilterPipeline': 300,
     'ffvb_scraper.pipelines.CSVExportPipeline': 400,
+    'ffvb_scraper.pipelines.ColumnarExportPipeline': 450,  # ignoré sans pyarrow
     'ffvb_scraper.pipelines.JSONExportPipeline': 500,
     'ffvb_scraper.pipelines.DatabasePipeline': 600,
     'ffvb_scraper.pipelines.StatisticsPipeline': 700,
 }
 
+# Limiteur de débit par domaine (ThrottleMiddleware)
+# Une requête toutes les THROTTLE_DEFAULT_DELAY secondes (ou `custom_delay` du
+# spider), plafonné par SECURITY_CONFIG['request_rate_limit'] (requêtes/minute),
+# appliqué au slot de téléchargement de chaque domaine
+THROTTLE_DEFAULT_DELAY = 2.0  # 0 = pas de délai
+THROTTLE_MAX_CONCURRENCY = CONCURRENT_REQUESTS_PER_DOMAIN
+
+# Servir d'abord les domaines ayant le moins de requêtes au downloader :
+# un domaine lent n'accapare pas CONCURRENT_REQUESTS
+SCHEDULER_PRIORITY_QUEUE = 'scrapy.pqueues.DownloaderAwarePriorityQueue'
+
 # Configuration des retry
 RETRY_TIMES = 3
 RETRY_HTTP_CODES = [500, 502, 503, 504, 408, 429, 400, 403]
 RETRY_BACKOFF_BASE = 2.0
 RETRY_BACKOFF_MAX = 60.0
 
+# Cache de réponses persistant et borné (CacheMiddleware)
+RESPONSE_CACHE_ENABLED = False
+RESPONSE_CACHE_PATH = 'response_cache.db'  # relatif au dossier .scrapy du projet
+RESPONSE_CACHE_MAX_MB = 256  # budget disque, éviction LRU au-delà
+RESPONSE_CACHE_MAX_AGE = 3600  # secondes avant revalidation ETag/Last-Modified
+
 # Configuration du cache (pour développement)
 # HTTPCACHE_ENABLED = True
 # HTTPCACHE_EXPIRATION_SECS = 3600
@@ -179,10 +198,10 @@ if DEVELOPMENT_MODE:
     LOG_LEVEL = 'DEBUG'
     DOWNLOAD_DELAY = 1
     RANDOMIZE_DOWNLOAD_DELAY = 0.2
-    # Cache activé pour développement plus rapide
-    HTTPCACHE_ENABLED = True
-    HTTPCACHE_EXPIRATION_SECS = 0  # Pas d'expiration en dev
-    HTTPCACHE_DIR = 'httpcache'
+    # Cache activé pour développement plus rapide (CacheMiddleware,
+    # qui remplace le HTTPCACHE intégré de Scrapy)
+    RESPONSE_CACHE_ENABLED = True
+    HTTPCACHE_ENABLED = False
 
 # Configuration spécifique aux items
 ITEM_PROCESSORS = {
@@ -224,7 +243,14 @@ DATA_EXPORT_CONFIG = {
     'csv_quotechar': '"',
     'json_indent': 2,
     'json_ensure_ascii': False,
+    'sqlite_path': 'ffvb_database.db',
     'sqlite_timeout': 30,
+    'sqlite_journal_mode': 'WAL',
+    'sqlite_synchronous': 'NORMAL',  # FULL pour une durabilité maximale
+    'sqlite_batch_size': 100,  # lignes par transaction
+    'sqlite_flush_interval': 5.0,  # secondes max entre deux écritures
+    'columnar_format': 'parquet',  # ou 'arrow' (IPC, lecture sans copie)
+    'columnar_batch_size': 500,  # lignes par row group / record batch
     'export_photos': True,
     'photos_directory': 'photos/',
     'max_file_size_mb': 100,
@@ -1,10 +1,35 @@
 # spiders/ffvb_advanced_player_scraper.py
 import scrapy
+import copy
 import csv
 import json
 import re
 from urllib.parse import urljoin, unquote
 from datetime import datetime
+from w3lib.url import canonicalize_url
+
+from ffvb_scraper import columnar
+
+class PlayerPageFrontier:
+    """Frontière des pages joueurs : dédupliquée et bornée par un budget"""
+    
+    def __init__(self, max_pages):
+        self.max_pages = max_pages
+        self.seen = set()
+        self.empty_pages = set()
+        self.grid_seeded = False
+    
+    def admit(self, url):
+        """Retourne True si l'URL est nouvelle et que le budget le permet"""
+        key = canonicalize_url(url)
+        if key in self.seen or len(self.seen) >= self.max_pages:
+            return False
+        self.seen.add(key)
+        return True
+    
+    def mark_empty(self, url):
+        """Mémorise une page sondée qui ne contenait aucun joueur"""
+        self.empty_pages.add(canonicalize_url(url))
 
 class FFVBAdvancedPlayerSpider(scrapy.Spider):
     name = 'ffvb_advanced_players'
@@ -15,7 +40,18 @@ class FFVBAdvancedPlayerSpider(scrapy.Spider):
         'http://www.ffvb.org/index.php?lvlid=384&dsgtypid=37&artid=1217&pos=0',
     ]
     
-    def __init__(self):
+    # Les liens réels (.navPart) passent avant les URLs devinées
+    NAV_PRIORITY = 10
+    GUESS_PRIORITY = 0
+    
+    def __init__(self, max_pages=150, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        
+        # Frontière des pages joueurs (budget total de pages)
+        self.frontier = PlayerPageFrontier(int(max_pages))
+        for url in self.start_urls:
+            self.frontier.admit(url)
+        
         # Fichier CSV détaillé
         self.csv_file = open('ffvb_players_complete.csv', 'w', newline='', encoding='utf-8')
         self.csv_writer = csv.writer(self.csv_file)
@@ -38,7 +74,16 @@ class FFVBAdvancedPlayerSpider(scrapy.Spider):
         with open('ffvb_players_complete.json', 'w', encoding='utf-8') as f:
             json.dump(self.players_data, f, ensure_ascii=False, indent=2)
         
+        # Version colonnaire typée pour les scripts d'analyse
+        if columnar.PYARROW_AVAILABLE:
+            columnar.write_rows(self.players_data, 'ffvb_players_complete.parquet',
+                                columnar.PLAYER_COMPLETE_COLUMNS)
+        
         self.logger.info(f'🎉 Extraction complète terminée! {self.players_found} joueurs avec stats détaillées')
+        self.logger.info(
+            f'🧭 Pages sondées: {len(self.frontier.seen)}/{self.frontier.max_pages} '
+            f'(dont {len(self.frontier.empty_pages)} sans joueur)'
+        )
 
     def parse(self, response):
         """Parse la page principale et trouve tous les joueurs"""
@@ -48,14 +93,25 @@ class FFVBAdvancedPlayerSpider(scrapy.Spider):
         players = self.extract_players_from_page(response)
         
         # 2. Pour chaque joueur trouvé, scraper ses données complètes
+        #    (infos communes à la page analysées une seule fois)
+        page_details = self.extract_page_details(response) if players else None
         for player in players:
-            yield self.scrape_player_complete_data(response, player)
-        
-        # 3. Naviguer vers les autres pages de joueurs
-        navigation_links = self.find_all_player_pages(response)
+            yield from self.scrape_player_complete_data(response, player, page_details)
         
-        for link in navigation_links:
-            yield response.follow(link, self.parse_player_page)
+        # 3. Naviguer vers les autres pages de joueurs : liens réels d'abord,
+        #    puis la grille d'URLs devinées (générée une seule fois)
+        yield from self.follow_player_pages(
+            response, self.find_navigation_links(response), self.NAV_PRIORITY
+        )
+        yield from self.follow_player_pages(
+            response, self.find_all_player_pages(response), self.GUESS_PRIORITY
+        )
+
+    def follow_player_pages(self, response, links, priority):
+        """Planifie les pages joueurs encore inconnues de la frontière"""
+        for link in links:
+            if self.frontier.admit(urljoin(response.url, link)):
+                yield response.follow(link, self.parse_player_page, priority=priority)
 
     def extract_players_from_page(self, response):
         """Extrait les joueurs basiques de la page actuelle"""
@@ -87,14 +143,15 @@ class FFVBAdvancedPlayerSpider(scrapy.Spider):
         
         return players
 
-    def scrape_player_complete_data(self, response, player_basic):
-        """Lance le scraping complet des données d'un joueur"""
-        return scrapy.Request(
-            url=response.url,
-            callback=self.parse_player_detailed,
-            meta={'player_basic': player_basic},
-            dont_filter=True
-        )
+    def scrape_player_complete_data(self, response, player_basic, page_details=None):
+        """Extrait les données complètes d'un joueur depuis la page déjà téléchargée"""
+        return self.parse_player_detailed(response, player_basic, page_details)
+
+    def extract_page_details(self, response):
+        """Extrait les informations communes à tous les joueurs d'une page"""
+        details = self.extract_info_from_cv_context(response)
+        details.update(self.extract_info_from_page_content(response))
+        return details
 
     def parse_player_page(self, response):
         """Parse une page individuelle de joueur"""
@@ -103,17 +160,24 @@ class FFVBAdvancedPlayerSpider(scrapy.Spider):
         # Extraire les joueurs de cette page
         players = self.extract_players_from_page(response)
         
+        if not players:
+            self.frontier.mark_empty(response.url)
+        
+        page_details = self.extract_page_details(response) if players else None
         for player in players:
-            yield self.scrape_player_complete_data(response, player)
+            yield from self.scrape_player_complete_data(response, player, page_details)
         
-        # Continuer la navigation
-        nav_links = self.find_navigation_links(response)
-        for link in nav_links[:3]:  # Limiter pour éviter boucles infinies
-            yield response.follow(link, self.parse_player_page)
+        # Continuer la navigation (la frontière évite les boucles)
+        yield from self.follow_player_pages(
+            response, self.find_navigation_links(response), self.NAV_PRIORITY
+        )
 
-    def parse_player_detailed(self, response):
+    def parse_player_detailed(self, response, player_basic=None, page_details=None):
         """Parse les données détaillées d'un joueur"""
-        player_basic = response.meta['player_basic']
+        if player_basic is None:
+            player_basic = response.meta['player_basic']
+        if page_details is None:
+            page_details = self.extract_page_details(response)
         self.logger.info(f'📊 Extraction données complètes: {player_basic["nom_joueur"]}')
         
         # Initialiser les données complètes
@@ -142,13 +206,9 @@ class FFVBAdvancedPlayerSpider(scrapy.Spider):
             'urls_stats': []
         })
         
-        # 1. Extraire informations depuis l'image CV si possible
-        cv_info = self.extract_info_from_cv_context(response)
-        player_complete.update(cv_info)
-        
-        # 2. Extraire informations depuis le contenu de la page
-        page_info = self.extract_info_from_page_content(response)
-        player_complete.update(page_info)
+        # 1-2. Informations du contexte CV et du contenu de la page
+        #      (copie : les listes ne doivent pas être partagées entre joueurs)
+        player_complete.update(copy.deepcopy(page_details))
         
         # 3. Chercher des liens vers des pages de statistiques
         stats_links = self.find_stats_links(response, player_complete['nom_joueur'])
@@ -403,21 +463,19 @@ class FFVBAdvancedPlayerSpider(scrapy.Spider):
         return stats
 
     def find_all_player_pages(self, response):
-        """Trouve toutes les pages de joueurs possibles"""
-        player_links = []
+        """Génère une seule fois la grille des pages joueurs possibles"""
+        if self.frontier.grid_seeded:
+            return []
+        self.frontier.grid_seeded = True
         
-        # 1. Liens de navigation détectés
-        nav_links = self.find_navigation_links(response)
-        player_links.extend(nav_links)
+        player_links = []
         
-        # 2. Construction d'URLs basée sur pattern
+        # Construction d'URLs basée sur pattern
         base_pattern = 'http://www.ffvb.org/index.php?lvlid=384&dsgtypid=37&artid='
         
         for artid in range(1217, 1240):  # Plage étendue
             for pos in range(0, 5):
-                test_url = f'{base_pattern}{artid}&pos={pos}'
-                if test_url != response.url:
-                    player_links.append(test_url)
+                player_links.append(f'{base_pattern}{artid}&pos={pos}')
         
         return player_links
 
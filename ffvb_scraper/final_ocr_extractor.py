@@ -7,27 +7,131 @@ Version améliorée avec meilleurs patterns et préprocessing
 import csv
 import json
 import os
-import requests
 import re
-import time
-import cv2
-import numpy as np
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
-from io import BytesIO
 
 # Configuration OCR validée
 import pytesseract
-from PIL import Image, ImageEnhance, ImageFilter
+
+from ffvb_scraper.cv_layout import CVLayout
+from ffvb_scraper.field_parser import FieldParser
+from ffvb_scraper.image_fetcher import get_image_fetcher, load_image
+from ffvb_scraper.image_preprocessing import build_variants, format_timings
+from ffvb_scraper.ocr_cache import get_ocr_cache
 
 # Configuration Tesseract
 pytesseract.pytesseract.tesseract_cmd = r"C:\Program Files\Tesseract-OCR\tesseract.exe"
 
+# Un seul thread OpenMP par processus tesseract : le parallélisme vient du pool
+os.environ.setdefault('OMP_THREAD_LIMIT', '1')
+
+# Versions produites par create_preprocessed_versions, dans l'ordre par défaut
+PREPROCESSING_NAMES = ['original', 'contrast', 'sharp', 'grayscale', 'opencv', 'binary']
+
+# À incrémenter quand create_preprocessed_versions change : invalide le cache OCR
+PREPROCESSING_VERSION = 2
+
+# Fiches OCRées en entier pour apprendre le gabarit CV quand cv_layout.json manque
+LAYOUT_SAMPLES = 5
+LAYOUT_CONFIG = '--psm 3 -l eng'
+
+# Combinaisons OCR lancées par vague, quel que soit le nombre de cœurs
+OCR_WAVE_SIZE = 4
+# Combinaisons sans historique essayées dans la première vague de chaque joueur
+OCR_EXPLORATION_BUDGET = 1
+
+# Nettoyage du texte OCR (clean_ocr_text)
+WHITESPACE_RE = re.compile(r'\s+')
+NOISE_CHARS_RE = re.compile(r'[^\w\s/\.-:°#]')
+
+# Patterns d'extraction perfectionnés
+# (pattern, mots-clés) : le pattern n'est évalué que si l'un des mots-clés
+# figure dans le texte (casse ignorée) ; un pattern seul est toujours évalué.
+FIELD_PATTERNS = {
+    'poste': [
+        # Patterns français directs
+        (r'(?:^|\s)(ATTAQUANT|ATTACKANT)(?:\s|$)', ('attaquant', 'attackant')),
+        (r'(?:^|\s)(PASSEUR)(?:\s|$)', ('passeur',)),
+        (r'(?:^|\s)(CENTRAL|CENTRAUX)(?:\s|$)', ('central', 'centraux')),
+        (r'(?:^|\s)(LIBÉRO|LIBERO)(?:\s|$)', ('libéro', 'libero')),
+        (r'(?:^|\s)(RÉCEPTIONNEUR|RECEPTIONNEUR)(?:\s|$)', ('réceptionneur', 'receptionneur')),
+        (r'(?:^|\s)(POINTU|OPPOSITE)(?:\s|$)', ('pointu', 'opposite')),
+        # Patterns contextuels
+        (r'poste[\s:]*([A-Za-z\s]{3,20})', ('poste',)),
+        (r'position[\s:]*([A-Za-z\s]{3,20})', ('position',)),
+        # Patterns anglais
+        (r'(?:^|\s)(SPIKER|ATTACKER)(?:\s|$)', ('spiker', 'attacker')),
+        (r'(?:^|\s)(SETTER)(?:\s|$)', ('setter',)),
+        (r'(?:^|\s)(MIDDLE)(?:\s|$)', ('middle',)),
+        (r'(?:^|\s)(OUTSIDE)(?:\s|$)', ('outside',))
+    ],
+    'taille': [
+        # Patterns précis pour la taille
+        (r'(?:taille|height)[\s:]*(\d{3})(?:\s*cm)?', ('taille', 'height')),
+        (r'(\d{3})\s*cm(?:\s|$)', ('cm',)),
+        (r'(\d\.\d{2})\s*m(?:\s|$)', ('m',)),
+        (r'(\d{1,3})\s*centimètres?', ('centimètre',)),
+        # Pattern contextuel - recherche 3 chiffres entre 170-220
+        r'(?:^|\s)(1[7-9]\d|2[0-1]\d)(?:\s|$)',
+        # Dans un contexte de mensurations
+        (r'(?:mensurations?|physique)[\s\S]{0,50}(\d{3})', ('mensuration', 'physique'))
+    ],
+    'poids': [
+        # Patterns précis pour le poids
+        (r'(?:poids|weight|masse)[\s:]*(\d{2,3})(?:\s*kg)?', ('poids', 'weight', 'masse')),
+        (r'(\d{2,3})\s*kg(?:\s|$)', ('kg',)),
+        (r'(\d{2,3})\s*kilos?(?:\s|$)', ('kilo',)),
+        # Pattern contextuel - recherche 2-3 chiffres entre 60-130
+        r'(?:^|\s)([6-9]\d|1[0-2]\d|130)(?:\s*kg|\s|$)'
+    ],
+    'naissance': [
+        # Formats de date variés
+        (r'(?:naissance|né|birth|born)[\s:]*(\d{1,2}[/\.-]\d{1,2}[/\.-]\d{4})',
+         ('naissance', 'né', 'birth', 'born')),
+        r'(\d{1,2}[/\.-]\d{1,2}[/\.-]\d{4})',
+        r'(\d{4}[/\.-]\d{1,2}[/\.-]\d{1,2})',
+        # Format texte
+        r'(\d{1,2}\s+\w+\s+\d{4})'
+    ],
+    'club': [
+        # Patterns pour clubs français courants
+        (r'(?:club|équipe|team)[\s:]*([A-Z][A-Za-z\s]{2,30})', ('club', 'équipe', 'team')),
+        # Clubs spécifiques connus
+        (r'(PARIS VOLLEY|MONTPELLIER|TOURS|POITIERS|NANTES|CHAUMONT|CANNES|AJACCIO)',
+         ('paris volley', 'montpellier', 'tours', 'poitiers', 'nantes', 'chaumont',
+          'cannes', 'ajaccio')),
+        (r'(CUCINE LUBE|PERUGIA|MODENA|MILANO|RAVENNA|CIVITANOVA)',
+         ('cucine lube', 'perugia', 'modena', 'milano', 'ravenna', 'civitanova')),
+        (r'(ZAKSA|RESOVIA|BERLIN|FRIEDRICHSHAFEN|KAZAN)',
+         ('zaksa', 'resovia', 'berlin', 'friedrichshafen', 'kazan')),
+        # Pattern général clubs
+        (r'(?:^|\s)([A-Z]{2,}(?:\s+[A-Z]{2,})*\s+(?:VOLLEY|VOLLEYBALL|VB))(?:\s|$)',
+         ('volley', 'vb')),
+        (r'(?:^|\s)(AS|AC|US|USC|VB|VOLLEY)\s+([A-Z][A-Za-z\s]{2,20})(?:\s|$)',
+         ('as', 'ac', 'us', 'vb', 'volley'))
+    ],
+    'selections': [
+        (r'(?:sélections?|selections?|caps?)[\s:]*(\d+)', ('sélection', 'selection', 'cap')),
+        (r'(\d+)\s*sélections?(?:\s|$)', ('sélection',)),
+        (r'(\d+)\s*caps?(?:\s|$)', ('cap',)),
+        (r'équipe de france[\s\S]{0,50}(\d+)', ('équipe de france',))
+    ],
+    'numero_maillot': [
+        (r'(?:n°|#|numéro|number)[\s:]*(\d{1,2})', ('n°', '#', 'numéro', 'number')),
+        (r'maillot[\s:]*(\d{1,2})', ('maillot',)),
+        # En début de texte souvent
+        r'^[\s\S]{0,30}(\d{1,2})(?:\s|$)'
+    ]
+}
+
 class FFVBOptimizedExtractor:
-    def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        })
+    def __init__(self, ocr_workers=None, quality_threshold=8):
+        # Client HTTP et cache d'images partagés entre extracteurs
+        self.image_fetcher = get_image_fetcher()
+        
+        # Résultats OCR déjà calculés (texte brut par image/préprocessing/config)
+        self.ocr_cache = get_ocr_cache()
         
         self.output_file = 'ffvb_joueurs_donnees_optimisees.csv'
         self.success_count = 0
@@ -35,76 +139,29 @@ class FFVBOptimizedExtractor:
         self.extracted_data = []
         self.debug_mode = True  # Pour voir les patterns qui matchent
         
-        # Patterns d'extraction perfectionnés
-        self.patterns = {
-            'poste': [
-                # Patterns français directs
-                r'(?:^|\s)(ATTAQUANT|ATTACKANT)(?:\s|$)',
-                r'(?:^|\s)(PASSEUR)(?:\s|$)',
-                r'(?:^|\s)(CENTRAL|CENTRAUX)(?:\s|$)',
-                r'(?:^|\s)(LIBÉRO|LIBERO)(?:\s|$)', 
-                r'(?:^|\s)(RÉCEPTIONNEUR|RECEPTIONNEUR)(?:\s|$)',
-                r'(?:^|\s)(POINTU|OPPOSITE)(?:\s|$)',
-                # Patterns contextuels
-                r'poste[\s:]*([A-Za-z\s]{3,20})',
-                r'position[\s:]*([A-Za-z\s]{3,20})',
-                # Patterns anglais
-                r'(?:^|\s)(SPIKER|ATTACKER)(?:\s|$)',
-                r'(?:^|\s)(SETTER)(?:\s|$)',
-                r'(?:^|\s)(MIDDLE)(?:\s|$)',
-                r'(?:^|\s)(OUTSIDE)(?:\s|$)'
-            ],
-            'taille': [
-                # Patterns précis pour la taille
-                r'(?:taille|height)[\s:]*(\d{3})(?:\s*cm)?',
-                r'(\d{3})\s*cm(?:\s|$)',
-                r'(\d\.\d{2})\s*m(?:\s|$)',
-                r'(\d{1,3})\s*centimètres?',
-                # Pattern contextuel - recherche 3 chiffres entre 170-220
-                r'(?:^|\s)(1[7-9]\d|2[0-1]\d)(?:\s|$)',
-                # Dans un contexte de mensurations
-                r'(?:mensurations?|physique)[\s\S]{0,50}(\d{3})'
-            ],
-            'poids': [
-                # Patterns précis pour le poids
-                r'(?:poids|weight|masse)[\s:]*(\d{2,3})(?:\s*kg)?',
-                r'(\d{2,3})\s*kg(?:\s|$)',
-                r'(\d{2,3})\s*kilos?(?:\s|$)',
-                # Pattern contextuel - recherche 2-3 chiffres entre 60-130
-                r'(?:^|\s)([6-9]\d|1[0-2]\d|130)(?:\s*kg|\s|$)'
-            ],
-            'naissance': [
-                # Formats de date variés
-                r'(?:naissance|né|birth|born)[\s:]*(\d{1,2}[/\.-]\d{1,2}[/\.-]\d{4})',
-                r'(\d{1,2}[/\.-]\d{1,2}[/\.-]\d{4})',
-                r'(\d{4}[/\.-]\d{1,2}[/\.-]\d{1,2})',
-                # Format texte
-                r'(\d{1,2}\s+\w+\s+\d{4})'
-            ],
-            'club': [
-                # Patterns pour clubs français courants
-                r'(?:club|équipe|team)[\s:]*([A-Z][A-Za-z\s]{2,30})',
-                # Clubs spécifiques connus
-                r'(PARIS VOLLEY|MONTPELLIER|TOURS|POITIERS|NANTES|CHAUMONT|CANNES|AJACCIO)',
-                r'(CUCINE LUBE|PERUGIA|MODENA|MILANO|RAVENNA|CIVITANOVA)',
-                r'(ZAKSA|RESOVIA|BERLIN|FRIEDRICHSHAFEN|KAZAN)',
-                # Pattern général clubs
-                r'(?:^|\s)([A-Z]{2,}(?:\s+[A-Z]{2,})*\s+(?:VOLLEY|VOLLEYBALL|VB))(?:\s|$)',
-                r'(?:^|\s)(AS|AC|US|USC|VB|VOLLEY)\s+([A-Z][A-Za-z\s]{2,20})(?:\s|$)'
-            ],
-            'selections': [
-                r'(?:sélections?|selections?|caps?)[\s:]*(\d+)',
-                r'(\d+)\s*sélections?(?:\s|$)',
-                r'(\d+)\s*caps?(?:\s|$)',
-                r'équipe de france[\s\S]{0,50}(\d+)'
-            ],
-            'numero_maillot': [
-                r'(?:n°|#|numéro|number)[\s:]*(\d{1,2})',
-                r'maillot[\s:]*(\d{1,2})',
-                # En début de texte souvent
-                r'^[\s\S]{0,30}(\d{1,2})(?:\s|$)'
-            ]
-        }
+        # Nombre d'appels Tesseract simultanés (un par cœur par défaut)
+        self.ocr_workers = ocr_workers or os.cpu_count() or 1
+        
+        # Recherche adaptative : on s'arrête dès qu'un résultat atteint ce score
+        self.quality_threshold = quality_threshold
+        self.ocr_calls = 0
+        
+        # Durées cumulées par étape de préprocessing
+        self.preprocessing_timings = {}
+        self.preprocessed_images = 0
+        
+        # Gabarit des CV : OCR limité aux zones des champs (None = page entière)
+        self.layout = CVLayout.load()
+        self.roi_successes = 0
+        
+        # Résultats du run précédent (fichier de sortie) : moyennes par méthode
+        # OCR, complétées au fil du run par extracted_data
+        self.previous_results = self.load_previous_results()
+        self.exploration_offset = 0
+        
+        # Patterns compilés une fois, avec préfiltre par mots-clés
+        self.patterns = FIELD_PATTERNS
+        self.field_parser = FieldParser(self.patterns)
         
         # Configurations OCR multiples pour tester
         self.ocr_configs = [
@@ -134,6 +191,13 @@ class FFVBOptimizedExtractor:
         # Initialiser le fichier de sortie
         self.init_output_file()
         
+        # Télécharger en parallèle les images absentes du cache
+        self.image_fetcher.prefetch(players)
+        
+        # Zones des champs : gabarit déclaré, sinon appris sur quelques fiches
+        if self.layout is None:
+            self.layout = self.learn_layout(players)
+        
         # Traiter chaque joueur avec debug
         for i, player in enumerate(players, 1):
             name = player.get('nom_joueur', 'N/A')
@@ -157,14 +221,13 @@ class FFVBOptimizedExtractor:
                 # Afficher résumé détaillé
                 self.print_detailed_summary(complete_data, name)
                 
-                # Pause respectueuse
-                time.sleep(1.5)
-                
             except Exception as e:
                 print(f"   ❌ Erreur: {e}")
                 self.error_count += 1
                 self.save_player_data(player)
         
+        print(self.ocr_cache.summary())
+        
         # Résumé final avec analyses
         self.print_comprehensive_summary(len(players))
 
@@ -175,19 +238,26 @@ class FFVBOptimizedExtractor:
             return {}
         
         try:
-            # Télécharger l'image
-            if image_url.startswith('/'):
-                full_url = f"http://www.ffvb.org{image_url}"
-            else:
-                full_url = image_url
-            
-            response = self.session.get(full_url, timeout=15)
-            response.raise_for_status()
+            # Image depuis le cache partagé (téléchargée au plus une fois)
+            fetched = self.image_fetcher.fetch(image_url)
+            original_image = load_image(fetched.content)
             
-            original_image = Image.open(BytesIO(response.content))
+            # OCR des seules zones du gabarit, suffisant dans la plupart des cas
+            roi_result = self.extract_with_layout(original_image, player_name, fetched.sha256)
+            if roi_result and roi_result['quality_score'] >= self.quality_threshold:
+                self.roi_successes += 1
+                return roi_result
             
             # Tester plusieurs préprocessings et configs OCR
-            best_result = self.test_multiple_ocr_approaches(original_image, player_name)
+            best_result = self.test_multiple_ocr_approaches(original_image, player_name,
+                                                            fetched.sha256)
+            
+            # Les valeurs lues dans leur zone priment sur la page entière
+            if roi_result:
+                best_result.update({field: value for field, value in roi_result.items()
+                                    if field in self.layout.zones})
+                best_result['quality_score'] = self.calculate_extraction_quality(best_result, player_name)
+                best_result['ocr_status'] = 'success'
             
             return best_result
         
@@ -195,38 +265,133 @@ class FFVBOptimizedExtractor:
             print(f"   ❌ Extraction échouée: {e}")
             return {'ocr_status': 'error', 'ocr_error': str(e)}
 
-    def test_multiple_ocr_approaches(self, image, player_name):
-        """Teste plusieurs approches OCR et garde la meilleure"""
+    def learn_layout(self, players):
+        """Apprend les zones des champs depuis les boîtes OCR de quelques fiches"""
+        pages_data = []
+        for player in players:
+            if len(pages_data) >= LAYOUT_SAMPLES:
+                break
+            if not player.get('url_cv_image'):
+                continue
+            try:
+                fetched = self.image_fetcher.fetch(player['url_cv_image'])
+                gray = self.create_preprocessed_versions(load_image(fetched.content))['grayscale']
+                _, data = self.ocr_cache.image_to_data(
+                    gray, fetched.sha256, f"grayscale.v{PREPROCESSING_VERSION}", LAYOUT_CONFIG)
+                pages_data.append(data)
+            except Exception as e:
+                print(f"   ⚠️ Fiche ignorée pour le gabarit: {e}")
+        
+        layout = CVLayout.learn(pages_data)
+        if layout is None:
+            print("⚠️ Gabarit CV non reconnu : OCR sur la page entière")
+            return None
+        
+        layout.save()
+        print(f"📐 Gabarit CV appris sur {layout.samples} fiche(s): {', '.join(layout.zones)} "
+              f"({layout.pixel_fraction():.0%} des pixels)")
+        return layout
+
+    def extract_with_layout(self, image, player_name, image_sha256=None):
+        """OCR zone par zone (PSM et caractères propres à chaque champ)"""
+        if not self.layout:
+            return None
         
-        # Différents préprocessings
-        preprocessed_images = self.create_preprocessed_versions(image)
+        try:
+            gray = build_variants(image, ['grayscale'], timings=self.preprocessing_timings)['grayscale']
+            texts = self.layout.ocr_fields(gray, image_sha256, self.ocr_cache,
+                                           f"grayscale.v{PREPROCESSING_VERSION}")
+        except Exception as e:
+            print(f"   ⚠️ OCR par zones échoué: {e}")
+            return None
+        
+        data = {}
+        for field, text in texts.items():
+            value = self.extract_field_with_validation(field, self.clean_ocr_text(text), player_name)
+            if value:
+                data[field] = value
+        
+        if not data:
+            return None
+        
+        data['ocr_method'] = 'roi'
+        data['ocr_status'] = 'success'
+        data['ocr_text_length'] = sum(len(text) for text in texts.values())
+        data['quality_score'] = self.calculate_extraction_quality(data, player_name)
+        
+        if self.debug_mode:
+            print(f"   📐 Zones: {', '.join(f'{k}={v}' for k, v in data.items() if k in self.layout.zones)}")
+        
+        return data
+
+    def test_multiple_ocr_approaches(self, image, player_name, image_sha256=None):
+        """Teste les approches OCR par ordre de succès historique et garde la meilleure
+        
+        Les textes déjà en cache pour cette image sont re-parsés directement ;
+        le préprocessing n'est calculé qu'à la première combinaison absente.
+        """
+        
+        # Combinaisons preprocessing + config OCR, les plus fructueuses d'abord
+        combinations = self.rank_ocr_combinations()
+        
+        cached_texts = self.ocr_cache.get_texts(image_sha256) if image_sha256 else {}
+        preprocessed_images = None
         
         all_results = []
         
-        # Tester chaque combinaison preprocessing + config OCR
-        for preprocess_name, processed_image in preprocessed_images.items():
-            for config_name, config_str in self.ocr_configs:
-                try:
-                    text = pytesseract.image_to_string(processed_image, config=config_str)
-                    
-                    if text.strip():
-                        # Parser ce texte
-                        parsed_data = self.parse_ocr_text_advanced(text, player_name)
-                        parsed_data['ocr_method'] = f"{preprocess_name}+{config_name}"
-                        parsed_data['ocr_text_length'] = len(text)
-                        parsed_data['raw_text_sample'] = text[:200]
-                        
-                        # Calculer un score de qualité
-                        quality_score = self.calculate_extraction_quality(parsed_data, player_name)
-                        parsed_data['quality_score'] = quality_score
-                        
-                        all_results.append(parsed_data)
+        # Les combinaisons sont lancées par vagues d'au plus OCR_WAVE_SIZE. Le
+        # moteur Tesseract libère le GIL (tesserocr) ou lance un processus
+        # (pytesseract) : des threads suffisent à occuper les cœurs.
+        wave_size = min(self.ocr_workers, OCR_WAVE_SIZE)
+        with ThreadPoolExecutor(max_workers=wave_size) as executor:
+            for start in range(0, len(combinations), wave_size):
+                jobs = []
+                for preprocess_name, config_name, config_str in combinations[start:start + wave_size]:
+                    cache_key = f"{preprocess_name}.v{PREPROCESSING_VERSION}"
+                    text = cached_texts.get((cache_key, config_str))
+                    if text is not None:
+                        future = Future()
+                        future.set_result(text)
+                        self.ocr_cache.hits += 1
+                    else:
+                        if preprocessed_images is None:
+                            preprocessed_images = self.create_preprocessed_versions(image)
+                        processed_image = preprocessed_images.get(preprocess_name)
+                        if processed_image is None:
+                            continue
+                        future = executor.submit(self.ocr_cache.image_to_string, processed_image,
+                                                 image_sha256, cache_key, config_str)
+                        self.ocr_calls += 1
+                    jobs.append((preprocess_name, config_name, future))
+                
+                # Résultats parcourus dans l'ordre de soumission (départage stable)
+                for preprocess_name, config_name, future in jobs:
+                    method = f"{preprocess_name}+{config_name}"
+                    try:
+                        text = future.result()
                         
-                        if self.debug_mode and quality_score > 3:
-                            print(f"   🔍 {preprocess_name}+{config_name}: Score {quality_score}")
+                        if text.strip():
+                            # Parser ce texte
+                            parsed_data = self.parse_ocr_text_advanced(text, player_name)
+                            parsed_data['ocr_method'] = method
+                            parsed_data['ocr_text_length'] = len(text)
+                            parsed_data['raw_text_sample'] = text[:200]
+                            
+                            # Calculer un score de qualité
+                            quality_score = self.calculate_extraction_quality(parsed_data, player_name)
+                            parsed_data['quality_score'] = quality_score
+                            
+                            all_results.append(parsed_data)
+                            
+                            if self.debug_mode and quality_score > 3:
+                                print(f"   🔍 {method}: Score {quality_score}")
+                    
+                    except Exception as e:
+                        continue
                 
-                except Exception as e:
-                    continue
+                # Arrêt anticipé dès qu'un résultat est suffisamment bon
+                if any(r['quality_score'] >= self.quality_threshold for r in all_results):
+                    break
         
         # Retourner le meilleur résultat
         if all_results:
@@ -240,72 +405,66 @@ class FFVBOptimizedExtractor:
         else:
             return {'ocr_status': 'no_text'}
 
-    def create_preprocessed_versions(self, image):
-        """Crée plusieurs versions préprocessées de l'image"""
-        versions = {}
+    def rank_ocr_combinations(self):
+        """Ordonne les combinaisons par score moyen historique décroissant
+        
+        Les moyennes sont celles d'analyze_extraction_results, calculées sur
+        le run précédent et les joueurs déjà traités. OCR_EXPLORATION_BUDGET
+        combinaisons sans historique passent juste après la meilleure, à tour
+        de rôle d'un joueur à l'autre, pour qu'elles finissent par être jugées.
+        """
+        combinations = [
+            (preprocess_name, config_name, config_str)
+            for preprocess_name in PREPROCESSING_NAMES
+            for config_name, config_str in self.ocr_configs
+        ]
+        averages = self.method_average_scores(self.previous_results + self.extracted_data)
+        
+        def method(combination):
+            return f"{combination[0]}+{combination[1]}"
         
+        known = sorted((c for c in combinations if method(c) in averages),
+                       key=lambda c: -averages[method(c)][0])
+        untried = [c for c in combinations if method(c) not in averages]
+        if untried:
+            offset = self.exploration_offset % len(untried)
+            untried = untried[offset:] + untried[:offset]
+            self.exploration_offset += OCR_EXPLORATION_BUDGET
+        
+        explored = untried[:OCR_EXPLORATION_BUDGET]
+        return known[:1] + explored + known[1:] + untried[OCR_EXPLORATION_BUDGET:]
+
+    def method_average_scores(self, results):
+        """Score de qualité moyen et nombre d'utilisations par méthode OCR"""
+        methods = {}
+        for p in results:
+            method = p.get('ocr_method') or 'unknown'
+            methods.setdefault(method, []).append(float(p.get('quality_score') or 0))
+        return {method: (sum(scores) / len(scores), len(scores))
+                for method, scores in methods.items()}
+
+    def load_previous_results(self):
+        """Résultats du run précédent, lus avant que init_output_file ne les écrase"""
+        if not os.path.exists(self.output_file):
+            return []
         try:
-            # 1. Image originale redimensionnée
-            if image.size[0] < 1200:
-                scale_factor = 1200 / image.size[0]
-                new_size = (int(image.size[0] * scale_factor), int(image.size[1] * scale_factor))
-                resized = image.resize(new_size, Image.Resampling.LANCZOS)
-            else:
-                resized = image
-            
-            versions['original'] = resized
-            
-            # 2. Amélioration contraste
-            enhancer = ImageEnhance.Contrast(resized)
-            versions['contrast'] = enhancer.enhance(1.8)
-            
-            # 3. Amélioration netteté
-            enhancer = ImageEnhance.Sharpness(resized)
-            versions['sharp'] = enhancer.enhance(2.0)
-            
-            # 4. Niveaux de gris optimisé
-            gray = resized.convert('L')
-            versions['grayscale'] = gray
-            
-            # 5. Préprocessing OpenCV avancé
-            if gray:
-                opencv_version = self.opencv_preprocessing(gray)
-                if opencv_version:
-                    versions['opencv'] = opencv_version
-            
-            # 6. Binarisation
-            threshold = gray.point(lambda x: 0 if x < 128 else 255, '1')
-            versions['binary'] = threshold
-            
+            with open(self.output_file, 'r', encoding='utf-8') as f:
+                return [row for row in csv.DictReader(f) if row.get('ocr_method')]
         except Exception as e:
-            print(f"   ⚠️ Erreur preprocessing: {e}")
-            versions['original'] = image
-        
-        return versions
+            print(f"⚠️ Résultats précédents illisibles ({e}), ordre par défaut")
+            return []
 
-    def opencv_preprocessing(self, pil_image):
-        """Préprocessing OpenCV avancé"""
+    def create_preprocessed_versions(self, image):
+        """Crée plusieurs versions préprocessées de l'image (tableaux NumPy)"""
         try:
-            # Convertir PIL en OpenCV
-            open_cv_image = np.array(pil_image)
-            
-            # Débruitage
-            denoised = cv2.fastNlMeansDenoising(open_cv_image)
-            
-            # Amélioration contraste adaptatif
-            clahe = cv2.createCLAHE(clipLimit=3.0, tileGridSize=(8,8))
-            enhanced = clahe.apply(denoised)
-            
-            # Binarisation adaptative
-            binary = cv2.adaptiveThreshold(
-                enhanced, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY, 11, 2
-            )
-            
-            # Reconvertir en PIL
-            return Image.fromarray(binary)
-            
+            versions = build_variants(image, PREPROCESSING_NAMES, contrast=1.8, sharpness=2.0,
+                                      timings=self.preprocessing_timings)
+            self.preprocessed_images += 1
         except Exception as e:
-            return None
+            print(f"   ⚠️ Erreur preprocessing: {e}")
+            versions = {'original': image}
+        
+        return versions
 
     def parse_ocr_text_advanced(self, text, player_name):
         """Parsing OCR avancé avec contexte du nom du joueur"""
@@ -313,10 +472,12 @@ class FFVBOptimizedExtractor:
         
         # Nettoyer et normaliser le texte
         text = self.clean_ocr_text(text)
+        # Normalisation unique partagée par tous les champs
+        prepared = self.field_parser.prepare(text)
         
         # Parser avec patterns avancés
-        for field, patterns in self.patterns.items():
-            field_value = self.extract_field_with_validation(field, patterns, text, player_name)
+        for field in self.patterns:
+            field_value = self.extract_field_with_validation(field, text, player_name, prepared)
             if field_value:
                 data[field] = field_value
                 if self.debug_mode:
@@ -338,31 +499,31 @@ class FFVBOptimizedExtractor:
         }
         
         # Normaliser les espaces
-        text = re.sub(r'\s+', ' ', text)
+        text = WHITESPACE_RE.sub(' ', text)
         
         # Supprimer caractères parasites
-        text = re.sub(r'[^\w\s/\.-:°#]', ' ', text)
+        text = NOISE_CHARS_RE.sub(' ', text)
         
         return text.strip()
 
-    def extract_field_with_validation(self, field, patterns, text, player_name):
-        """Extrait un champ avec validation contextuelle"""
+    def extract_field_with_validation(self, field, text, player_name, prepared=None):
+        """Extrait un champ avec validation contextuelle
         
-        for pattern in patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE | re.MULTILINE)
+        Les correspondances sont parcourues dans l'ordre des patterns et le
+        parcours s'arrête à la première valeur validée.
+        """
+        
+        for match in self.field_parser.iter_values(field, text, prepared):
+            if isinstance(match, tuple):
+                value = match[-1] if match[-1] else match[0]
+            else:
+                value = match
             
-            if matches:
-                for match in matches:
-                    if isinstance(match, tuple):
-                        value = match[-1] if match[-1] else match[0]
-                    else:
-                        value = match
-                    
-                    # Validation spécifique par champ
-                    validated_value = self.validate_field_value(field, value, text, player_name)
-                    
-                    if validated_value:
-                        return validated_value
+            # Validation spécifique par champ
+            validated_value = self.validate_field_value(field, value, text, player_name)
+            
+            if validated_value:
+                return validated_value
         
         return None
 
@@ -669,6 +830,13 @@ class FFVBOptimizedExtractor:
         print(f"✅ Succès: {self.success_count}")
         print(f"❌ Erreurs: {self.error_count}")
         print(f"📄 Fichier: {self.output_file}")
+        if total_players:
+            print(f"🔧 Appels Tesseract: {self.ocr_calls} ({self.ocr_calls / total_players:.1f} par joueur)")
+        if self.layout:
+            print(f"📐 Joueurs extraits par zones seules: {self.roi_successes}/{total_players}")
+        if self.preprocessed_images:
+            print(f"⏱️ Préprocessing par image: "
+                  f"{format_timings(self.preprocessing_timings, self.preprocessed_images)}")
         
         if self.extracted_data:
             # Analyses statistiques
@@ -692,18 +860,9 @@ class FFVBOptimizedExtractor:
             print(f"   {field}: {count}/{len(self.extracted_data)} ({percentage:.1f}%)")
         
         # Meilleures méthodes OCR
-        methods = {}
-        for p in self.extracted_data:
-            method = p.get('ocr_method', 'unknown')
-            if method not in methods:
-                methods[method] = []
-            methods[method].append(float(p.get('quality_score', 0)))
-        
         print(f"\n🏆 MEILLEURES MÉTHODES OCR:")
-        for method, scores in methods.items():
-            if scores:
-                avg_score = sum(scores) / len(scores)
-                print(f"   {method}: {avg_score:.1f} (utilisée {len(scores)} fois)")
+        for method, (avg_score, count) in self.method_average_scores(self.extracted_data).items():
+            print(f"   {method}: {avg_score:.1f} (utilisée {count} fois)")
         
         # Top joueurs extraits
         best_players = sorted(self.extracted_data, 
@@ -4,7 +4,6 @@ Extracteur OCR pour analyser les images CV des joueurs et extraire
 toutes les informations textuelles (taille, poids, poste, statistiques, etc.)
 """
 
-import requests
 import cv2
 import numpy as np
 from PIL import Image
@@ -16,11 +15,23 @@ from urllib.parse import urljoin, unquote
 import os
 from datetime import datetime
 
+from ffvb_scraper.image_fetcher import get_image_fetcher, load_image, resolve_image_url
+from ffvb_scraper.ocr_cache import get_ocr_cache
+
+# À incrémenter quand preprocess_image change : invalide le cache OCR
+PREPROCESSING_KEY = 'ocr_cv.v1'
+
 class FFVBOCRExtractor:
     def __init__(self):
         # Configuration OCR
         self.setup_ocr()
         
+        # Client HTTP et cache d'images partagés entre extracteurs
+        self.image_fetcher = get_image_fetcher()
+        
+        # Texte et boîtes OCR déjà calculés, par empreinte d'image
+        self.ocr_cache = get_ocr_cache()
+        
         # Dictionnaire pour mapper les termes détectés
         self.field_mapping = {
             'poste': ['poste', 'position', 'rôle'],
@@ -80,6 +91,9 @@ class FFVBOCRExtractor:
             players = list(reader)
         
         print(f"📊 {len(players)} joueur(s) à traiter")
+        
+        # Télécharger en parallèle les images absentes du cache
+        self.image_fetcher.prefetch(players)
         print()
         
         for i, player in enumerate(players, 1):
@@ -89,10 +103,7 @@ class FFVBOCRExtractor:
             if image_url:
                 try:
                     # Construire l'URL complète si nécessaire
-                    if image_url.startswith('/'):
-                        full_url = f"http://www.ffvb.org{image_url}"
-                    else:
-                        full_url = image_url
+                    full_url = resolve_image_url(image_url)
                     
                     # Extraire données OCR
                     ocr_data = self.extract_ocr_from_image_url(full_url)
@@ -120,32 +131,39 @@ class FFVBOCRExtractor:
             else:
                 print(f"   ⚠️ Pas d'image CV")
         
+        print(self.ocr_cache.summary())
         print(f"\n🎉 Traitement terminé: {processed_count}/{len(players)} joueurs traités")
 
     def extract_ocr_from_image_url(self, image_url):
         """Extrait le texte et les données structurées depuis une URL d'image"""
         try:
-            # Télécharger l'image
-            response = requests.get(image_url, timeout=10)
-            response.raise_for_status()
+            # Image depuis le cache partagé (téléchargée au plus une fois)
+            fetched = self.image_fetcher.fetch(image_url)
             
-            # Convertir en image PIL
-            image = Image.open(BytesIO(response.content))
-            
-            return self.extract_ocr_from_image(image)
+            return self.extract_ocr_from_image(load_image(fetched.content), fetched.sha256)
         
         except Exception as e:
             print(f"   ❌ Erreur téléchargement image: {e}")
             return None
 
-    def extract_ocr_from_image(self, image):
-        """Extrait le texte depuis une image PIL"""
+    def extract_ocr_from_image(self, image, image_sha256=None):
+        """Extrait le texte depuis une image PIL
+        
+        Avec l'empreinte de l'image, le texte et les boîtes sont lus dans le
+        cache OCR quand ils y sont déjà.
+        """
         try:
-            # Préprocessing de l'image pour améliorer l'OCR
-            processed_image = self.preprocess_image(image)
-            
-            # Extraction OCR
-            text = pytesseract.image_to_string(processed_image, config=self.ocr_config)
+            cached = image_sha256 and self.ocr_cache.get(image_sha256, PREPROCESSING_KEY, self.ocr_config)
+            if cached and cached['data'] is not None:
+                self.ocr_cache.hits += 1
+                text, data = cached['text'], cached['data']
+            else:
+                # Préprocessing de l'image pour améliorer l'OCR
+                processed_image = self.preprocess_image(image)
+                
+                # Extraction OCR (texte + boîtes avec leur confiance)
+                text, data = self.ocr_cache.image_to_data(processed_image, image_sha256,
+                                                          PREPROCESSING_KEY, self.ocr_config)
             
             if not text.strip():
                 return None
@@ -156,7 +174,6 @@ class FFVBOCRExtractor:
             
             # Calculer confiance OCR
             try:
-                data = pytesseract.image_to_data(processed_image, config=self.ocr_config, output_type=pytesseract.Output.DICT)
                 confidences = [int(conf) for conf in data['conf'] if int(conf) > 0]
                 avg_confidence = sum(confidences) / len(confidences) if confidences else 0
                 structured_data['confiance_ocr'] = f"{avg_confidence:.1f}%"
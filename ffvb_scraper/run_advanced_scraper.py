@@ -5,6 +5,8 @@ from scrapy.crawler import CrawlerProcess
 import csv
 from datetime import datetime
 
+from ffvb_scraper import columnar
+
 def run_advanced_scraper():
     """Lance le scraper avancé pour extraire toutes les données des joueurs"""
     print("🏐 SCRAPER FFVB AVANCÉ - STATS COMPLÈTES DES JOUEURS")
@@ -138,32 +140,27 @@ def analyze_results():
     try:
         # Analyser le fichier CSV
         if os.path.exists('ffvb_players_complete.csv'):
-            with open('ffvb_players_complete.csv', 'r', encoding='utf-8') as f:
-                lines = list(f)
-                players_count = len(lines) - 1  # -1 pour l'en-tête
+            _, players = columnar.load_rows('ffvb_players_complete.csv',
+                                            columnar.PLAYER_COMPLETE_COLUMNS)
+            players_count = len(players)
             
             summary.append(f"📊 RÉSULTATS D'EXTRACTION:")
             summary.append(f"   └── Joueurs trouvés: {players_count}")
             
             if players_count > 0:
                 # Analyser quelques lignes pour voir la complétude
-                import csv
-                with open('ffvb_players_complete.csv', 'r', encoding='utf-8') as f:
-                    reader = csv.DictReader(f)
-                    first_player = next(reader, None)
-                    
-                    if first_player:
-                        filled_fields = sum(1 for v in first_player.values() if v.strip())
-                        total_fields = len(first_player)
-                        completeness = (filled_fields / total_fields) * 100
-                        
-                        summary.append(f"   └── Complétude des données: {completeness:.1f}%")
-                        summary.append(f"   └── Champs remplis: {filled_fields}/{total_fields}")
-                        
-                        # Afficher quelques données d'exemple
-                        summary.append(f"   └── Exemple: {first_player.get('nom_joueur', 'N/A')} "
-                                     f"(#{first_player.get('numero', 'N/A')}) - "
-                                     f"{first_player.get('poste', 'N/A')}")
+                first_player = players[0]
+                filled_fields = sum(1 for v in first_player.values() if v.strip())
+                total_fields = len(first_player)
+                completeness = (filled_fields / total_fields) * 100
+                
+                summary.append(f"   └── Complétude des données: {completeness:.1f}%")
+                summary.append(f"   └── Champs remplis: {filled_fields}/{total_fields}")
+                
+                # Afficher quelques données d'exemple
+                summary.append(f"   └── Exemple: {first_player.get('nom_joueur', 'N/A')} "
+                             f"(#{first_player.get('numero', 'N/A')}) - "
+                             f"{first_player.get('poste', 'N/A')}")
         
         # Analyser le fichier JSON
         if os.path.exists('ffvb_players_complete.json'):
@@ -188,10 +185,8 @@ def preview_data():
     
     try:
         if os.path.exists('ffvb_players_complete.csv'):
-            import csv
-            with open('ffvb_players_complete.csv', 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                players = list(reader)
+            table, players = columnar.load_rows('ffvb_players_complete.csv',
+                                                columnar.PLAYER_COMPLETE_COLUMNS)
             
             if players:
                 print(f"📊 {len(players)} joueur(s) extrait(s)")
@@ -222,7 +217,7 @@ def preview_data():
                 
                 # Statistiques générales
                 print("📈 STATISTIQUES GÉNÉRALES:")
-                fields_analysis = analyze_field_completeness(players)
+                fields_analysis = analyze_field_completeness(players, table)
                 for field, percentage in fields_analysis.items():
                     if percentage > 0:
                         print(f"   {field}: {percentage:.1f}% complété")
@@ -236,13 +231,18 @@ def preview_data():
     except Exception as e:
         print(f"❌ Erreur lors de l'aperçu: {e}")
 
-def analyze_field_completeness(players):
-    """Analyse la complétude de chaque champ"""
+def analyze_field_completeness(players, table=None):
+    """Analyse la complétude de chaque champ
+    
+    Avec la table colonnaire (pyarrow), les champs remplis sont comptés par
+    colonne en une passe vectorisée.
+    """
     if not players:
         return {}
     
     field_stats = {}
     total_players = len(players)
+    filled_by_field = columnar.filled_counts(table) if table is not None else None
     
     # Champs à analyser
     important_fields = {
@@ -258,7 +258,10 @@ def analyze_field_completeness(players):
     }
     
     for field_key, field_name in important_fields.items():
-        filled_count = sum(1 for player in players if player.get(field_key, '').strip())
+        if filled_by_field is not None:
+            filled_count = filled_by_field.get(field_key, 0)
+        else:
+            filled_count = sum(1 for player in players if player.get(field_key, '').strip())
         percentage = (filled_count / total_players) * 100
         field_stats[field_name] = percentage
     
@@ -273,12 +276,10 @@ def create_summary_report():
             print("❌ Fichier de données non trouvé")
             return
         
-        import csv
         from datetime import datetime
         
-        with open('ffvb_players_complete.csv', 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            players = list(reader)
+        table, players = columnar.load_rows('ffvb_players_complete.csv',
+                                            columnar.PLAYER_COMPLETE_COLUMNS)
         
         # Créer le rapport
         report_filename = f'ffvb_rapport_synthese_{datetime.now().strftime("%Y%m%d_%H%M%S")}.txt'
@@ -289,12 +290,15 @@ def create_summary_report():
             f.write(f"Date d'extraction: {datetime.now().strftime('%d/%m/%Y %H:%M:%S')}\n")
             f.write(f"Nombre de joueurs: {len(players)}\n\n")
             
-            # Analyse par poste
-            postes = {}
-            for player in players:
-                poste = player.get('poste', 'Non défini').strip()
-                if poste:
-                    postes[poste] = postes.get(poste, 0) + 1
+            # Analyse par poste (group-by vectorisé si pyarrow est disponible)
+            if table is not None:
+                postes = columnar.value_counts(table, 'poste')
+            else:
+                postes = {}
+                for player in players:
+                    poste = player.get('poste', 'Non défini').strip()
+                    if poste:
+                        postes[poste] = postes.get(poste, 0) + 1
             
             if postes:
                 f.write("📊 RÉPARTITION PAR POSTE:\n")
@@ -0,0 +1,76 @@
+# test_field_parser.py
+"""Le FieldParser (mots-clés + finditer) rend exactement les valeurs de
+l'ancienne boucle re.findall sur la table FIELD_PATTERNS"""
+
+import random
+import re
+
+from ffvb_scraper.field_parser import DEFAULT_FLAGS, FieldParser
+from final_ocr_extractor import FIELD_PATTERNS, NOISE_CHARS_RE, WHITESPACE_RE
+
+SAMPLE_OCR_TEXTS = [
+    "EARVIN NGAPETH\nPOINTU / ATTAQUANT\nTaille : 194 cm Poids : 99 kg\n"
+    "Né le 12/02/1991 à Saint-Raphaël\nClub : MODENA VOLLEY\n"
+    "Sélections : 250\nN° 9",
+    "JENIA GREBENNIKOV LIBÉRO 188cm 85 kilos né 13.08.1990 "
+    "Équipe de France depuis 2010 - 180 sélections TOURS VB #2",
+    "Antoine BRIZARD passeur height 196 weight 89 born 1994-08-22 "
+    "club PIACENZA caps 120 number 4",
+    "barthélémy chinenyeze central 2.02 m 103kg 28 février 1998 "
+    "ZAKSA Kedzierzyn equipe de france 95",
+    "Position: Réceptionneur Attaquant Taille 190 Masse 85 "
+    "naissance: 25-10-1997 AS CANNES numéro 17 maillot 17",
+    "Trevor Clévenot SPIKER OUTSIDE 199 centimètres 90 Kg "
+    "CUCINE LUBE CIVITANOVA 15 caps",
+    "Nicolas LE GOFF MIDDLE CENTRAUX 206 110 PARIS VOLLEY US TOURCOING",
+    "ſélection 7 K 175 cm İbrahim ıtalia libero 70kg",
+    "",
+    "mensurations 201 physique 95 poids",
+]
+
+VOCABULARY = [
+    'taille', 'height', 'cm', 'm', 'poids', 'weight', 'masse', 'kg', 'kilos',
+    'né', 'born', 'birth', 'naissance', 'club', 'équipe', 'team', 'de', 'france',
+    'sélections', 'selection', 'caps', 'cap', 'n°', '#', 'numéro', 'number',
+    'maillot', 'passeur', 'libéro', 'LIBERO', 'central', 'POINTU', 'opposite',
+    'SETTER', 'middle', 'outside', 'PARIS VOLLEY', 'MONTPELLIER', 'kazan',
+    'RAVENNA', 'AS', 'VB', 'volley', 'US', 'Tours', 'poste', 'position',
+    'mensurations', 'physique', 'centimètres', ':', '/', '12/03/1995',
+    '1995-03-12', '3 mars 1995', '1.98', '2.01', '199', '205', '87', '130',
+    '64', '12', '7', '250', '\n',
+]
+
+
+def findall_values(patterns, text):
+    """Ancienne extraction : un re.findall par pattern, dans l'ordre de la table"""
+    values = []
+    for entry in patterns:
+        pattern = entry[0] if isinstance(entry, tuple) else entry
+        values.extend(re.findall(pattern, text, DEFAULT_FLAGS))
+    return values
+
+
+def random_texts(count, seed=25):
+    rng = random.Random(seed)
+    for _ in range(count):
+        words = rng.choices(VOCABULARY, k=rng.randint(3, 25))
+        text = ' '.join(words)
+        if rng.random() < 0.5:
+            text = text.upper()
+        yield text
+
+
+def clean(text):
+    """Même nettoyage que clean_ocr_text"""
+    return NOISE_CHARS_RE.sub(' ', WHITESPACE_RE.sub(' ', text)).strip()
+
+
+def test_field_parser_matches_findall():
+    parser = FieldParser(FIELD_PATTERNS)
+    texts = SAMPLE_OCR_TEXTS + list(random_texts(2000))
+    for raw in texts:
+        for text in (raw, clean(raw)):
+            for field, patterns in FIELD_PATTERNS.items():
+                assert list(parser.iter_values(field, text)) == findall_values(patterns, text), \
+                    (field, text)
+
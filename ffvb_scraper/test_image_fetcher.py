@@ -0,0 +1,36 @@
+# test_image_fetcher.py
+"""Index du cache d'images partagé entre plusieurs processus"""
+
+import multiprocessing
+
+from ffvb_scraper.image_fetcher import ImageFetcher
+
+PROCESSES = 4
+IMAGES_PER_PROCESS = 200
+
+
+def store_images(cache_dir, worker):
+    """Indexer des images en compactant souvent, comme plusieurs extracteurs en parallèle"""
+    fetcher = ImageFetcher(cache_dir=cache_dir)
+    for i in range(IMAGES_PER_PROCESS):
+        fetcher._store(f'http://www.ffvb.org/cv/{worker}/{i}.jpg', f'{worker}-{i}'.encode())
+        if i % 20 == 0:
+            fetcher.flush()
+    fetcher.close()
+
+
+def test_flush_keeps_entries_from_other_processes(tmp_path):
+    cache_dir = str(tmp_path)
+    workers = [multiprocessing.Process(target=store_images, args=(cache_dir, n))
+               for n in range(PROCESSES)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    assert all(worker.exitcode == 0 for worker in workers)
+
+    fetcher = ImageFetcher(cache_dir=cache_dir)
+    assert len(fetcher._index) == PROCESSES * IMAGES_PER_PROCESS
+    cached = fetcher.fetch('http://www.ffvb.org/cv/3/7.jpg')
+    assert cached.content == b'3-7'
+    assert (fetcher.cache_hits, fetcher.downloads) == (1, 0)
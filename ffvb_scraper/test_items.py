@@ -0,0 +1,26 @@
+# test_items.py
+"""Conversion des tailles de joueurs en centimètres"""
+
+import pytest
+
+from ffvb_scraper.items import extract_height
+
+
+@pytest.mark.parametrize('value, expected', [
+    ('1m90', 190),
+    ('1m95', 195),
+    ('1m9', 190),
+    ('1 m 98', 198),
+    ('1.95m', 195),
+    ('1,95', 195),
+    ('1,95 m', 195),
+    ('2m', 200),
+    ('2m05', 205),
+    ('195cm', 195),
+    ('195 cm', 195),
+    ('195', 195),
+    ('', None),
+    ('inconnue', None),
+])
+def test_extract_height(value, expected):
+    assert extract_height(value) == expected
@@ -0,0 +1,159 @@
+# test_middlewares.py
+"""Throttle par domaine et backoff des retries sur un vrai crawl local
+
+Le serveur de test répond sur 127.0.0.1 et localhost : Scrapy les traite
+comme deux domaines (deux slots de téléchargement). Chaque crawl tourne dans
+un processus séparé car le reactor Twisted ne redémarre pas.
+"""
+
+import json
+import os
+import subprocess
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+PROJECT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+CRAWL_SETTINGS = {
+    'ROBOTSTXT_OBEY': False,
+    'TELNETCONSOLE_ENABLED': False,
+    'LOG_LEVEL': 'ERROR',
+    'DOWNLOAD_DELAY': 0,
+    'DOWNLOAD_DELAY_JITTER': 0,
+    'CONCURRENT_REQUESTS': 4,
+    'CONCURRENT_REQUESTS_PER_DOMAIN': 1,
+    'SCHEDULER_PRIORITY_QUEUE': 'scrapy.pqueues.DownloaderAwarePriorityQueue',
+    'DOWNLOADER_MIDDLEWARES': {
+        'scrapy.downloadermiddlewares.retry.RetryMiddleware': None,
+        'ffvb_scraper.middlewares.CustomRetryMiddleware': 550,
+        'ffvb_scraper.middlewares.ThrottleMiddleware': 950,
+    },
+}
+
+
+class PageHandler(BaseHTTPRequestHandler):
+    # Les pages /flaky/... répondent 503 au premier appel
+    failed_once = set()
+    lock = threading.Lock()
+
+    def do_GET(self):
+        if self.path.startswith('/flaky'):
+            with self.lock:
+                first_call = self.path not in self.failed_once
+                self.failed_once.add(self.path)
+            if first_call:
+                self.send_response(503)
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return
+        body = f"<html><body>{self.path}</body></html>".encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server_port():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), PageHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server.server_port
+    server.shutdown()
+    server.server_close()
+
+
+def run_crawl(requests, settings):
+    """Crawler [(url, priorité)] dans un sous-processus, retourne réponses et stats"""
+    config = json.dumps({'requests': requests, 'settings': {**CRAWL_SETTINGS, **settings}})
+    result = subprocess.run([sys.executable, os.path.abspath(__file__), config],
+                            cwd=PROJECT_DIR, capture_output=True, text=True, timeout=120)
+    assert result.returncode == 0, result.stderr
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def test_slow_domain_does_not_block_fast_domain(server_port):
+    slow = [(f'http://localhost:{server_port}/slow/{i}', 10) for i in range(8)]
+    fast = [(f'http://127.0.0.1:{server_port}/fast/{i}', 0) for i in range(10)]
+    result = run_crawl(slow + fast, {
+        'THROTTLE_DEFAULT_DELAY': 0.02,
+        'THROTTLE_RATE_PER_MINUTE': 0,
+        'DOWNLOAD_SLOTS': {'localhost': {'delay': 0.5}},
+    })
+
+    done = {'slow': [], 'fast': []}
+    for response in result['responses']:
+        done[response['path'].split('/')[1]].append(response['at'])
+    assert len(done['slow']) == 8 and len(done['fast']) == 10
+
+    # Le domaine lent est bien rythmé (7 intervalles de 0,5 s)...
+    assert max(done['slow']) >= 3.0
+    # ... sans retenir le domaine rapide, servi avant la 3e page lente
+    assert max(done['fast']) < sorted(done['slow'])[2]
+    assert result['stats']['throttle/wait_count'] == 18
+
+
+def test_retry_backoff_does_not_hold_other_domains(server_port):
+    flaky = [(f'http://localhost:{server_port}/flaky/{i}', 10) for i in range(2)]
+    fast = [(f'http://127.0.0.1:{server_port}/fast/{i}', 0) for i in range(10)]
+    result = run_crawl(flaky + fast, {
+        'CONCURRENT_REQUESTS': 2,
+        'THROTTLE_DEFAULT_DELAY': 0.1,
+        'THROTTLE_RATE_PER_MINUTE': 0,
+        'RETRY_BACKOFF_BASE': 2.0,
+    })
+
+    done = {'flaky': [], 'fast': []}
+    for response in result['responses']:
+        assert response['status'] == 200
+        done[response['path'].split('/')[1]].append(response['at'])
+    assert len(done['flaky']) == 2 and len(done['fast']) == 10
+    assert result['stats']['retry/delayed_count'] == 2
+
+    # Le domaine en erreur attend son backoff de 2 s...
+    assert min(done['flaky']) - min(done['fast']) >= 1.5
+    # ... pendant que l'autre domaine est servi à son rythme (10 x 0,1 s)
+    assert max(done['fast']) < min(done['flaky'])
+
+
+def crawl_main(config):
+    """Point d'entrée du sous-processus : lancer le crawl et afficher le résultat en JSON"""
+    import time
+    from urllib.parse import urlparse
+
+    import scrapy
+    from scrapy.crawler import CrawlerProcess
+
+    responses = []
+    started = time.monotonic()
+
+    class RecordingSpider(scrapy.Spider):
+        name = 'test_middlewares'
+
+        async def start(self):
+            for url, priority in config['requests']:
+                yield scrapy.Request(url, priority=priority, dont_filter=True)
+
+        def parse(self, response):
+            responses.append({
+                'path': urlparse(response.url).path,
+                'status': response.status,
+                'at': round(time.monotonic() - started, 3),
+            })
+
+    process = CrawlerProcess(config['settings'])
+    crawler = process.create_crawler(RecordingSpider)
+    process.crawl(crawler)
+    process.start()
+    print(json.dumps({'responses': responses, 'stats': crawler.stats.get_stats()}, default=str))
+
+
+if __name__ == '__main__':
+    crawl_main(json.loads(sys.argv[1]))